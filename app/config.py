@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -10,6 +12,68 @@ class Settings(BaseSettings):
     DB_PASS: str
     DB_NAME: str
 
+    # Учёт SQL-запросов: сколько запросов допустимо на один апдейт
+    # и после скольких повторов одного запроса подозревать N+1
+    QUERY_BUDGET: int = 15
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Порт HTTP-эндпоинта /metrics (Prometheus); не задан — эндпоинт не поднимается
+    METRICS_PORT: Optional[int] = None
+    # Сколько дней хранить историю запусков задач планировщика
+    JOB_RUN_RETENTION_DAYS: int = 90
+    # Сколько пропущенных вхождений повторяющихся задач переносить одной транзакцией
+    RECURRENCE_BATCH_SIZE: int = 1000
+    # Архивация: через сколько дней после завершения задача уходит в tasks_archive,
+    # сколько задач переносить одной транзакцией и сколько секунд ждать между пачками
+    ARCHIVE_AFTER_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_BATCH_PAUSE: float = 0.5
+
+    # Выгрузка /export: сколько выгрузок одновременно (каждая держит соединение с БД),
+    # сколько строк читать из курсора за раз и с какого размера (байт) файл уходит из памяти на диск
+    EXPORT_MAX_CONCURRENT: int = 2
+    EXPORT_CHUNK_SIZE: int = 1000
+    EXPORT_SPOOL_SIZE: int = 1024 * 1024
+    # Загрузка задач из файла: сколько задач за один файл и сколько вставлять одним INSERT
+    IMPORT_MAX_TASKS: int = 10_000
+    IMPORT_BATCH_SIZE: int = 1000
+
+    # Сколько отрендеренных фрагментов задач держать в памяти
+    RENDER_CACHE_SIZE: int = 10_000
+    # Сколько клавиатур отдельных задач держать в памяти
+    KEYBOARD_CACHE_SIZE: int = 4096
+    # Для скольких сообщений помнить последний отправленный текст (пропуск пустых edit_text)
+    EDIT_CACHE_SIZE: int = 10_000
+
+    # Антифлуд: не больше THROTTLE_RATE апдейтов одного типа за THROTTLE_WINDOW секунд на пользователя;
+    # одинаковые callback-и чаще CALLBACK_DEBOUNCE секунд считаются двойным нажатием
+    THROTTLE_RATE: int = 20
+    THROTTLE_WINDOW: float = 10.0
+    CALLBACK_DEBOUNCE: float = 1.0
+
+    # Пул соединений с БД: постоянные соединения, сколько можно открыть сверх них,
+    # сколько секунд ждать свободное, через сколько секунд пересоздавать (-1 — никогда)
+    # и проверять ли соединение перед выдачей
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    # Размер кэша подготовленных выражений asyncpg на соединение
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Подключение через PgBouncer в режиме transaction pooling: подготовленные выражения не кэшируются
+    DB_PGBOUNCER: bool = False
+    # Инлайн-режим: для скольких пользователей держать в памяти индекс открытых задач,
+    # сколько секунд он живёт, сколько задач в него попадает
+    # и сколько секунд Telegram может кэшировать ответ на инлайн-запрос
+    INLINE_INDEX_SIZE: int = 1000
+    INLINE_INDEX_TTL: float = 300.0
+    INLINE_INDEX_MAX_TASKS: int = 500
+    INLINE_CACHE_TIME: int = 30
+
+    # Реплика для чтения (postgresql+asyncpg://...); не задана — всё читается с основной базы
+    DB_REPLICA_URL: Optional[str] = None
+
     @property
     def DATABASE_URL(self):
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
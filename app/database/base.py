@@ -1,12 +1,59 @@
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.config import settings
+from app.database.pool import engine_options, install_pool_metrics
+from app.database.query_stats import install_query_accounting
+from app.database.routing import READ_SESSIONS, install_write_tracking, replica_allowed
+from app.database.unit_of_work import current_unit_of_work
+
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options())
+install_query_accounting(engine.sync_engine)
+install_pool_metrics(engine.pool, "primary")
+install_write_tracking(engine.sync_engine)
+
+primary_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+replica_engine = None
+replica_session_maker = None
+if settings.DB_REPLICA_URL:
+    replica_engine = create_async_engine(settings.DB_REPLICA_URL, **engine_options())
+    install_query_accounting(replica_engine.sync_engine)
+    install_pool_metrics(replica_engine.pool, "replica")
+    replica_session_maker = sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def async_session_maker() -> AsyncIterator[AsyncSession]:
+    """
+    Сессия основной базы. Внутри unit_of_work — на общем соединении апдейта:
+    commit() сессии только сбрасывает изменения, фиксирует их unit_of_work
+    """
+    uow = current_unit_of_work()
+    if uow is None:
+        async with primary_session_maker() as session:
+            yield session
+        return
 
+    connection = await uow.connection()
+    async with primary_session_maker(bind=connection, join_transaction_mode="rollback_only") as session:
+        yield session
 
-engine = create_async_engine(settings.DATABASE_URL)
 
-async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+def read_session_maker() -> AsyncContextManager[AsyncSession]:
+    """
+    Сессия только для чтения: с реплики, если она настроена
+    и в текущем апдейте ещё ничего не записано, иначе с основной базы
+    """
+    if replica_session_maker is not None and replica_allowed():
+        READ_SESSIONS.inc(target="replica")
+        return replica_session_maker()
+    READ_SESSIONS.inc(target="primary")
+    return async_session_maker()
 
 
 class Base(DeclarativeBase):
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, tuple_
+
+from app.database.base import async_session_maker, read_session_maker
+from app.database.enums import TaskStatus
+from app.database.models import Task, TaskArchive
+from app.database.rows import ARCHIVED_TASK_ROW_COLUMNS, ArchivedTaskRow
+
+FINISHED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.CANCELLED)
+
+# Колонки, которые переносятся из tasks в tasks_archive как есть
+ARCHIVED_COLUMNS = (
+    "id", "user_id", "title", "description", "status", "priority", "created_at", "updated_at",
+    "due_date", "completed_at", "children_total", "children_done",
+)
+
+
+class ArchiveDAO:
+    """Холодная история: завершённые задачи, вынесенные из tasks"""
+
+    @classmethod
+    async def archive_finished(cls, before: datetime, batch_size: int, pause: float) -> int:
+        """
+        Переносит задачи, завершённые раньше before, пачками по batch_size:
+        каждая пачка — один запрос WITH moved AS (DELETE ... RETURNING) INSERT ... SELECT
+        в своей короткой транзакции, между пачками — пауза pause секунд.
+        Возвращает число перенесённых задач
+        """
+        finished_at = func.coalesce(Task.completed_at, Task.updated_at)
+        archived = 0
+
+        while True:
+            # SKIP LOCKED: задачу, которую сейчас меняет пользователь, заберёт следующий запуск
+            batch = (
+                select(Task.id)
+                .where(Task.status.in_(FINISHED_STATUSES), finished_at < before)
+                .order_by(finished_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            moved = (
+                delete(Task)
+                .where(Task.id.in_(batch.scalar_subquery()))
+                .returning(*(getattr(Task, name) for name in ARCHIVED_COLUMNS), finished_at.label("finished_at"))
+                .cte("moved")
+            )
+            stmt = (
+                insert(TaskArchive)
+                .from_select([*ARCHIVED_COLUMNS, "finished_at"], select(moved))
+                .add_cte(moved)
+                .returning(TaskArchive.id)
+            )
+
+            async with async_session_maker() as session:
+                count = len((await session.execute(stmt)).all())
+                await session.commit()
+
+            archived += count
+            if count < batch_size:
+                return archived
+            # Даём место интерактивным запросам и автовакууму
+            await asyncio.sleep(pause)
+
+    @classmethod
+    async def get_archived(
+            cls,
+            user_id: int,
+            limit: int,
+            after: Optional[Tuple[datetime, int]] = None,
+    ) -> Tuple[List[ArchivedTaskRow], int]:
+        """Страница архива, завершённые последними первыми; after — (finished_at, id) последней показанной"""
+        async with read_session_maker() as session:
+            stmt = (
+                select(*ARCHIVED_TASK_ROW_COLUMNS)
+                .where(TaskArchive.user_id == user_id)
+                .order_by(TaskArchive.finished_at.desc(), TaskArchive.id.desc())
+                .limit(limit)
+            )
+            if after is not None:
+                stmt = stmt.where(tuple_(TaskArchive.finished_at, TaskArchive.id) < tuple_(*after))
+
+            tasks = list(map(ArchivedTaskRow._make, await session.execute(stmt)))
+
+            count_stmt = select(func.count(TaskArchive.id)).where(TaskArchive.user_id == user_id)
+            total = (await session.execute(count_stmt)).scalar()
+            return tasks, total
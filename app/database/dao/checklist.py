@@ -0,0 +1,130 @@
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import delete, insert, select, update
+
+from app.database.base import async_session_maker, read_session_maker
+from app.database.enums import TaskStatus
+from app.database.models import ChecklistItem, Task
+from app.database.rows import CHECKLIST_ITEM_ROW_COLUMNS, ChecklistItemRow
+
+
+class ChecklistProgress(NamedTuple):
+    """Счётчики задачи после изменения чек-листа"""
+    task_id: int
+    status: TaskStatus
+    total: int
+    done: int
+
+    @property
+    def completed(self) -> bool:
+        return self.total > 0 and self.done == self.total
+
+
+PROGRESS_COLUMNS = (Task.id, Task.status, Task.children_total, Task.children_done)
+
+
+class ChecklistDAO:
+    """
+    Пункты чек-листа. Каждая операция в той же транзакции меняет счётчики
+    children_total/children_done задачи, поэтому список задач их не пересчитывает
+    """
+    MAX_ITEMS = 30
+
+    @classmethod
+    async def get_items(cls, task_id: int, user_id: int) -> List[ChecklistItemRow]:
+        async with read_session_maker() as session:
+            stmt = (
+                select(*CHECKLIST_ITEM_ROW_COLUMNS)
+                .join(Task, ChecklistItem.task_id == Task.id)
+                .where(ChecklistItem.task_id == task_id, Task.user_id == user_id)
+                .order_by(ChecklistItem.id)
+            )
+
+            result = await session.execute(stmt)
+            return list(map(ChecklistItemRow._make, result))
+
+    @classmethod
+    async def add_items(cls, task_id: int, user_id: int, titles: List[str]) -> Optional[ChecklistProgress]:
+        """Добавляет пункты; None — задачи нет или пунктов стало бы больше MAX_ITEMS"""
+        async with async_session_maker() as session:
+            # Счётчик — первым: UPDATE блокирует задачу, лимит проверяется без гонки
+            stmt = (
+                update(Task)
+                .where(
+                    Task.id == task_id,
+                    Task.user_id == user_id,
+                    Task.children_total + len(titles) <= cls.MAX_ITEMS,
+                )
+                .values(children_total=Task.children_total + len(titles))
+                .returning(*PROGRESS_COLUMNS)
+            )
+            row = (await session.execute(stmt)).one_or_none()
+            if row is None:
+                return None
+
+            await session.execute(
+                insert(ChecklistItem),
+                [{"task_id": task_id, "title": title, "done": False} for title in titles],
+            )
+            await session.commit()
+            return ChecklistProgress._make(row)
+
+    @classmethod
+    async def toggle_item(cls, item_id: int, user_id: int) -> Optional[ChecklistProgress]:
+        """Отмечает пункт или снимает отметку; None — пункта нет"""
+        async with async_session_maker() as session:
+            stmt = (
+                update(ChecklistItem)
+                .where(
+                    ChecklistItem.id == item_id,
+                    ChecklistItem.task_id == Task.id,
+                    Task.user_id == user_id,
+                )
+                .values(done=~ChecklistItem.done)
+                .returning(ChecklistItem.task_id, ChecklistItem.done)
+            )
+            item = (await session.execute(stmt)).one_or_none()
+            if item is None:
+                return None
+
+            stmt = (
+                update(Task)
+                .where(Task.id == item.task_id)
+                .values(children_done=Task.children_done + (1 if item.done else -1))
+                .returning(*PROGRESS_COLUMNS)
+            )
+            row = (await session.execute(stmt)).one()
+            await session.commit()
+            return ChecklistProgress._make(row)
+
+    @classmethod
+    async def clear_done(cls, task_id: int, user_id: int) -> Optional[ChecklistProgress]:
+        """Удаляет отмеченные пункты; None — задачи нет"""
+        async with async_session_maker() as session:
+            stmt = (
+                delete(ChecklistItem)
+                .where(
+                    ChecklistItem.task_id == task_id,
+                    ChecklistItem.done.is_(True),
+                    ChecklistItem.task_id == Task.id,
+                    Task.user_id == user_id,
+                )
+                .returning(ChecklistItem.id)
+            )
+            removed = len((await session.execute(stmt)).all())
+
+            if removed:
+                stmt = (
+                    update(Task)
+                    .where(Task.id == task_id, Task.user_id == user_id)
+                    .values(
+                        children_total=Task.children_total - removed,
+                        children_done=Task.children_done - removed,
+                    )
+                    .returning(*PROGRESS_COLUMNS)
+                )
+            else:
+                stmt = select(*PROGRESS_COLUMNS).where(Task.id == task_id, Task.user_id == user_id)
+            row = (await session.execute(stmt)).one_or_none()
+            await session.commit()
+            return ChecklistProgress._make(row) if row else None
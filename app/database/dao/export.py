@@ -0,0 +1,30 @@
+from typing import AsyncIterator, List
+
+from sqlalchemy import select
+
+from app.database.base import read_session_maker
+from app.database.models import Task, TaskArchive
+from app.database.rows import ARCHIVED_EXPORT_ROW_COLUMNS, EXPORT_ROW_COLUMNS, ExportRow
+
+
+class ExportDAO:
+    @classmethod
+    async def stream_tasks(cls, user_id: int, chunk_size: int) -> AsyncIterator[List[ExportRow]]:
+        """
+        Все задачи пользователя — сначала из tasks, затем из архива — пачками по chunk_size.
+        Строки читаются серверным курсором, в памяти не больше одной пачки
+        """
+        queries = (
+            select(*EXPORT_ROW_COLUMNS)
+            .where(Task.user_id == user_id)
+            .order_by(Task.created_at, Task.id),
+            select(*ARCHIVED_EXPORT_ROW_COLUMNS)
+            .where(TaskArchive.user_id == user_id)
+            .order_by(TaskArchive.finished_at, TaskArchive.id),
+        )
+
+        async with read_session_maker() as session:
+            for stmt in queries:
+                result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+                async for partition in result.partitions():
+                    yield list(map(ExportRow._make, partition))
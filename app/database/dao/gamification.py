@@ -1,8 +1,8 @@
-from datetime import date, datetime
-from typing import List, Optional, Tuple
-from sqlalchemy import select, update, func
-from app.database.base import async_session_maker
-from app.database.models import User, UserAchievement, Task
+from datetime import date, datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import select, update, func, case
+from app.database.base import async_session_maker, read_session_maker
+from app.database.models import User, UserAchievement, Task, TaskArchive
 from app.database.enums import TaskStatus
 from app.constants.gamification import (
     ACHIEVEMENTS,
@@ -12,6 +12,32 @@ from app.constants.gamification import (
 )
 
 
+class CompletionResult(NamedTuple):
+    """Итог начисления за выполненные задачи"""
+    xp: int
+    level: int
+    leveled_up: bool
+    streak: int
+    streak_lost: bool
+    old_streak: int
+
+
+def _next_streak(user: User, today: date) -> Tuple[int, bool]:
+    """Стрик после выполнения задачи сегодня и потерян ли прежний"""
+    if user.last_completed_date is None:
+        # Первое выполнение
+        return 1, False
+    days = (today - user.last_completed_date).days
+    if days == 1:
+        # Продолжаем стрик
+        return user.current_streak + 1, False
+    if days > 1:
+        # Стрик потерян
+        return 1, user.current_streak > 1
+    # Уже выполняли сегодня
+    return user.current_streak, False
+
+
 class GamificationDAO:
     @classmethod
     async def add_xp(cls, user_id: int, xp_amount: int) -> Tuple[int, int, bool]:
@@ -56,23 +82,7 @@ class GamificationDAO:
 
             today = date.today()
             old_streak = user.current_streak
-            streak_lost = False
-
-            if user.last_completed_date is None:
-                # Первое выполнение
-                new_streak = 1
-            elif user.last_completed_date == today:
-                # Уже выполняли сегодня
-                new_streak = user.current_streak
-            elif (today - user.last_completed_date).days == 1:
-                # Продолжаем стрик
-                new_streak = user.current_streak + 1
-            elif (today - user.last_completed_date).days > 1:
-                # Стрик потерян
-                new_streak = 1
-                streak_lost = old_streak > 1
-            else:
-                new_streak = user.current_streak
+            new_streak, streak_lost = _next_streak(user, today)
 
             # Обновляем максимальный стрик
             new_max_streak = max(user.max_streak, new_streak)
@@ -127,13 +137,54 @@ class GamificationDAO:
             return new_total
 
     @classmethod
-    async def increment_created(cls, user_id: int) -> int:
-        """Увеличивает счётчик созданных задач"""
+    async def record_completions(cls, user_id: int, count: int, xp_amount: int) -> Optional[CompletionResult]:
+        """
+        Начисляет за count выполненных задач разом: XP и уровень, стрик, счётчики
+        выполненных — одним UPDATE вместо add_xp, update_streak и increment_completed на каждую
+        """
+        async with async_session_maker() as session:
+            stmt = select(User).where(User.id == user_id).with_for_update()
+            result = await session.execute(stmt)
+            user = result.scalar_one_or_none()
+
+            if not user:
+                return None
+
+            today = date.today()
+            new_xp = user.xp + xp_amount
+            new_level = get_level_from_xp(new_xp)
+            new_streak, streak_lost = _next_streak(user, today)
+            tasks_today = user.tasks_completed_today if user.last_activity_date == today else 0
+
+            update_stmt = (
+                update(User)
+                .where(User.id == user_id)
+                .values(
+                    xp=new_xp,
+                    level=new_level,
+                    current_streak=new_streak,
+                    max_streak=max(user.max_streak, new_streak),
+                    last_completed_date=today,
+                    total_completed=user.total_completed + count,
+                    tasks_completed_today=tasks_today + count,
+                    last_activity_date=today,
+                )
+            )
+            await session.execute(update_stmt)
+            await session.commit()
+
+            return CompletionResult(
+                new_xp, new_level, new_level > user.level, new_streak, streak_lost, user.current_streak
+            )
+
+    @classmethod
+    async def increment_created(cls, user_id: int, count: int = 1) -> int:
+        """Увеличивает счётчик созданных задач на count"""
         async with async_session_maker() as session:
             stmt = (
                 update(User)
                 .where(User.id == user_id)
-                .values(total_created=User.total_created + 1)
+                .values(total_created=User.total_created + count)
                 .returning(User.total_created)
             )
             result = await session.execute(stmt)
@@ -143,7 +194,7 @@ class GamificationDAO:
     @classmethod
     async def get_user_achievements(cls, user_id: int) -> List[str]:
         """Получает список ID достижений пользователя"""
-        async with async_session_maker() as session:
+        async with read_session_maker() as session:
             stmt = (
                 select(UserAchievement.achievement_id)
                 .where(UserAchievement.user_id == user_id)
@@ -181,10 +232,13 @@ class GamificationDAO:
     async def check_and_unlock_achievements(
             cls,
             user_id: int,
-            task: Optional[Task] = None
+            task: Optional[Task] = None,
+            tasks: Sequence[Task] = ()
     ) -> List[str]:
         """
         Проверяет и разблокирует достижения.
+        task — выполненная задача, tasks — задачи, выполненные разом (массовое действие):
+        достижение за задачу засчитывается, если условие выполнено хотя бы для одной.
         Возвращает список новых разблокированных достижений.
         """
         async with async_session_maker() as session:
@@ -247,11 +301,12 @@ class GamificationDAO:
                     unlocked.append("speed_demon")
 
             # Проверяем достижения, связанные с задачей
-            if task:
+            done_tasks = [task] if task else list(tasks)
+            if done_tasks:
                 now = datetime.now()
 
                 # Высокий приоритет
-                if "high_priority" not in current_achievements and task.priority == 10:
+                if "high_priority" not in current_achievements and any(t.priority == 10 for t in done_tasks):
                     if await cls.unlock_achievement(user_id, "high_priority"):
                         unlocked.append("high_priority")
 
@@ -266,14 +321,16 @@ class GamificationDAO:
                         unlocked.append("night_owl")
 
                 # Перфекционист (выполнено до дедлайна)
-                if task.due_date and "perfectionist" not in current_achievements:
-                    if now < task.due_date:
+                # Сроки хранятся с часовым поясом — сравниваем с aware-временем
+                if "perfectionist" not in current_achievements:
+                    now_utc = datetime.now(timezone.utc)
+                    if any(t.due_date and now_utc < t.due_date for t in done_tasks):
                         if await cls.unlock_achievement(user_id, "perfectionist"):
                             unlocked.append("perfectionist")
 
                 # Без прокрастинации (в день создания)
                 if "no_procrastination" not in current_achievements:
-                    if task.created_at.date() == now.date():
+                    if any(t.created_at.date() == now.date() for t in done_tasks):
                         if await cls.unlock_achievement(user_id, "no_procrastination"):
                             unlocked.append("no_procrastination")
 
@@ -282,7 +339,7 @@ class GamificationDAO:
     @classmethod
     async def get_user_stats(cls, user_id: int) -> dict:
         """Получает полную статистику пользователя"""
-        async with async_session_maker() as session:
+        async with read_session_maker() as session:
             stmt = select(User).where(User.id == user_id)
             result = await session.execute(stmt)
             user = result.scalar_one_or_none()
@@ -299,6 +356,15 @@ class GamificationDAO:
             tasks_result = await session.execute(tasks_stmt)
             status_counts = dict(tasks_result.all())
 
+            # Задачи, перенесённые в архив, тоже учитываются
+            archive_stmt = (
+                select(TaskArchive.status, func.count(TaskArchive.id))
+                .where(TaskArchive.user_id == user_id)
+                .group_by(TaskArchive.status)
+            )
+            for status, count in (await session.execute(archive_stmt)).all():
+                status_counts[status] = status_counts.get(status, 0) + count
+
             # Считаем достижения
             achievements_stmt = (
                 select(func.count(UserAchievement.id))
@@ -324,7 +390,7 @@ class GamificationDAO:
     @classmethod
     async def get_leaderboard(cls, limit: int = 10) -> List[Tuple[User, int]]:
         """Получает топ пользователей по XP"""
-        async with async_session_maker() as session:
+        async with read_session_maker() as session:
             stmt = (
                 select(User)
                 .order_by(User.xp.desc())
@@ -333,4 +399,38 @@ class GamificationDAO:
             result = await session.execute(stmt)
             users = result.scalars().all()
 
-            return [(user, idx + 1) for idx, user in enumerate(users)]
\ No newline at end of file
+            return [(user, idx + 1) for idx, user in enumerate(users)]
+
+    @classmethod
+    async def get_weekly_stats(cls, user_id: int) -> dict:
+        """
+        Статистика за последние 7 дней: выполнено, создано и примерный XP
+        (по той же формуле, что и get_task_xp, без бонусов за достижения)
+        """
+        async with read_session_maker() as session:
+            week_ago = datetime.utcnow() - timedelta(days=7)
+            completed_this_week = Task.completed_at >= week_ago
+
+            task_xp = (
+                10
+                + func.coalesce(Task.priority, 1) * 2
+                + case((Task.due_date.is_(None) | (Task.completed_at <= Task.due_date), 15), else_=0)
+                + case((func.date(Task.created_at) == func.date(Task.completed_at), 10), else_=0)
+            )
+
+            stmt = (
+                select(
+                    func.count(Task.id).filter(completed_this_week),
+                    func.count(Task.id).filter(Task.created_at >= week_ago),
+                    func.coalesce(func.sum(task_xp).filter(completed_this_week), 0),
+                )
+                .where(Task.user_id == user_id)
+            )
+            result = await session.execute(stmt)
+            completed, created, xp_earned = result.one()
+
+            return {
+                "completed": completed,
+                "created": created,
+                "xp_earned": xp_earned,
+            }
@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import delete, select
+from app.database.base import async_session_maker, read_session_maker
+from app.database.models import JobRun
+
+
+class JobRunDAO:
+    @classmethod
+    async def add_run(cls, retention_days: int, **values) -> None:
+        """Сохраняет запуск задачи и удаляет записи старше retention_days"""
+        async with async_session_maker() as session:
+            session.add(JobRun(**values))
+
+            stmt = (
+                delete(JobRun)
+                .where(JobRun.started_at < datetime.utcnow() - timedelta(days=retention_days))
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+    @classmethod
+    async def get_runs(cls, job_id: str, limit: int = 50) -> List[JobRun]:
+        """Последние запуски задачи, новые первыми"""
+        async with read_session_maker() as session:
+            stmt = (
+                select(JobRun)
+                .where(JobRun.job_id == job_id)
+                .order_by(JobRun.started_at.desc())
+                .limit(limit)
+            )
+            result = await session.execute(stmt)
+            return result.scalars().all()
@@ -1,22 +1,30 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Tuple
 from sqlalchemy import select, update, and_
-from app.database.base import async_session_maker
+from app.database.base import async_session_maker, read_session_maker
 from app.database.models import Task, User
+from app.database.rows import (
+    RECIPIENT_ROW_COLUMNS,
+    REMINDER_ROW_COLUMNS,
+    SUMMARY_TASK_ROW_COLUMNS,
+    RecipientRow,
+    ReminderRow,
+    SummaryTaskRow,
+)
 from app.database.enums import TaskStatus
 
 
 class ReminderDAO:
     @classmethod
-    async def get_tasks_for_reminder(cls) -> List[Tuple[Task, User]]:
+    async def get_tasks_for_reminder(cls) -> List[ReminderRow]:
         """
         Получает задачи, для которых нужно отправить напоминание о приближающемся сроке
         """
-        async with async_session_maker() as session:
+        async with read_session_maker() as session:
             now = datetime.utcnow()
 
             stmt = (
-                select(Task, User)
+                select(*REMINDER_ROW_COLUMNS)
                 .join(User, Task.user_id == User.id)
                 .where(
                     and_(
@@ -33,18 +41,18 @@ class ReminderDAO:
             )
 
             result = await session.execute(stmt)
-            return result.all()
+            return list(map(ReminderRow._make, result))
 
     @classmethod
-    async def get_overdue_tasks(cls) -> List[Tuple[Task, User]]:
+    async def get_overdue_tasks(cls) -> List[ReminderRow]:
         """
         Получает просроченные задачи, для которых не отправлялось напоминание
         """
-        async with async_session_maker() as session:
+        async with read_session_maker() as session:
             now = datetime.utcnow()
 
             stmt = (
-                select(Task, User)
+                select(*REMINDER_ROW_COLUMNS)
                 .join(User, Task.user_id == User.id)
                 .where(
                     and_(
@@ -59,28 +67,28 @@ class ReminderDAO:
             )
 
             result = await session.execute(stmt)
-            return result.all()
+            return list(map(ReminderRow._make, result))
 
     @classmethod
-    async def get_daily_summary(cls) -> List[Tuple[User, List[Task]]]:
+    async def get_daily_summary(cls) -> List[Tuple[RecipientRow, List[SummaryTaskRow]]]:
         """
         Получает пользователей с их задачами на сегодня для утренней сводки
         """
-        async with async_session_maker() as session:
+        async with read_session_maker() as session:
             now = datetime.utcnow()
             today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
             today_end = today_start + timedelta(days=1)
 
             # Получаем пользователей с включенными напоминаниями
-            users_stmt = select(User).where(User.reminders_enabled == True)
+            users_stmt = select(*RECIPIENT_ROW_COLUMNS).where(User.reminders_enabled == True)
             users_result = await session.execute(users_stmt)
-            users = users_result.scalars().all()
+            users = list(map(RecipientRow._make, users_result))
 
             result = []
             for user in users:
                 # Задачи на сегодня
                 tasks_stmt = (
-                    select(Task)
+                    select(*SUMMARY_TASK_ROW_COLUMNS)
                     .where(
                         and_(
                             Task.user_id == user.id,
@@ -91,13 +99,43 @@ class ReminderDAO:
                     .order_by(Task.priority.desc(), Task.due_date.asc())
                 )
                 tasks_result = await session.execute(tasks_stmt)
-                tasks = tasks_result.scalars().all()
+                tasks = list(map(SummaryTaskRow._make, tasks_result))
 
                 if tasks:
                     result.append((user, tasks))
 
             return result
 
+    @classmethod
+    async def get_users_with_streak_at_risk(cls) -> List[RecipientRow]:
+        """
+        Пользователи со стриком, которые вчера выполняли задачи, а сегодня ещё нет
+        """
+        async with read_session_maker() as session:
+            yesterday = date.today() - timedelta(days=1)
+
+            stmt = (
+                select(*RECIPIENT_ROW_COLUMNS)
+                .where(
+                    and_(
+                        User.reminders_enabled == True,
+                        User.current_streak > 0,
+                        User.last_completed_date == yesterday,
+                    )
+                )
+            )
+
+            result = await session.execute(stmt)
+            return list(map(RecipientRow._make, result))
+
+    @classmethod
+    async def get_all_active_users(cls) -> List[RecipientRow]:
+        """Пользователи с включёнными напоминаниями (для еженедельной статистики)"""
+        async with read_session_maker() as session:
+            stmt = select(*RECIPIENT_ROW_COLUMNS).where(User.reminders_enabled == True)
+            result = await session.execute(stmt)
+            return list(map(RecipientRow._make, result))
+
     @classmethod
     async def mark_reminder_sent(cls, task_id: int) -> None:
         """Отмечает, что напоминание отправлено"""
@@ -0,0 +1,69 @@
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.base import read_session_maker
+from app.database.models import Tag, Task, TaskTag
+from app.database.rows import TagRow
+from app.utils.tags import extract_tags
+
+
+async def set_task_tags(session: AsyncSession, tasks: Iterable, replace: bool = False) -> None:
+    """
+    Связывает задачи (объекты с id, user_id и title) с тегами из их названий.
+    Выполняется в транзакции вызывающего DAO; replace — сначала убрать старые связи
+    """
+    tasks = list(tasks)
+    pairs = [(task.id, name) for task in tasks for name in extract_tags(task.title)]
+
+    if replace:
+        await session.execute(delete(TaskTag).where(TaskTag.task_id.in_([task.id for task in tasks])))
+    if not pairs:
+        return
+
+    user_ids = {task.id: task.user_id for task in tasks}
+    names = {(user_ids[task_id], name) for task_id, name in pairs}
+    await session.execute(
+        pg_insert(Tag)
+        .values([{"user_id": user_id, "name": name} for user_id, name in sorted(names)])
+        .on_conflict_do_nothing(index_elements=[Tag.user_id, Tag.name])
+    )
+
+    # created_at берётся из задачи — по нему сортируется страница тега
+    await session.execute(
+        insert(TaskTag).from_select(
+            [TaskTag.task_id, TaskTag.tag_id, TaskTag.user_id, TaskTag.created_at],
+            select(Task.id, Tag.id, Task.user_id, Task.created_at)
+            .join(Tag, Tag.user_id == Task.user_id)
+            .where(tuple_(Task.id, Tag.name).in_(pairs)),
+        )
+    )
+
+
+class TagDAO:
+    TAGS_LIMIT = 20
+
+    @classmethod
+    async def get_user_tags(cls, user_id: int) -> List[TagRow]:
+        """Теги пользователя с числом задач, самые частые первыми"""
+        async with read_session_maker() as session:
+            tasks = func.count(TaskTag.task_id)
+            stmt = (
+                select(Tag.id, Tag.name, tasks)
+                .join(TaskTag, (TaskTag.tag_id == Tag.id) & (TaskTag.user_id == user_id))
+                .where(Tag.user_id == user_id)
+                .group_by(Tag.id)
+                .order_by(tasks.desc(), Tag.name)
+                .limit(cls.TAGS_LIMIT)
+            )
+
+            result = await session.execute(stmt)
+            return list(map(TagRow._make, result))
+
+    @classmethod
+    async def get_tag_name(cls, tag_id: int, user_id: int) -> Optional[str]:
+        async with read_session_maker() as session:
+            stmt = select(Tag.name).where(Tag.id == tag_id, Tag.user_id == user_id)
+            return (await session.execute(stmt)).scalar_one_or_none()
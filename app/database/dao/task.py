@@ -1,14 +1,67 @@
-from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import delete, select, update, func
-from app.database.base import async_session_maker
-from app.database.enums import TaskStatus
-from app.database.models import Task
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Tuple
+from sqlalchemy import Integer, cast, delete, insert, literal, literal_column, or_, select, tuple_, update, func
+from app.database.base import async_session_maker, read_session_maker
+from app.database.dao.tag import set_task_tags
+from app.database.unit_of_work import after_commit
+from app.database.enums import ALLOWED_TRANSITIONS, TaskStatus, TaskView
+from app.database.models import Task, TaskTag
+from app.database.rows import TASK_ROW_COLUMNS, SearchRow, TaskRow
+from app.utils.recurrence import Recurrence
+from app.utils.task_index import task_index
+
+OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+
+
+class StatusTransition(NamedTuple):
+    task: Task
+    old_status: TaskStatus
+    # Следующее вхождение повторяющейся задачи, созданное вместе с выполнением текущей
+    next_task: Optional[Task] = None
+
+
+def _tasks_changed(user_id: int) -> None:
+    """Сбрасывает кэши задач пользователя, когда запись зафиксирована"""
+    after_commit(lambda: task_index.invalidate(user_id))
+
+
+def _today_start() -> datetime:
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_occurrence_values(task, rule: Recurrence, today_start: datetime) -> dict:
+    """Колонки следующего вхождения: копия задачи со сроком по правилу"""
+    return {
+        "user_id": task.user_id,
+        "title": task.title,
+        "description": task.description,
+        "priority": task.priority,
+        "due_date": rule.next_after(task.due_date or today_start, today_start),
+        **rule.columns(),
+    }
+
+
+async def _insert_next_occurrences(session, tasks, today_start: datetime) -> None:
+    """Один многострочный INSERT следующих вхождений для повторяющихся задач из tasks"""
+    values = [
+        _next_occurrence_values(task, rule, today_start)
+        for task in tasks
+        if (rule := Recurrence.of(task)) is not None
+    ]
+    if values:
+        created = await session.execute(insert(Task).returning(Task.id, Task.user_id, Task.title), values)
+        await set_task_tags(session, created.all())
 
 
 class TaskDAO:
     # Добавляем константу для пагинации
     TASKS_PER_PAGE = 5
+    # С какого приоритета задача попадает в список «Важные»
+    HIGH_PRIORITY = 8
+    # Релевантность — дробное число; для курсора в callback_data она масштабируется до целого
+    SEARCH_RANK_SCALE = 1_000_000
+    # Та же конфигурация, что в Task.search_vector; литералом, а не параметром — иначе тип не regconfig
+    SEARCH_CONFIG = literal_column("'russian'::regconfig")
 
     @classmethod
     async def create_and_get_task(
@@ -18,7 +71,12 @@ class TaskDAO:
             description: str,
             priority: int | None = 1,
             due_date: datetime | None = None,
+            recurrence: Recurrence | None = None,
     ) -> Task:
+        if recurrence is not None and due_date is None:
+            # От срока считаются следующие вхождения
+            due_date = _today_start()
+
         async with async_session_maker() as session:
             task = Task(
                 user_id=user_id,
@@ -26,21 +84,42 @@ class TaskDAO:
                 description=description,
                 priority=priority,
                 due_date=due_date,
+                **(recurrence.columns() if recurrence else {}),
             )
 
             session.add(task)
+            await session.flush()
+            await set_task_tags(session, [task])
             await session.commit()
             await session.refresh(task)
+            _tasks_changed(user_id)
 
             return task
 
+    @classmethod
+    async def create_many(cls, user_id: int, tasks: List[dict]) -> int:
+        """
+        Создаёт задачи одним многострочным INSERT (executemany) и связывает их с тегами.
+        tasks — колонки задач без user_id. Возвращает число созданных
+        """
+        async with async_session_maker() as session:
+            created = await session.execute(
+                insert(Task).returning(Task.id, Task.user_id, Task.title),
+                [{"user_id": user_id, **task} for task in tasks],
+            )
+            await set_task_tags(session, created.all())
+            await session.commit()
+            _tasks_changed(user_id)
+
+            return len(tasks)
+
     @classmethod
     async def get_task(
             cls,
             task_id: int,
             user_id: int,
     ) -> Optional[Task]:
-        async with async_session_maker() as session:
+        async with read_session_maker() as session:
             stmt = (
                 select(Task)
                 .where(
@@ -60,9 +139,10 @@ class TaskDAO:
             only_overdue: bool = False,
             limit: int | None = None,
             offset: int | None = None,
-    ) -> List[Task]:
-        async with async_session_maker() as session:
-            stmt = select(Task).where(Task.user_id == user_id)
+    ) -> List[TaskRow]:
+        """Задачи пользователя для списка: только колонки, которые в нём показываются"""
+        async with read_session_maker() as session:
+            stmt = select(*TASK_ROW_COLUMNS).where(Task.user_id == user_id)
 
             if status:
                 stmt = stmt.where(Task.status == status)
@@ -82,7 +162,80 @@ class TaskDAO:
                 stmt = stmt.offset(offset)
 
             result = await session.execute(stmt)
-            return result.scalars().all()
+            return list(map(TaskRow._make, result))
+
+    @classmethod
+    def _view_filter(cls, view: TaskView) -> tuple:
+        """Условия списка view по открытым задачам (частичные индексы ix_tasks_open_*)"""
+        now = datetime.now(timezone.utc)
+        if view == TaskView.OVERDUE:
+            condition = (Task.due_date < now,)
+        elif view == TaskView.TODAY:
+            today_start = _today_start()
+            condition = (Task.due_date >= today_start, Task.due_date < today_start + timedelta(days=1))
+        elif view == TaskView.HIGH_PRIORITY:
+            condition = (Task.priority >= cls.HIGH_PRIORITY,)
+        else:
+            raise ValueError(f"Unknown task view {view!r}")
+        return (Task.status.in_(OPEN_STATUSES), *condition)
+
+    @classmethod
+    async def get_view(
+            cls,
+            user_id: int,
+            view: TaskView,
+            limit: int,
+            tag_id: int | None = None,
+            after: Optional[Tuple[datetime, int]] = None,
+    ) -> Tuple[List[TaskRow], int]:
+        """
+        Страница отфильтрованного списка, новые задачи первыми, и число задач в списке —
+        одним запросом. after — (created_at, id) последней показанной задачи.
+        Число 0, если страница пуста
+        """
+        if view == TaskView.TAG:
+            # Задачи тега и их количество — из индекса task_tags, tasks читается только для страницы
+            source = (TaskTag.user_id == user_id, TaskTag.tag_id == tag_id)
+            order = (TaskTag.created_at, TaskTag.task_id)
+            rows = select(*TASK_ROW_COLUMNS).join_from(TaskTag, Task, Task.id == TaskTag.task_id)
+            total = select(func.count()).select_from(TaskTag).where(*source)
+        else:
+            source = (Task.user_id == user_id, *cls._view_filter(view))
+            order = (Task.created_at, Task.id)
+            rows = select(*TASK_ROW_COLUMNS)
+            total = select(func.count(Task.id)).where(*source)
+
+        async with read_session_maker() as session:
+            stmt = (
+                rows.add_columns(total.correlate(None).scalar_subquery())
+                .where(*source)
+                .order_by(*(column.desc() for column in order))
+                .limit(limit)
+            )
+            if after is not None:
+                stmt = stmt.where(tuple_(*order) < tuple_(*after))
+
+            result = (await session.execute(stmt)).all()
+            if not result:
+                return [], 0
+            return [TaskRow._make(row[:-1]) for row in result], result[0][-1]
+
+    @classmethod
+    async def get_open_tasks(cls, user_id: int, limit: int) -> List[TaskRow]:
+        """Невыполненные задачи для инлайн-режима: важные и свежие первыми"""
+        async with read_session_maker() as session:
+            stmt = (
+                select(*TASK_ROW_COLUMNS)
+                .where(
+                    Task.user_id == user_id,
+                    Task.status.in_(OPEN_STATUSES),
+                )
+                .order_by(Task.priority.desc().nulls_last(), Task.created_at.desc())
+                .limit(limit)
+            )
+
+            result = await session.execute(stmt)
+            return list(map(TaskRow._make, result))
 
     @classmethod
     async def update_and_get_task(
@@ -119,37 +272,65 @@ class TaskDAO:
             task = result.scalar_one_or_none()
 
             if task:
+                if title is not None:
+                    await set_task_tags(session, [task], replace=True)
                 await session.commit()
+                _tasks_changed(user_id)
 
             return task
 
     @classmethod
-    async def mark_status(
+    async def transition(
             cls,
             task_id: int,
             user_id: int,
             status: TaskStatus,
-    ) -> Optional[Task]:
+    ) -> Optional[StatusTransition]:
         """
-        Отмечаем задачу каким-то статусом status
+        Переводит задачу в статус status одним условным UPDATE, если текущий статус
+        разрешён ALLOWED_TRANSITIONS. Строка блокируется подзапросом FOR UPDATE,
+        из него же берётся старый статус. Выполнение повторяющейся задачи в той же
+        транзакции создаёт её следующее вхождение. None — задачи нет или переход не разрешён
         """
+        old = (
+            select(Task.id, Task.status.label("old_status"))
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .with_for_update()
+            .subquery()
+        )
+
         async with async_session_maker() as session:
             stmt = (
                 update(Task)
-                .where(Task.id == task_id, Task.user_id == user_id)
+                .where(
+                    Task.id == old.c.id,
+                    old.c.old_status.in_(ALLOWED_TRANSITIONS[status]),
+                )
                 .values(
                     status=status,
-                    completed_at=datetime.utcnow() if status == TaskStatus.COMPLETED else None,
+                    completed_at=func.now() if status == TaskStatus.COMPLETED else None,
                 )
-                .returning(Task)
+                .returning(Task, old.c.old_status)
             )
 
             result = await session.execute(stmt)
-            task = result.scalar_one_or_none()
+            row = result.one_or_none()
 
-            if task:
-                await session.commit()
-            return task
+            if row is None:
+                return None
+
+            task, old_status = row
+            next_task = None
+            rule = Recurrence.of(task)
+            if status == TaskStatus.COMPLETED and rule is not None:
+                next_task = Task(**_next_occurrence_values(task, rule, _today_start()))
+                session.add(next_task)
+                await session.flush()
+                await set_task_tags(session, [next_task])
+
+            await session.commit()
+            _tasks_changed(user_id)
+            return StatusTransition(task, old_status, next_task)
 
     @classmethod
     async def delete_task(
@@ -173,12 +354,157 @@ class TaskDAO:
             result = await session.execute(stmt)
             await session.commit()
 
+            if result.rowcount:
+                _tasks_changed(user_id)
+
             return result.rowcount > 0
 
+    @classmethod
+    async def complete_many(cls, task_ids: List[int], user_id: int) -> List[Task]:
+        """
+        Выполняет несколько задач одним UPDATE (только те, что можно выполнить)
+        и создаёт следующие вхождения повторяющихся. Возвращает выполненные задачи
+        """
+        async with async_session_maker() as session:
+            stmt = (
+                update(Task)
+                .where(
+                    Task.id.in_(task_ids),
+                    Task.user_id == user_id,
+                    Task.status.in_(ALLOWED_TRANSITIONS[TaskStatus.COMPLETED]),
+                )
+                .values(status=TaskStatus.COMPLETED, completed_at=func.now())
+                .returning(Task)
+            )
+            tasks = list((await session.execute(stmt)).scalars())
+
+            if tasks:
+                await _insert_next_occurrences(session, tasks, _today_start())
+                await session.commit()
+                _tasks_changed(user_id)
+            return tasks
+
+    @classmethod
+    async def update_many(cls, task_ids: List[int], user_id: int, **values) -> int:
+        """
+        Одним UPDATE меняет поля нескольких задач (priority, due_date).
+        При смене срока напоминания о нём отправляются заново
+        """
+        if "due_date" in values:
+            values.update(reminder_sent=False, overdue_reminder_sent=False)
+
+        async with async_session_maker() as session:
+            stmt = (
+                update(Task)
+                .where(Task.id.in_(task_ids), Task.user_id == user_id)
+                .values(**values)
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+
+            if result.rowcount:
+                _tasks_changed(user_id)
+            return result.rowcount
+
+    @classmethod
+    async def delete_many(cls, task_ids: List[int], user_id: int) -> int:
+        """Удаляет несколько задач одним DELETE, возвращает число удалённых"""
+        async with async_session_maker() as session:
+            stmt = delete(Task).where(Task.id.in_(task_ids), Task.user_id == user_id)
+            result = await session.execute(stmt)
+            await session.commit()
+
+            if result.rowcount:
+                _tasks_changed(user_id)
+            return result.rowcount
+
+    @classmethod
+    async def roll_forward_missed(cls, batch_size: int) -> int:
+        """
+        Отменяет вхождения повторяющихся задач, чей срок прошёл до начала суток,
+        и создаёт вместо них следующие — пачками по batch_size: один UPDATE ... RETURNING
+        и один многострочный INSERT на пачку. Возвращает число перенесённых задач
+        """
+        today_start = _today_start()
+        moved = 0
+
+        while True:
+            # SKIP LOCKED: задачу, которую сейчас выполняют, перенесёт её собственный transition
+            missed = (
+                select(Task.id)
+                .where(
+                    Task.recurrence.isnot(None),
+                    Task.status.in_(OPEN_STATUSES),
+                    Task.due_date < today_start,
+                )
+                .order_by(Task.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+
+            async with async_session_maker() as session:
+                result = await session.execute(
+                    update(Task)
+                    .where(Task.id.in_(missed.scalar_subquery()))
+                    .values(status=TaskStatus.CANCELLED)
+                    .returning(
+                        Task.user_id, Task.title, Task.description, Task.priority, Task.due_date,
+                        Task.recurrence, Task.recurrence_interval, Task.recurrence_weekdays,
+                    )
+                )
+                rows = result.all()
+                await _insert_next_occurrences(session, rows, today_start)
+                await session.commit()
+
+            for user_id in {row.user_id for row in rows}:
+                _tasks_changed(user_id)
+            moved += len(rows)
+            if len(rows) < batch_size:
+                return moved
+
     @classmethod
     async def count_tasks(cls, user_id: int) -> int:
         """Подсчет общего количества задач пользователя"""
-        async with async_session_maker() as session:
+        async with read_session_maker() as session:
             stmt = select(func.count(Task.id)).where(Task.user_id == user_id)
             result = await session.execute(stmt)
-            return result.scalar()
\ No newline at end of file
+            return result.scalar()
+
+    @classmethod
+    async def search(
+            cls,
+            user_id: int,
+            query: str,
+            limit: int,
+            after: Optional[Tuple[int, int]] = None,
+    ) -> List[SearchRow]:
+        """
+        Поиск по названию и описанию: полнотекстовый (русская морфология)
+        плюс нечёткое совпадение слов названия по триграммам.
+        Сортировка по релевантности; after — (rank, id) последней показанной задачи
+        """
+        ts_query = func.websearch_to_tsquery(cls.SEARCH_CONFIG, query)
+        rank = cast(
+            (func.ts_rank_cd(Task.search_vector, ts_query) + func.word_similarity(query, Task.title))
+            * cls.SEARCH_RANK_SCALE,
+            Integer,
+        )
+
+        async with read_session_maker() as session:
+            stmt = (
+                select(*TASK_ROW_COLUMNS, rank)
+                .where(
+                    Task.user_id == user_id,
+                    or_(
+                        Task.search_vector.bool_op("@@")(ts_query),
+                        literal(query).bool_op("<%")(Task.title),
+                    ),
+                )
+                .order_by(rank.desc(), Task.id.desc())
+                .limit(limit)
+            )
+            if after is not None:
+                stmt = stmt.where(tuple_(rank, Task.id) < tuple_(*after))
+
+            result = await session.execute(stmt)
+            return list(map(SearchRow._make, result))
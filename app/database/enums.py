@@ -1,4 +1,5 @@
-from enum import Enum
+from enum import Enum, IntEnum
+from typing import Dict, FrozenSet
 
 
 class TaskStatus(str, Enum):
@@ -6,3 +7,28 @@ class TaskStatus(str, Enum):
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
+
+
+class RecurrenceKind(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    EVERY_N_DAYS = "every_n_days"
+
+
+class TaskView(IntEnum):
+    """Отфильтрованные списки задач; значение упаковывается в callback_data"""
+    OVERDUE = 1
+    TODAY = 2
+    HIGH_PRIORITY = 3
+    TAG = 4
+
+
+# Из каких статусов можно перейти в данный. Выполненная задача назад не возвращается —
+# иначе её можно выполнить повторно и снова получить XP
+ALLOWED_TRANSITIONS: Dict[TaskStatus, FrozenSet[TaskStatus]] = {
+    TaskStatus.PENDING: frozenset({TaskStatus.IN_PROGRESS, TaskStatus.CANCELLED}),
+    TaskStatus.IN_PROGRESS: frozenset({TaskStatus.PENDING}),
+    TaskStatus.COMPLETED: frozenset({TaskStatus.PENDING, TaskStatus.IN_PROGRESS}),
+    TaskStatus.CANCELLED: frozenset({TaskStatus.PENDING, TaskStatus.IN_PROGRESS}),
+}
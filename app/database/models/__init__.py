@@ -1,3 +1,7 @@
 from .user import User
 from .task import Task
-from .achievement import UserAchievement
\ No newline at end of file
+from .achievement import UserAchievement
+from .job_run import JobRun
+from .checklist import ChecklistItem
+from .tag import Tag, TaskTag
+from .archive import TaskArchive
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, func
+
+from app.database.base import Base
+from app.database.enums import TaskStatus
+
+
+class TaskArchive(Base):
+    """
+    Выполненные и отменённые задачи, перенесённые из tasks ночной архивацией
+    (TaskDAO.archive_finished). id — прежний id задачи. Пункты чек-листа и связи
+    с тегами удаляются вместе с задачей, в архиве остаются только счётчики пунктов
+    """
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(ForeignKey("users.id"), nullable=False)
+    title = Column(String, nullable=False)
+    description = Column(String, nullable=False)
+    status = Column(Enum(TaskStatus, name="task_status"), nullable=False)
+    priority = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    due_date = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Когда задача завершена: completed_at, у отменённых — время последнего изменения
+    finished_at = Column(DateTime(timezone=True), nullable=False)
+    children_total = Column(Integer, nullable=False, default=0, server_default="0")
+    children_done = Column(Integer, nullable=False, default=0, server_default="0")
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # История пользователя: завершённые последними первыми, keyset по (finished_at, id)
+        Index("ix_tasks_archive_user_id_finished_at", "user_id", "finished_at", "id"),
+    )
@@ -0,0 +1,18 @@
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, func
+
+from app.database.base import Base
+
+
+class ChecklistItem(Base):
+    """Пункт чек-листа задачи. Счётчики пунктов хранятся в самой задаче (children_total/children_done)"""
+    __tablename__ = "checklist_items"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    title = Column(String, nullable=False)
+    done = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_checklist_items_task_id", "task_id"),
+    )
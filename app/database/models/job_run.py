@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, func
+
+from app.database.base import Base
+
+
+class JobRun(Base):
+    """История запусков задач планировщика"""
+    __tablename__ = "job_runs"
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String, nullable=False)
+    status = Column(String, nullable=False)  # ok / failed
+    error = Column(String, nullable=True)
+
+    scheduled_at = Column(DateTime(timezone=True), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    start_lag = Column(Float, nullable=True)  # Секунды между плановым и фактическим стартом
+    duration = Column(Float, nullable=False)  # Секунды
+
+    rows_scanned = Column(Integer, nullable=False, default=0)
+    messages_attempted = Column(Integer, nullable=False, default=0)
+    messages_sent = Column(Integer, nullable=False, default=0)
+    messages_failed = Column(Integer, nullable=False, default=0)
+
+    queries = Column(Integer, nullable=False, default=0)
+    db_time = Column(Float, nullable=False, default=0)  # Секунды в БД
+    api_time = Column(Float, nullable=False, default=0)  # Секунды в Bot API
+
+    __table_args__ = (
+        Index("ix_job_runs_job_id_started_at", "job_id", "started_at"),
+    )
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, func
+
+from app.database.base import Base
+
+
+class Tag(Base):
+    """Тег (проект) пользователя: #слово из названия задачи, в нижнем регистре и без «#»"""
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(ForeignKey("users.id"), nullable=False)
+    name = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_tags_user_id_name"),
+    )
+
+
+class TaskTag(Base):
+    """
+    Связь задачи с тегом. user_id и created_at копируются из задачи: страница
+    задач тега и её количество читаются из одного индекса, без обращения к tasks
+    """
+    __tablename__ = "task_tags"
+
+    task_id = Column(ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # task_id в конце ключа — покрывающий индекс и порядок для keyset-пагинации
+        Index("ix_task_tags_user_id_tag_id_created_at", "user_id", "tag_id", "created_at", "task_id"),
+    )
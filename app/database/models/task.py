@@ -1,17 +1,21 @@
 from sqlalchemy import (
     Column,
+    Computed,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Boolean,
-    func
+    func,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from app.database.base import Base
-from app.database.enums import TaskStatus
+from app.database.enums import RecurrenceKind, TaskStatus
 
 
 class Task(Base):
@@ -36,6 +40,12 @@ class Task(Base):
         nullable=False,
         server_default=func.now()
     )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now()
+    )
     due_date = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -43,4 +53,56 @@ class Task(Base):
     reminder_sent = Column(Boolean, default=False)  # Отправлено ли напоминание о приближающемся сроке
     overdue_reminder_sent = Column(Boolean, default=False)  # Отправлено ли напоминание о просрочке
 
-    user = relationship("User", back_populates="tasks")
\ No newline at end of file
+    # Пункты чек-листа: сколько всего и сколько отмечено. Меняются в одной транзакции
+    # с пунктами (ChecklistDAO), чтобы список задач не считал их подзапросом
+    children_total = Column(Integer, nullable=False, default=0, server_default="0")
+    children_done = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Правило повторения (см. app.utils.recurrence). В базе есть только ближайшее вхождение:
+    # следующее создаётся, когда текущее выполнено или пропущено
+    recurrence = Column(Enum(RecurrenceKind, name="task_recurrence"), nullable=True)
+    recurrence_interval = Column(Integer, nullable=True)  # Шаг в днях для EVERY_N_DAYS
+    recurrence_weekdays = Column(Integer, nullable=True)  # Дни недели для WEEKLY: пн — 1, вт — 2, ..., вс — 64
+
+    # Поисковый вектор: название весомее описания. Считается самой базой,
+    # в обычных запросах не загружается
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    ))
+
+    user = relationship("User", back_populates="tasks")
+
+    __table_args__ = (
+        # Список задач пользователя: новые первыми, keyset по (created_at, id)
+        Index("ix_tasks_user_id_created_at", "user_id", "created_at", "id"),
+        # Фильтры списка по открытым задачам: «просрочено», «сегодня», «важные»
+        Index(
+            "ix_tasks_open_user_id_due_date", "user_id", "due_date",
+            postgresql_where=text("status IN ('PENDING', 'IN_PROGRESS')"),
+        ),
+        Index(
+            "ix_tasks_open_user_id_priority", "user_id", "priority",
+            postgresql_where=text("status IN ('PENDING', 'IN_PROGRESS')"),
+        ),
+        # Ночной перенос пропущенных вхождений смотрит только на открытые повторяющиеся задачи
+        Index(
+            "ix_tasks_recurring_due_date", "due_date",
+            postgresql_where=text("recurrence IS NOT NULL AND status IN ('PENDING', 'IN_PROGRESS')"),
+        ),
+        # Архивация: завершённые задачи по времени завершения
+        Index(
+            "ix_tasks_finished_at", text("coalesce(completed_at, updated_at)"),
+            postgresql_where=text("status IN ('COMPLETED', 'CANCELLED')"),
+        ),
+        # Составные GIN-индексы (btree_gin): поиск всегда в задачах одного пользователя
+        Index("ix_tasks_user_id_search_vector", "user_id", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_tasks_user_id_title_trgm", "user_id", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
\ No newline at end of file
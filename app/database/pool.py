@@ -0,0 +1,97 @@
+"""
+Настройки пула соединений движка и его метрики.
+
+Размер пула подбирается по данным: db_pool_checked_out показывает, сколько
+соединений занято прямо сейчас, db_pool_overflow — сколько открыто сверх
+pool_size, а гистограмма db_pool_checkout_wait_seconds — сколько апдейты ждут
+свободное соединение. Рост ожидания при checked_out == size + max_overflow
+означает, что пул упёрся в предел.
+"""
+import time
+from typing import Any, Dict
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.config import settings
+from app.utils.metrics import counter, gauge, histogram
+
+CHECKOUT_WAIT = histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+CHECKOUT_TIMEOUTS = counter("db_pool_checkout_timeouts_total", "Checkouts that hit pool_timeout", ["pool"])
+POOL_SIZE = gauge("db_pool_size", "Configured pool_size", ["pool"])
+POOL_CHECKED_OUT = gauge("db_pool_checked_out", "Connections currently checked out", ["pool"])
+POOL_CHECKED_IN = gauge("db_pool_checked_in", "Idle connections in the pool", ["pool"])
+POOL_OVERFLOW = gauge("db_pool_overflow", "Connections open beyond pool_size (negative while the pool is warming up)", ["pool"])
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Очередь соединений, замеряющая ожидание соединения.
+    В замер входит и открытие нового соединения, если пул его создаёт
+    """
+
+    metrics_name = "primary"
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            CHECKOUT_TIMEOUTS.inc(pool=self.metrics_name)
+            raise
+        finally:
+            CHECKOUT_WAIT.observe(time.perf_counter() - start, pool=self.metrics_name)
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        install_pool_metrics(pool, self.metrics_name)
+        return pool
+
+
+def install_pool_metrics(pool: Pool, name: str) -> None:
+    """Публикует состояние пула в метриках с меткой pool=name"""
+    if isinstance(pool, InstrumentedPool):
+        pool.metrics_name = name
+        POOL_SIZE.set_function(pool.size, pool=name)
+        POOL_CHECKED_OUT.set_function(pool.checkedout, pool=name)
+        POOL_CHECKED_IN.set_function(pool.checkedin, pool=name)
+        POOL_OVERFLOW.set_function(pool.overflow, pool=name)
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_options() -> Dict[str, Any]:
+    """Аргументы create_async_engine из настроек"""
+    connect_args: Dict[str, Any] = {
+        # Кэш подготовленных выражений asyncpg на соединение
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        # Кэш подготовленных выражений диалекта SQLAlchemy на соединение
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_PGBOUNCER:
+        # В transaction pooling PgBouncer соседние запросы одного соединения могут
+        # попасть на разные серверные соединения: подготовленные выражения
+        # не кэшируются, а имена у них уникальные, чтобы не столкнуться
+        # с выражением другого клиента на том же сервере
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = _prepared_statement_name
+
+    return {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
@@ -0,0 +1,144 @@
+import functools
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Статистика текущего апдейта или задачи планировщика
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|\?|'(?:[^']|'')*'|\b\d+\b")
+_PARAM_LIST_RE = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Приводит SQL к «форме»: без значений параметров и с одинаковыми IN-списками"""
+    shape = _PARAM_RE.sub("?", statement)
+    shape = _PARAM_LIST_RE.sub("?", shape)
+    return _SPACES_RE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryStats:
+    """Счётчики SQL-запросов одного апдейта или задачи"""
+    name: str
+    count: int = 0
+    total_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    # Объемлющий query_scope: его счётчики включают запросы вложенных
+    parent: Optional["QueryStats"] = field(default=None, repr=False)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.shapes[statement_shape(statement)] += 1
+        if self.parent is not None:
+            self.parent.record(statement, duration)
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Запросы одной формы, выполненные не меньше threshold раз (вероятный N+1)"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+def get_current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+
+    started = conn.info.get("query_start_time")
+    duration = time.perf_counter() - started.pop() if started else 0.0
+    stats.record(statement, duration)
+
+
+def install_query_accounting(engine: Engine) -> None:
+    """Вешает обработчики событий движка, считающие запросы внутри query_scope"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _report(stats: QueryStats, budget: Optional[int], n_plus_one_threshold: Optional[int]) -> None:
+    logger.debug(
+        "%s: %d SQL statements in %.1f ms",
+        stats.name, stats.count, stats.total_time * 1000
+    )
+
+    if budget is not None and stats.count > budget:
+        logger.warning(
+            "%s: %d SQL statements exceed budget of %d (%.1f ms in DB)",
+            stats.name, stats.count, budget, stats.total_time * 1000
+        )
+
+    if n_plus_one_threshold:
+        for shape, n in stats.repeated_shapes(n_plus_one_threshold):
+            logger.warning("%s: probable N+1, statement repeated %d times: %s", stats.name, n, shape)
+
+
+@contextmanager
+def query_scope(
+        name: str,
+        budget: Optional[int] = None,
+        n_plus_one_threshold: Optional[int] = None,
+) -> Iterator[QueryStats]:
+    """
+    Считает запросы, выполненные внутри блока; вложенный блок считается и во внешнем.
+    По выходу логирует превышение бюджета и повторяющиеся запросы.
+    """
+    stats = QueryStats(name=name, parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        _report(stats, budget, n_plus_one_threshold)
+
+
+def query_scoped(
+        budget: Optional[int] = None,
+        n_plus_one_threshold: Optional[int] = None,
+) -> Callable:
+    """Декоратор для корутин (задач планировщика): выполняет их внутри query_scope"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with query_scope(func.__name__, budget, n_plus_one_threshold):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, name: str = "test") -> Iterator[QueryStats]:
+    """
+    Хелпер для тестов: падает с AssertionError, если внутри блока
+    выполнено больше max_queries запросов.
+
+        with assert_query_budget(4):
+            await dp.feed_update(bot, update)
+    """
+    with query_scope(name) as stats:
+        yield stats
+
+    if stats.count > max_queries:
+        details = "\n".join(f"  {n} x {shape}" for shape, n in stats.shapes.most_common())
+        raise AssertionError(
+            f"{name}: {stats.count} SQL statements, budget is {max_queries}\n{details}"
+        )
@@ -0,0 +1,65 @@
+"""
+Выбор базы для чтения: реплика или основная.
+
+Читающие методы DAO берут сессию из read_session_maker (app.database.base):
+если реплика настроена, запрос уходит на неё. Реплика отстаёт от основной базы,
+поэтому после первой записи в рамках consistency_scope (апдейт или задача
+планировщика) все чтения до конца этого scope идут на основную базу —
+пользователь сразу видит то, что только что изменил.
+Вне scope записи не отслеживаются, и чтения тоже идут на основную базу.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import counter
+
+READ_SESSIONS = counter("db_read_sessions_total", "Read-only DAO sessions by target database", ["target"])
+
+
+class ConsistencyScope:
+    """Было ли в текущем апдейте или задаче что-то записано в основную базу"""
+    __slots__ = ("wrote",)
+
+    def __init__(self) -> None:
+        self.wrote = False
+
+
+_current_scope: ContextVar[Optional[ConsistencyScope]] = ContextVar("consistency_scope", default=None)
+
+
+@contextmanager
+def consistency_scope() -> Iterator[ConsistencyScope]:
+    """Отслеживает записи внутри блока, чтобы дальнейшие чтения шли на основную базу"""
+    scope = ConsistencyScope()
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+def replica_allowed() -> bool:
+    """Можно ли читать с реплики: есть scope и в нём ещё ничего не записано"""
+    scope = _current_scope.get()
+    return scope is not None and not scope.wrote
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if not (context.isinsert or context.isupdate or context.isdelete):
+        return
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.wrote = True
+
+
+def install_write_tracking(engine: Engine) -> None:
+    """
+    Отмечает INSERT/UPDATE/DELETE на движке основной базы в текущем consistency_scope.
+    Отметка ставится сразу после запроса, а не после коммита: внутри unit_of_work
+    коммит будет только в конце апдейта, а читать свои записи нужно уже сейчас
+    """
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,140 @@
+"""
+Лёгкие строки для списков и сканов планировщика.
+
+Запрос выбирает только нужные колонки, результат упаковывается в NamedTuple:
+ни identity map, ни состояния ORM, ни описания задачи и колонок геймификации,
+которые в этих местах не читаются. Строки неизменяемы — для правок есть DAO.
+"""
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import false, true
+
+from app.database.enums import TaskStatus
+from app.database.models import ChecklistItem, Task, TaskArchive, User
+
+
+class TaskRow(NamedTuple):
+    """Задача в списке: строка текста, кнопка и курсор пагинации (created_at, id)"""
+    id: int
+    title: str
+    status: TaskStatus
+    priority: Optional[int]
+    due_date: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+    children_total: int
+    children_done: int
+
+
+TASK_ROW_COLUMNS = (
+    Task.id, Task.title, Task.status, Task.priority, Task.due_date, Task.created_at, Task.updated_at,
+    Task.children_total, Task.children_done,
+)
+
+
+class SearchRow(NamedTuple):
+    """Найденная задача: поля строки списка и релевантность (целое, для keyset-пагинации)"""
+    id: int
+    title: str
+    status: TaskStatus
+    priority: Optional[int]
+    due_date: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+    children_total: int
+    children_done: int
+    rank: int
+
+
+class ArchivedTaskRow(NamedTuple):
+    """Задача из архива: поля строки списка и курсор пагинации (finished_at, id)"""
+    id: int
+    title: str
+    status: TaskStatus
+    priority: Optional[int]
+    due_date: Optional[datetime]
+    updated_at: datetime
+    children_total: int
+    children_done: int
+    finished_at: datetime
+
+
+ARCHIVED_TASK_ROW_COLUMNS = (
+    TaskArchive.id, TaskArchive.title, TaskArchive.status, TaskArchive.priority, TaskArchive.due_date,
+    TaskArchive.updated_at, TaskArchive.children_total, TaskArchive.children_done, TaskArchive.finished_at,
+)
+
+
+class ExportRow(NamedTuple):
+    """Задача в выгрузке /export: из tasks или из архива"""
+    id: int
+    title: str
+    description: str
+    status: TaskStatus
+    priority: Optional[int]
+    due_date: Optional[datetime]
+    created_at: datetime
+    completed_at: Optional[datetime]
+    archived: bool
+
+
+EXPORT_ROW_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.status, Task.priority, Task.due_date,
+    Task.created_at, Task.completed_at, false(),
+)
+ARCHIVED_EXPORT_ROW_COLUMNS = (
+    TaskArchive.id, TaskArchive.title, TaskArchive.description, TaskArchive.status, TaskArchive.priority,
+    TaskArchive.due_date, TaskArchive.created_at, TaskArchive.completed_at, true(),
+)
+
+
+class ReminderRow(NamedTuple):
+    """Задача, о которой пора напомнить, и чат её владельца"""
+    task_id: int
+    title: str
+    priority: Optional[int]
+    due_date: datetime
+    tg_id: int
+
+
+REMINDER_ROW_COLUMNS = (Task.id, Task.title, Task.priority, Task.due_date, User.tg_id)
+
+
+class SummaryTaskRow(NamedTuple):
+    """Задача в утренней сводке"""
+    title: str
+    status: TaskStatus
+    priority: Optional[int]
+    due_date: Optional[datetime]
+
+
+SUMMARY_TASK_ROW_COLUMNS = (Task.title, Task.status, Task.priority, Task.due_date)
+
+
+class RecipientRow(NamedTuple):
+    """Пользователь, которому рассылка отправляет сообщение"""
+    id: int
+    tg_id: int
+    current_streak: int
+
+
+RECIPIENT_ROW_COLUMNS = (User.id, User.tg_id, User.current_streak)
+
+
+class ChecklistItemRow(NamedTuple):
+    """Пункт чек-листа"""
+    id: int
+    title: str
+    done: bool
+
+
+CHECKLIST_ITEM_ROW_COLUMNS = (ChecklistItem.id, ChecklistItem.title, ChecklistItem.done)
+
+
+class TagRow(NamedTuple):
+    """Тег в списке тегов и число его задач"""
+    id: int
+    name: str
+    tasks: int
+
@@ -0,0 +1,100 @@
+"""
+Одна транзакция основной базы на апдейт.
+
+Внутри unit_of_work сессии из async_session_maker (app.database.base) работают
+на одном соединении и в одной транзакции. Соединение берётся из пула при первом
+обращении к базе, а не в начале апдейта. commit() внутри DAO только сбрасывает
+изменения в базу. Фиксирует их unit_of_work, когда апдейт обработан без ошибок,
+и release() — перед запросом к Bot API: блокировки строк и соединение не держатся,
+пока идёт запрос в Telegram, а пользователь видит ответ уже после коммита.
+После release() следующее обращение к базе начинает новую транзакцию.
+При исключении откатывается то, что апдейт записал после последнего коммита.
+
+Сессии одного апдейта используют соединение по очереди. Параллельные запросы
+(asyncio.gather по DAO) внутри unit_of_work не поддерживаются — asyncpg
+не выполняет две операции на одном соединении одновременно.
+"""
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+class UnitOfWork:
+    """Лениво открываемые соединение и транзакция"""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self._connection: Optional[AsyncConnection] = None
+        self._after_commit: List[Callable[[], None]] = []
+
+    async def connection(self) -> AsyncConnection:
+        """Соединение с начатой транзакцией; при первом вызове берётся из пула"""
+        if self._connection is None:
+            connection = await self.engine.connect()
+            await connection.begin()
+            self._connection = connection
+        return self._connection
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Вызвать callback после успешного коммита"""
+        self._after_commit.append(callback)
+
+    async def commit(self) -> None:
+        if self._connection is not None and self._connection.in_transaction():
+            await self._connection.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    async def release(self) -> None:
+        """Фиксирует сделанное и возвращает соединение в пул до следующего обращения к базе"""
+        await self.commit()
+        await self.close()
+
+    async def rollback(self) -> None:
+        self._after_commit.clear()
+        if self._connection is not None and self._connection.in_transaction():
+            await self._connection.rollback()
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+_current_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar("unit_of_work", default=None)
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    return _current_unit_of_work.get()
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """
+    Вызывает callback, когда изменения апдейта зафиксированы (для сброса кэшей:
+    раньше коммита другие запросы ещё видят старые данные). Вне unit_of_work — сразу,
+    DAO в этом случае уже закоммитил сам
+    """
+    uow = _current_unit_of_work.get()
+    if uow is None:
+        callback()
+    else:
+        uow.on_commit(callback)
+
+
+@asynccontextmanager
+async def unit_of_work(engine: AsyncEngine) -> AsyncIterator[UnitOfWork]:
+    """Выполняет блок в одной транзакции: фиксирует по выходу, откатывает при исключении"""
+    uow = UnitOfWork(engine)
+    token = _current_unit_of_work.set(uow)
+    try:
+        yield uow
+        await uow.commit()
+    except BaseException:
+        await uow.rollback()
+        raise
+    finally:
+        _current_unit_of_work.reset(token)
+        await uow.close()
@@ -3,6 +3,8 @@ from .help import router as help_router
 from .add_task import router as add_task_router
 from .tasks import router as tasks_router
 from .callbacks import router as callbacks_router
+from .actions import router as actions_router
+from .menu import router as menu_router
 
 __all__ = [
     'start_router',
@@ -10,4 +12,6 @@ __all__ = [
     'add_task_router',
     'tasks_router',
     'callbacks_router',
+    'actions_router',
+    'menu_router',
 ]
\ No newline at end of file
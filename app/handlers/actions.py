@@ -0,0 +1,5 @@
+from app.utils.dispatch import ActionRouter
+
+# Общий роутер callback-кнопок: хендлеры всех модулей лежат в одном словаре,
+# поэтому любой callback находит свой хендлер одним поиском
+router = ActionRouter(name="actions")
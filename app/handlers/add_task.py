@@ -8,7 +8,18 @@ from app.database.dao.task import TaskDAO
 from app.database.dao.user import UserDAO
 from app.database.dao.gamification import GamificationDAO
 from app.constants.gamification import ACHIEVEMENTS
-from app.keyboards.reply import get_main_keyboard
+from app.handlers.menu import router as menu
+from app.keyboards.reply import get_main_keyboard, get_due_date_keyboard, get_repeat_keyboard, MENU_ADD_TASK
+from app.texts.tasks import render_task_created
+from app.utils.recurrence import Recurrence, parse_recurrence
+from app.utils.task_fields import (
+    DESCRIPTION_MAX_LENGTH,
+    PRIORITY_MAX,
+    PRIORITY_MIN,
+    TITLE_MAX_LENGTH,
+    parse_due_date,
+    parse_priority,
+)
 
 router = Router()
 
@@ -18,38 +29,39 @@ class AddTaskStates(StatesGroup):
     waiting_for_description = State()
     waiting_for_priority = State()
     waiting_for_due_date = State()
+    waiting_for_repeat = State()
 
 
 @router.message(Command("add"))
 async def cmd_add_task(message: types.Message, state: FSMContext):
     await message.answer(
-        "📝 Введите название задачи (до 100 символов):"
+        f"📝 Введите название задачи (до {TITLE_MAX_LENGTH} символов):"
     )
     await state.set_state(AddTaskStates.waiting_for_title)
 
 
-@router.message(lambda message: message.text == "➕ Добавить задачу")
+@menu.command(MENU_ADD_TASK)
 async def add_task_button(message: types.Message, state: FSMContext):
     await cmd_add_task(message, state)
 
 
 @router.message(AddTaskStates.waiting_for_title)
 async def process_title(message: types.Message, state: FSMContext):
-    if len(message.text) > 100:
-        await message.answer("Слишком длинное название! Введите до 100 символов:")
+    if len(message.text) > TITLE_MAX_LENGTH:
+        await message.answer(f"Слишком длинное название! Введите до {TITLE_MAX_LENGTH} символов:")
         return
 
     await state.update_data(title=message.text)
     await message.answer(
-        "📄 Введите описание задачи (до 500 символов):"
+        f"📄 Введите описание задачи (до {DESCRIPTION_MAX_LENGTH} символов):"
     )
     await state.set_state(AddTaskStates.waiting_for_description)
 
 
 @router.message(AddTaskStates.waiting_for_description)
 async def process_description(message: types.Message, state: FSMContext):
-    if len(message.text) > 500:
-        await message.answer("Слишком длинное описание! Введите до 500 символов:")
+    if len(message.text) > DESCRIPTION_MAX_LENGTH:
+        await message.answer(f"Слишком длинное описание! Введите до {DESCRIPTION_MAX_LENGTH} символов:")
         return
 
     await state.update_data(description=message.text)
@@ -62,32 +74,18 @@ async def process_description(message: types.Message, state: FSMContext):
 @router.message(AddTaskStates.waiting_for_priority)
 async def process_priority(message: types.Message, state: FSMContext):
     try:
-        priority = int(message.text)
-        if not 1 <= priority <= 10:
-            await message.answer("Введите число от 1 до 10:")
-            return
+        priority = parse_priority(message.text)
     except ValueError:
-        await message.answer("Пожалуйста, введите число от 1 до 10:")
+        await message.answer(f"Пожалуйста, введите число от {PRIORITY_MIN} до {PRIORITY_MAX}:")
         return
 
     await state.update_data(priority=priority)
 
-    keyboard = types.ReplyKeyboardMarkup(
-        keyboard=[
-            [types.KeyboardButton(text="Пропустить")],
-            [types.KeyboardButton(text="Сегодня")],
-            [types.KeyboardButton(text="Завтра")],
-            [types.KeyboardButton(text="Через неделю")]
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True
-    )
-
     await message.answer(
         "📅 Введите срок выполнения в формате ДД.ММ.ГГГГ "
         "или выберите вариант ниже:\n"
         "Пример: 31.12.2024",
-        reply_markup=keyboard
+        reply_markup=get_due_date_keyboard()
     )
     await state.set_state(AddTaskStates.waiting_for_due_date)
 
@@ -107,7 +105,7 @@ async def process_due_date(message: types.Message, state: FSMContext):
         due_date = today + timedelta(days=7)
     else:
         try:
-            due_date = datetime.strptime(message.text, "%d.%m.%Y").date()
+            due_date = parse_due_date(message.text)
         except ValueError:
             await message.answer(
                 "Неверный формат! Введите дату в формате ДД.ММ.ГГГГ\n"
@@ -117,6 +115,36 @@ async def process_due_date(message: types.Message, state: FSMContext):
 
     await state.update_data(due_date=due_date)
 
+    await message.answer(
+        "🔁 Повторять задачу?\n"
+        "Выберите вариант ниже, напишите дни недели (<code>пн ср пт</code>) "
+        "или <code>каждые 3 дня</code>",
+        parse_mode="HTML",
+        reply_markup=get_repeat_keyboard()
+    )
+    await state.set_state(AddTaskStates.waiting_for_repeat)
+
+
+@router.message(AddTaskStates.waiting_for_repeat)
+async def process_repeat(message: types.Message, state: FSMContext):
+    data = await state.get_data()
+    # Без срока повторяющаяся задача начинается сегодня
+    due_date = data['due_date'] or datetime.now().date()
+
+    try:
+        recurrence = parse_recurrence(message.text or "", due_date)
+    except ValueError:
+        await message.answer(
+            "Не понял правило! Выберите вариант на кнопках, напишите дни недели "
+            "(<code>пн ср пт</code>) или <code>каждые 3 дня</code>",
+            parse_mode="HTML"
+        )
+        return
+
+    await create_task(message, state, recurrence)
+
+
+async def create_task(message: types.Message, state: FSMContext, recurrence: Recurrence | None):
     # Получаем данные из состояния
     data = await state.get_data()
 
@@ -129,7 +157,8 @@ async def process_due_date(message: types.Message, state: FSMContext):
         title=data['title'],
         description=data['description'],
         priority=data.get('priority', 1),
-        due_date=datetime.combine(data['due_date'], datetime.min.time()) if data['due_date'] else None
+        due_date=datetime.combine(data['due_date'], datetime.min.time()) if data['due_date'] else None,
+        recurrence=recurrence,
     )
 
     # === ГЕЙМИФИКАЦИЯ ===
@@ -158,21 +187,8 @@ async def process_due_date(message: types.Message, state: FSMContext):
         if total_bonus_xp > 0:
             await GamificationDAO.add_xp(db_user.id, total_bonus_xp)
 
-    # Форматируем статус для красивого отображения
-    status_display = {
-        "pending": "⏳ Ожидает",
-        "in_progress": "🔄 В работе",
-        "completed": "✅ Выполнена"
-    }.get(task.status, task.status)
-
     await message.answer(
-        f"✅ <b>Задача создана!</b>\n\n"
-        f"<b>Название:</b> {task.title}\n"
-        f"<b>Описание:</b> {task.description}\n"
-        f"<b>Приоритет:</b> {'⭐' * min(task.priority, 5)} ({task.priority}/10)\n"
-        f"<b>Срок:</b> {task.due_date.strftime('%d.%m.%Y') if task.due_date else 'Не установлен'}\n"
-        f"<b>Статус:</b> {status_display}"
-        f"{achievement_text}",
+        render_task_created(task) + achievement_text,
         parse_mode="HTML",
         reply_markup=get_main_keyboard()
     )
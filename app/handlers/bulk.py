@@ -0,0 +1,234 @@
+from datetime import datetime, timedelta, timezone
+
+from aiogram import Router, types
+from aiogram.fsm.context import FSMContext
+
+from app.constants.gamification import (
+    ACHIEVEMENTS,
+    get_level_emoji,
+    get_random_streak_lost_phrase,
+    get_streak_phrase,
+    get_task_xp,
+)
+from app.utils.recurrence import Recurrence
+from app.database.dao.gamification import GamificationDAO
+from app.database.dao.task import TaskDAO
+from app.database.dao.user import UserDAO
+from app.handlers.actions import router as actions
+from app.handlers.callbacks import handle_pagination
+from app.keyboards.inline import (
+    BULK_DUE_PRESETS,
+    get_bulk_delete_keyboard,
+    get_bulk_due_keyboard,
+    get_bulk_priority_keyboard,
+    get_task_selection_keyboard,
+)
+from app.texts.tasks import SELECTION_HINT, render_tasks_page
+from app.utils.callback_data import Action, BulkOp
+from app.utils.edit_cache import edit_text
+
+router = Router()
+
+# Больше за раз не выбрать: список id хранится в данных FSM
+SELECTION_LIMIT = 50
+
+
+async def get_selection(state: FSMContext) -> tuple[set, int]:
+    """Отмеченные задачи и страница, на которой открыт выбор"""
+    data = await state.get_data()
+    return set(data.get("selected_tasks", ())), data.get("selection_page", 0)
+
+
+async def show_selection(callback: types.CallbackQuery, state: FSMContext, page: int):
+    user = await UserDAO.get_or_create_user(callback.from_user)
+
+    tasks = await TaskDAO.get_tasks(
+        user_id=user.id,
+        limit=TaskDAO.TASKS_PER_PAGE,
+        offset=page * TaskDAO.TASKS_PER_PAGE
+    )
+    if not tasks:
+        await callback.answer("Больше нет задач!", show_alert=True)
+        return
+
+    total_tasks = await TaskDAO.count_tasks(user.id)
+    total_pages = (total_tasks + TaskDAO.TASKS_PER_PAGE - 1) // TaskDAO.TASKS_PER_PAGE
+
+    selected, _ = await get_selection(state)
+    await state.update_data(selection_page=page)
+
+    await edit_text(
+        callback.message,
+        SELECTION_HINT.format(count=len(selected)) + render_tasks_page(tasks, page, total_pages),
+        parse_mode="HTML",
+        reply_markup=get_task_selection_keyboard(tasks, selected, page=page, total_pages=total_pages)
+    )
+    await callback.answer()
+
+
+async def finish_bulk(callback: types.CallbackQuery, state: FSMContext, summary: str):
+    """Одно итоговое сообщение и обычный список задач вместо режима выбора"""
+    await state.update_data(selected_tasks=[], selection_page=0)
+    await callback.message.answer(summary, parse_mode="HTML")
+    await handle_pagination(callback, page=0)
+
+
+@actions.action(Action.SELECT)
+async def select_tasks(callback: types.CallbackQuery, state: FSMContext, page: int):
+    await show_selection(callback, state, page)
+
+
+@actions.action(Action.SELECT_TOGGLE)
+async def toggle_selected_task(callback: types.CallbackQuery, state: FSMContext, task_id: int):
+    selected, page = await get_selection(state)
+
+    if task_id in selected:
+        selected.discard(task_id)
+    elif len(selected) >= SELECTION_LIMIT:
+        await callback.answer(f"Можно выбрать не больше {SELECTION_LIMIT} задач", show_alert=True)
+        return
+    else:
+        selected.add(task_id)
+
+    await state.update_data(selected_tasks=sorted(selected))
+    await show_selection(callback, state, page)
+
+
+@actions.action(Action.BULK)
+async def bulk_action(callback: types.CallbackQuery, state: FSMContext, op: int):
+    selected, page = await get_selection(state)
+
+    if op == BulkOp.CANCEL:
+        await state.update_data(selected_tasks=[], selection_page=0)
+        await handle_pagination(callback, page)
+        return
+    if op == BulkOp.BACK:
+        await show_selection(callback, state, page)
+        return
+
+    if not selected:
+        await callback.answer("Сначала отметьте задачи", show_alert=True)
+        return
+
+    if op == BulkOp.PRIORITY:
+        await edit_text(
+            callback.message,
+            f"🔢 <b>Новый приоритет для задач: {len(selected)}</b>",
+            parse_mode="HTML",
+            reply_markup=get_bulk_priority_keyboard()
+        )
+        await callback.answer()
+    elif op == BulkOp.RESCHEDULE:
+        await edit_text(
+            callback.message,
+            f"📅 <b>Новый срок для задач: {len(selected)}</b>",
+            parse_mode="HTML",
+            reply_markup=get_bulk_due_keyboard()
+        )
+        await callback.answer()
+    elif op == BulkOp.DELETE:
+        await edit_text(
+            callback.message,
+            f"⚠️ <b>Удалить выбранные задачи ({len(selected)})?</b>\n"
+            "Это действие нельзя отменить.",
+            parse_mode="HTML",
+            reply_markup=get_bulk_delete_keyboard()
+        )
+        await callback.answer()
+    elif op == BulkOp.CONFIRM_DELETE:
+        user = await UserDAO.get_or_create_user(callback.from_user)
+        deleted = await TaskDAO.delete_many(sorted(selected), user.id)
+        await finish_bulk(callback, state, f"🗑️ Удалено задач: <b>{deleted}</b>")
+    elif op == BulkOp.COMPLETE:
+        await complete_selected(callback, state, selected)
+    else:
+        await callback.answer("Неизвестное действие", show_alert=True)
+
+
+@actions.action(Action.BULK_PRIORITY)
+async def bulk_set_priority(callback: types.CallbackQuery, state: FSMContext, priority: int):
+    selected, _ = await get_selection(state)
+    if not selected or not 1 <= priority <= 10:
+        await callback.answer("Сначала отметьте задачи", show_alert=True)
+        return
+
+    user = await UserDAO.get_or_create_user(callback.from_user)
+    updated = await TaskDAO.update_many(sorted(selected), user.id, priority=priority)
+    await finish_bulk(callback, state, f"🔢 Приоритет {priority}/10 у задач: <b>{updated}</b>")
+
+
+@actions.action(Action.BULK_DUE)
+async def bulk_reschedule(callback: types.CallbackQuery, state: FSMContext, preset: int):
+    selected, _ = await get_selection(state)
+    if not selected or preset not in BULK_DUE_PRESETS:
+        await callback.answer("Сначала отметьте задачи", show_alert=True)
+        return
+
+    text, days = BULK_DUE_PRESETS[preset]
+    due_date = None
+    if days is not None:
+        due_date = datetime.combine(datetime.now().date() + timedelta(days=days), datetime.min.time())
+
+    user = await UserDAO.get_or_create_user(callback.from_user)
+    updated = await TaskDAO.update_many(sorted(selected), user.id, due_date=due_date)
+    await finish_bulk(callback, state, f"📅 Срок «{text}» у задач: <b>{updated}</b>")
+
+
+async def complete_selected(callback: types.CallbackQuery, state: FSMContext, selected: set):
+    """Выполняет выбранные задачи одним UPDATE и начисляет за них одним пересчётом"""
+    user = await UserDAO.get_or_create_user(callback.from_user)
+
+    tasks = await TaskDAO.complete_many(sorted(selected), user.id)
+    if not tasks:
+        await callback.answer("Выбранные задачи уже выполнены или удалены", show_alert=True)
+        return
+
+    now = datetime.now(timezone.utc)
+    xp_earned = sum(
+        get_task_xp(task.priority, task.due_date is None or now <= task.due_date, task.created_at.date() == now.date())
+        for task in tasks
+    )
+    result = await GamificationDAO.record_completions(user.id, len(tasks), xp_earned)
+
+    # Достижения за задачу засчитываются, если условие выполнено хоть для одной из выполненных
+    new_achievements = await GamificationDAO.check_and_unlock_achievements(user.id, tasks=tasks)
+
+    message_parts = [
+        f"✅ <b>Выполнено задач: {len(tasks)}</b>",
+        f"\n\n💫 <b>+{xp_earned} XP</b>",
+    ]
+    if len(tasks) < len(selected):
+        message_parts.append(f"\n(пропущено {len(selected) - len(tasks)}: уже выполнены или удалены)")
+
+    # Следующие вхождения повторяющихся задач созданы тем же запросом
+    repeating = sum(1 for task in tasks if Recurrence.of(task) is not None)
+    if repeating:
+        message_parts.append(f"\n\n🔁 Созданы следующие вхождения: {repeating}")
+
+    if result and result.leveled_up:
+        message_parts.append(f"\n\n🎉 <b>НОВЫЙ УРОВЕНЬ: {result.level}!</b> {get_level_emoji(result.level)}")
+    if result and result.streak_lost and result.old_streak > 1:
+        message_parts.append(f"\n\n{get_random_streak_lost_phrase()}")
+        message_parts.append(f"\n(Был: {result.old_streak} дней)")
+    elif result:
+        streak_phrase = get_streak_phrase(result.streak)
+        if streak_phrase:
+            message_parts.append(f"\n\n{streak_phrase}")
+        elif result.streak > 1:
+            message_parts.append(f"\n\n🔥 Стрик: {result.streak} дней подряд!")
+
+    total_achievement_xp = 0
+    if new_achievements:
+        message_parts.append("\n\n🏆 <b>Новые достижения:</b>")
+        for ach_id in new_achievements:
+            ach = ACHIEVEMENTS.get(ach_id)
+            if ach:
+                message_parts.append(f"\n{ach.icon} <b>{ach.name}</b>")
+                if ach.xp_reward > 0:
+                    message_parts.append(f" (+{ach.xp_reward} XP)")
+                    total_achievement_xp += ach.xp_reward
+
+        if total_achievement_xp > 0:
+            await GamificationDAO.add_xp(user.id, total_achievement_xp)
+
+    await finish_bulk(callback, state, "".join(message_parts))
@@ -1,7 +1,8 @@
-from aiogram import Router, types, F, Bot
+from aiogram import Router, types, Bot
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from html import escape
 
 from app.database.dao.task import TaskDAO
 from app.database.dao.user import UserDAO
@@ -21,7 +22,11 @@ from app.keyboards.inline import (
     get_edit_task_keyboard,
     get_confirmation_keyboard,
 )
-from app.keyboards.reply import get_main_keyboard
+from app.keyboards.reply import get_main_keyboard, get_edit_due_date_keyboard
+from app.texts.tasks import render_task_detail, render_task_shared, render_tasks_page
+from app.handlers.actions import router as actions
+from app.utils.callback_data import Action
+from app.utils.edit_cache import edit_text
 
 router = Router()
 
@@ -33,9 +38,8 @@ class EditTaskStates(StatesGroup):
     waiting_for_due_date = State()
 
 
-@router.callback_query(F.data.startswith("task_"))
-async def show_task_detail(callback: types.CallbackQuery):
-    task_id = int(callback.data.split("_")[1])
+@actions.action(Action.TASK)
+async def show_task_detail(callback: types.CallbackQuery, task_id: int):
     user = await UserDAO.get_or_create_user(callback.from_user)
 
     task = await TaskDAO.get_task(task_id, user.id)
@@ -44,38 +48,10 @@ async def show_task_detail(callback: types.CallbackQuery):
         await callback.answer("Задача не найдена!", show_alert=True)
         return
 
-    status_display = {
-        "pending": "⏳ Ожидает",
-        "in_progress": "🔄 В работе",
-        "completed": "✅ Выполнена",
-        "cancelled": "❌ Отменена"
-    }.get(task.status, task.status)
-
-    priority_stars = "⭐" * min(task.priority, 5)
-
-    task_text = (
-        f"📋 <b>Детали задачи</b>\n\n"
-        f"<b>Название:</b> {task.title}\n"
-        f"<b>Описание:</b>\n{task.description}\n\n"
-        f"<b>Статус:</b> {status_display}\n"
-        f"<b>Приоритет:</b> {priority_stars} ({task.priority}/10)\n"
-        f"<b>Создана:</b> {task.created_at.strftime('%d.%m.%Y %H:%M')}\n"
-    )
-
-    if task.due_date:
-        due_date_str = task.due_date.strftime('%d.%m.%Y')
-        task_due_date = task.due_date.date()
-        today = datetime.now().date()
-        if task_due_date < today and task.status != TaskStatus.COMPLETED:
-            due_date_str += " 🔴 Просрочена!"
-        elif task_due_date == today:
-            due_date_str += " ⚠️ Сегодня!"
-        task_text += f"<b>Срок:</b> {due_date_str}\n"
-
-    if task.completed_at:
-        task_text += f"<b>Завершена:</b> {task.completed_at.strftime('%d.%m.%Y %H:%M')}\n"
+    task_text = render_task_detail(task)
 
-    await callback.message.edit_text(
+    await edit_text(
+        callback.message,
         task_text,
         parse_mode="HTML",
         reply_markup=get_task_detail_keyboard(task_id)
@@ -83,9 +59,8 @@ async def show_task_detail(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("page_"))
-async def handle_pagination(callback: types.CallbackQuery):
-    page = int(callback.data.split("_")[1])
+@actions.action(Action.PAGE)
+async def handle_pagination(callback: types.CallbackQuery, page: int):
     user = await UserDAO.get_or_create_user(callback.from_user)
 
     tasks = await TaskDAO.get_tasks(
@@ -101,35 +76,10 @@ async def handle_pagination(callback: types.CallbackQuery):
     total_tasks = await TaskDAO.count_tasks(user.id)
     total_pages = (total_tasks + TaskDAO.TASKS_PER_PAGE - 1) // TaskDAO.TASKS_PER_PAGE
 
-    tasks_text = "📋 <b>Ваши задачи:</b>\n\n"
-    for i, task in enumerate(tasks, 1):
-        status_icons = {
-            "pending": "⏳",
-            "in_progress": "🔄",
-            "completed": "✅",
-            "cancelled": "❌"
-        }
-
-        due_text = ""
-        if task.due_date:
-            task_due_date = task.due_date.date()
-            today = datetime.now().date()
-            if task_due_date < today and task.status != TaskStatus.COMPLETED:
-                due_text = " 🔴"
-            elif task_due_date == today:
-                due_text = " ⚠️"
-            else:
-                due_text = f" 📅 {task.due_date.strftime('%d.%m')}"
-
-        tasks_text += (
-            f"{i}. {status_icons.get(task.status, '📝')} "
-            f"<b>{task.title}</b>{due_text}\n"
-            f"   Приоритет: {task.priority}/10\n\n"
-        )
-
-    tasks_text += f"\nСтраница {page + 1}/{total_pages}"
+    tasks_text = render_tasks_page(tasks, page, total_pages)
 
-    await callback.message.edit_text(
+    await edit_text(
+        callback.message,
         tasks_text,
         parse_mode="HTML",
         reply_markup=get_tasks_keyboard(tasks, page=page, total_pages=total_pages)
@@ -137,37 +87,33 @@ async def handle_pagination(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("done_"))
-async def mark_task_done(callback: types.CallbackQuery):
-    task_id = int(callback.data.split("_")[1])
-    user = await UserDAO.get_or_create_user(callback.from_user)
+async def answer_failed_transition(callback: types.CallbackQuery, task_id: int, user_id: int):
+    """Объясняет, почему смена статуса не прошла (дополнительный запрос только в этом случае)"""
+    task = await TaskDAO.get_task(task_id, user_id)
 
-    # Получаем задачу до обновления
-    task = await TaskDAO.get_task(task_id, user.id)
     if not task:
         await callback.answer("Задача не найдена!", show_alert=True)
-        return
-
-    # Проверяем, была ли задача уже выполнена
-    if task.status == TaskStatus.COMPLETED:
+    elif task.status == TaskStatus.COMPLETED:
         await callback.answer("Задача уже выполнена!", show_alert=True)
-        return
+    else:
+        await callback.answer("Нельзя перевести задачу в этот статус!", show_alert=True)
 
-    # Отмечаем задачу выполненной
-    updated_task = await TaskDAO.mark_status(
-        task_id=task_id,
-        user_id=user.id,
-        status=TaskStatus.COMPLETED
-    )
 
-    if not updated_task:
-        await callback.answer("Ошибка при обновлении задачи!", show_alert=True)
+@actions.action(Action.DONE)
+async def mark_task_done(callback: types.CallbackQuery, task_id: int):
+    user = await UserDAO.get_or_create_user(callback.from_user)
+
+    # Проверка статуса и запись — одним условным UPDATE, двойное нажатие не пройдёт
+    transition = await TaskDAO.transition(task_id, user.id, TaskStatus.COMPLETED)
+    if not transition:
+        await answer_failed_transition(callback, task_id, user.id)
         return
+    task = transition.task
 
     # === ГЕЙМИФИКАЦИЯ ===
 
     # Рассчитываем XP
-    now = datetime.utcnow()
+    now = datetime.now(timezone.utc)
     is_on_time = task.due_date is None or now <= task.due_date
     is_same_day = task.created_at.date() == now.date()
     xp_earned = get_task_xp(task.priority, is_on_time, is_same_day)
@@ -186,7 +132,7 @@ async def mark_task_done(callback: types.CallbackQuery):
 
     # Формируем сообщение
     message_parts = [get_random_completion_phrase()]
-    message_parts.append(f"\n\n✅ <b>{task.title}</b>")
+    message_parts.append(f"\n\n✅ <b>{escape(task.title)}</b>")
     message_parts.append(f"\n\n💫 <b>+{xp_earned} XP</b>")
 
     # Бонусы
@@ -201,6 +147,10 @@ async def mark_task_done(callback: types.CallbackQuery):
     if bonuses:
         message_parts.append(f"\n   ({', '.join(bonuses)})")
 
+    # Следующее вхождение повторяющейся задачи уже создано вместе с выполнением
+    if transition.next_task is not None:
+        message_parts.append(f"\n\n🔁 Следующий раз: {transition.next_task.due_date.strftime('%d.%m.%Y')}")
+
     # Сообщение о повышении уровня
     if leveled_up:
         level_emoji = get_level_emoji(new_level)
@@ -233,6 +183,23 @@ async def mark_task_done(callback: types.CallbackQuery):
         if total_achievement_xp > 0:
             await GamificationDAO.add_xp(user.id, total_achievement_xp)
 
+    # Кнопка под задачей, отправленной в чат через инлайн-режим: сообщения бота
+    # в этом чате нет — итог уходит в личку, а карточка в чате теряет кнопку
+    if callback.message is None:
+        await callback.bot.send_message(
+            callback.from_user.id,
+            "".join(message_parts),
+            parse_mode="HTML",
+            reply_markup=get_main_keyboard()
+        )
+        await callback.bot.edit_message_text(
+            render_task_shared(task),
+            inline_message_id=callback.inline_message_id,
+            parse_mode="HTML"
+        )
+        await callback.answer("✅ Задача выполнена!")
+        return
+
     # Отправляем сообщение с результатами
     await callback.message.answer(
         "".join(message_parts),
@@ -241,33 +208,24 @@ async def mark_task_done(callback: types.CallbackQuery):
     )
 
     # Обновляем детали задачи
-    # Создаём новый callback_data для показа обновлённой задачи
-    callback.data = f"task_{task_id}"
-    await show_task_detail(callback)
+    await show_task_detail(callback, task_id)
 
 
-@router.callback_query(F.data.startswith("progress_"))
-async def mark_task_in_progress(callback: types.CallbackQuery):
-    task_id = int(callback.data.split("_")[1])
+@actions.action(Action.PROGRESS)
+async def mark_task_in_progress(callback: types.CallbackQuery, task_id: int):
     user = await UserDAO.get_or_create_user(callback.from_user)
 
-    task = await TaskDAO.mark_status(
-        task_id=task_id,
-        user_id=user.id,
-        status=TaskStatus.IN_PROGRESS
-    )
+    transition = await TaskDAO.transition(task_id, user.id, TaskStatus.IN_PROGRESS)
 
-    if task:
+    if transition:
         await callback.answer("🔄 Задача в работе!")
-        callback.data = f"task_{task_id}"
-        await show_task_detail(callback)
+        await show_task_detail(callback, task_id)
     else:
-        await callback.answer("Ошибка при обновлении задачи!", show_alert=True)
+        await answer_failed_transition(callback, task_id, user.id)
 
 
-@router.callback_query(F.data.regexp(r'^edit_\d+$'))
-async def start_edit_task(callback: types.CallbackQuery, state: FSMContext):
-    task_id = int(callback.data.split("_")[1])
+@actions.action(Action.EDIT)
+async def start_edit_task(callback: types.CallbackQuery, state: FSMContext, task_id: int):
     user = await UserDAO.get_or_create_user(callback.from_user)
 
     task = await TaskDAO.get_task(task_id, user.id)
@@ -278,7 +236,8 @@ async def start_edit_task(callback: types.CallbackQuery, state: FSMContext):
 
     await state.update_data(edit_task_id=task_id)
 
-    await callback.message.edit_text(
+    await edit_text(
+        callback.message,
         "✏️ <b>Что вы хотите изменить?</b>",
         parse_mode="HTML",
         reply_markup=get_edit_task_keyboard(task_id)
@@ -286,9 +245,8 @@ async def start_edit_task(callback: types.CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("edit_title_"))
-async def edit_task_title(callback: types.CallbackQuery, state: FSMContext):
-    task_id = int(callback.data.split("_")[2])
+@actions.action(Action.EDIT_TITLE)
+async def edit_task_title(callback: types.CallbackQuery, state: FSMContext, task_id: int):
     await state.update_data(edit_task_id=task_id)
     await state.set_state(EditTaskStates.waiting_for_title)
 
@@ -296,9 +254,8 @@ async def edit_task_title(callback: types.CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("edit_desc_"))
-async def edit_task_description(callback: types.CallbackQuery, state: FSMContext):
-    task_id = int(callback.data.split("_")[2])
+@actions.action(Action.EDIT_DESC)
+async def edit_task_description(callback: types.CallbackQuery, state: FSMContext, task_id: int):
     await state.update_data(edit_task_id=task_id)
     await state.set_state(EditTaskStates.waiting_for_description)
 
@@ -306,9 +263,8 @@ async def edit_task_description(callback: types.CallbackQuery, state: FSMContext
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("edit_priority_"))
-async def edit_task_priority(callback: types.CallbackQuery, state: FSMContext):
-    task_id = int(callback.data.split("_")[2])
+@actions.action(Action.EDIT_PRIORITY)
+async def edit_task_priority(callback: types.CallbackQuery, state: FSMContext, task_id: int):
     await state.update_data(edit_task_id=task_id)
     await state.set_state(EditTaskStates.waiting_for_priority)
 
@@ -316,26 +272,15 @@ async def edit_task_priority(callback: types.CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("edit_due_"))
-async def edit_task_due_date(callback: types.CallbackQuery, state: FSMContext):
-    task_id = int(callback.data.split("_")[2])
+@actions.action(Action.EDIT_DUE)
+async def edit_task_due_date(callback: types.CallbackQuery, state: FSMContext, task_id: int):
     await state.update_data(edit_task_id=task_id)
     await state.set_state(EditTaskStates.waiting_for_due_date)
 
-    keyboard = types.ReplyKeyboardMarkup(
-        keyboard=[
-            [types.KeyboardButton(text="Удалить срок")],
-            [types.KeyboardButton(text="Сегодня"), types.KeyboardButton(text="Завтра")],
-            [types.KeyboardButton(text="Через неделю")]
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True
-    )
-
     await callback.message.answer(
         "📅 Введите новый срок в формате ДД.ММ.ГГГГ\n"
         "Или выберите вариант ниже:",
-        reply_markup=keyboard
+        reply_markup=get_edit_due_date_keyboard()
     )
     await callback.answer()
 
@@ -497,35 +442,33 @@ async def process_edit_due_date(message: types.Message, state: FSMContext, bot:
     await state.clear()
 
 
-@router.callback_query(F.data.startswith("delete_"))
-async def request_delete_task(callback: types.CallbackQuery):
-    task_id = int(callback.data.split("_")[1])
-
-    await callback.message.edit_text(
+@actions.action(Action.DELETE)
+async def request_delete_task(callback: types.CallbackQuery, task_id: int):
+    await edit_text(
+        callback.message,
         "⚠️ <b>Вы уверены, что хотите удалить эту задачу?</b>\n"
         "Это действие нельзя отменить.",
         parse_mode="HTML",
-        reply_markup=get_confirmation_keyboard(task_id, "delete")
+        reply_markup=get_confirmation_keyboard(task_id, Action.CONFIRM_DELETE)
     )
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("confirm_delete_"))
-async def confirm_delete_task(callback: types.CallbackQuery):
-    task_id = int(callback.data.split("_")[2])
+@actions.action(Action.CONFIRM_DELETE)
+async def confirm_delete_task(callback: types.CallbackQuery, task_id: int):
     user = await UserDAO.get_or_create_user(callback.from_user)
 
     deleted = await TaskDAO.delete_task(task_id, user.id)
 
     if deleted:
-        await callback.message.edit_text("✅ Задача успешно удалена!")
+        await edit_text(callback.message, "✅ Задача успешно удалена!")
         await callback.answer("Задача удалена!")
     else:
-        await callback.message.edit_text("❌ Не удалось удалить задачу!")
+        await edit_text(callback.message, "❌ Не удалось удалить задачу!")
         await callback.answer("Ошибка при удалении!", show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_list")
+@actions.action(Action.BACK_TO_LIST)
 async def back_to_task_list(callback: types.CallbackQuery, bot: Bot):
     user = await UserDAO.get_or_create_user(callback.from_user)
 
@@ -547,33 +490,7 @@ async def back_to_task_list(callback: types.CallbackQuery, bot: Bot):
     total_tasks = await TaskDAO.count_tasks(user.id)
     total_pages = (total_tasks + TaskDAO.TASKS_PER_PAGE - 1) // TaskDAO.TASKS_PER_PAGE
 
-    tasks_text = "📋 <b>Ваши задачи:</b>\n\n"
-    for i, task in enumerate(tasks, 1):
-        status_icons = {
-            "pending": "⏳",
-            "in_progress": "🔄",
-            "completed": "✅",
-            "cancelled": "❌"
-        }
-
-        due_text = ""
-        if task.due_date:
-            task_due_date = task.due_date.date()
-            today = datetime.now().date()
-            if task_due_date < today and task.status != TaskStatus.COMPLETED:
-                due_text = " 🔴"
-            elif task_due_date == today:
-                due_text = " ⚠️"
-            else:
-                due_text = f" 📅 {task.due_date.strftime('%d.%m')}"
-
-        tasks_text += (
-            f"{i}. {status_icons.get(task.status, '📝')} "
-            f"<b>{task.title}</b>{due_text}\n"
-            f"   Приоритет: {task.priority}/10\n\n"
-        )
-
-    tasks_text += f"\nСтраница 1/{total_pages}"
+    tasks_text = render_tasks_page(tasks, 0, total_pages)
 
     await bot.send_message(
         chat_id=callback.message.chat.id,
@@ -592,36 +509,7 @@ async def send_task_detail(bot: Bot, chat_id: int, task_id: int, user_id: int):
         await bot.send_message(chat_id, "❌ Задача не найдена!")
         return
 
-    status_display = {
-        "pending": "⏳ Ожидает",
-        "in_progress": "🔄 В работе",
-        "completed": "✅ Выполнена",
-        "cancelled": "❌ Отменена"
-    }.get(task.status, task.status)
-
-    priority_stars = "⭐" * min(task.priority, 5)
-
-    task_text = (
-        f"📋 <b>Детали задачи</b>\n\n"
-        f"<b>Название:</b> {task.title}\n"
-        f"<b>Описание:</b>\n{task.description}\n\n"
-        f"<b>Статус:</b> {status_display}\n"
-        f"<b>Приоритет:</b> {priority_stars} ({task.priority}/10)\n"
-        f"<b>Создана:</b> {task.created_at.strftime('%d.%m.%Y %H:%M')}\n"
-    )
-
-    if task.due_date:
-        due_date_str = task.due_date.strftime('%d.%m.%Y')
-        task_due_date = task.due_date.date()
-        today = datetime.now().date()
-        if task_due_date < today and task.status != TaskStatus.COMPLETED:
-            due_date_str += " 🔴 Просрочена!"
-        elif task_due_date == today:
-            due_date_str += " ⚠️ Сегодня!"
-        task_text += f"<b>Срок:</b> {due_date_str}\n"
-
-    if task.completed_at:
-        task_text += f"<b>Завершена:</b> {task.completed_at.strftime('%d.%m.%Y %H:%M')}\n"
+    task_text = render_task_detail(task)
 
     await bot.send_message(
         chat_id=chat_id,
@@ -0,0 +1,125 @@
+from aiogram import Router, types
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+
+from app.database.dao.checklist import ChecklistDAO
+from app.database.dao.task import TaskDAO
+from app.database.dao.user import UserDAO
+from app.database.enums import TaskStatus
+from app.handlers.actions import router as actions
+from app.handlers.callbacks import mark_task_done
+from app.keyboards.inline import get_checklist_keyboard
+from app.keyboards.reply import get_main_keyboard
+from app.texts.tasks import render_checklist
+from app.utils.callback_data import Action
+from app.utils.edit_cache import edit_text
+
+router = Router()
+
+CHECKLIST_ITEM_MAX_LENGTH = 100
+
+
+class ChecklistStates(StatesGroup):
+    waiting_for_items = State()
+
+
+async def load_checklist(task_id: int, user_id: int) -> tuple | None:
+    """Текст и клавиатура чек-листа; None — задачи нет"""
+    task = await TaskDAO.get_task(task_id, user_id)
+    if not task:
+        return None
+    items = await ChecklistDAO.get_items(task_id, user_id)
+    return render_checklist(task, items), get_checklist_keyboard(task_id, items)
+
+
+async def show_checklist(callback: types.CallbackQuery, task_id: int, user_id: int):
+    checklist = await load_checklist(task_id, user_id)
+    if checklist is None:
+        await callback.answer("Задача не найдена!", show_alert=True)
+        return
+
+    text, keyboard = checklist
+    await edit_text(callback.message, text, parse_mode="HTML", reply_markup=keyboard)
+    await callback.answer()
+
+
+@actions.action(Action.CHECKLIST)
+async def open_checklist(callback: types.CallbackQuery, task_id: int):
+    user = await UserDAO.get_or_create_user(callback.from_user)
+    await show_checklist(callback, task_id, user.id)
+
+
+@actions.action(Action.CHECK_TOGGLE)
+async def toggle_checklist_item(callback: types.CallbackQuery, item_id: int):
+    user = await UserDAO.get_or_create_user(callback.from_user)
+
+    progress = await ChecklistDAO.toggle_item(item_id, user.id)
+    if progress is None:
+        await callback.answer("Пункт не найден!", show_alert=True)
+        return
+
+    # Отмечен последний пункт — задача выполняется как по кнопке «Сделано»
+    if progress.completed and progress.status in (TaskStatus.PENDING, TaskStatus.IN_PROGRESS):
+        await mark_task_done(callback, progress.task_id)
+        return
+
+    await show_checklist(callback, progress.task_id, user.id)
+
+
+@actions.action(Action.CHECK_CLEAR)
+async def clear_checklist(callback: types.CallbackQuery, task_id: int):
+    user = await UserDAO.get_or_create_user(callback.from_user)
+
+    if await ChecklistDAO.clear_done(task_id, user.id) is None:
+        await callback.answer("Задача не найдена!", show_alert=True)
+        return
+
+    await show_checklist(callback, task_id, user.id)
+
+
+@actions.action(Action.CHECK_ADD)
+async def add_checklist_items(callback: types.CallbackQuery, state: FSMContext, task_id: int):
+    await state.update_data(checklist_task_id=task_id)
+    await state.set_state(ChecklistStates.waiting_for_items)
+
+    await callback.message.answer(
+        "☑️ Отправьте пункты чек-листа — каждый с новой строки "
+        f"(до {CHECKLIST_ITEM_MAX_LENGTH} символов):"
+    )
+    await callback.answer()
+
+
+@router.message(ChecklistStates.waiting_for_items)
+async def process_checklist_items(message: types.Message, state: FSMContext):
+    data = await state.get_data()
+    task_id = data.get("checklist_task_id")
+
+    if not task_id:
+        await message.answer("Ошибка: не найдена задача для чек-листа")
+        await state.clear()
+        return
+
+    titles = [line.strip()[:CHECKLIST_ITEM_MAX_LENGTH] for line in (message.text or "").splitlines()]
+    titles = [title for title in titles if title]
+    if not titles:
+        await message.answer("Отправьте хотя бы один пункт текстом:")
+        return
+
+    user = await UserDAO.get_or_create_user(message.from_user)
+
+    progress = await ChecklistDAO.add_items(task_id, user.id, titles)
+    if progress is None:
+        await message.answer(
+            f"Не удалось добавить: задачи нет или в чек-листе больше {ChecklistDAO.MAX_ITEMS} пунктов.",
+            reply_markup=get_main_keyboard()
+        )
+        await state.clear()
+        return
+
+    await state.clear()
+    await message.answer("✅ Пункты добавлены!", reply_markup=get_main_keyboard())
+
+    checklist = await load_checklist(task_id, user.id)
+    if checklist is not None:
+        text, keyboard = checklist
+        await message.answer(text, parse_mode="HTML", reply_markup=keyboard)
@@ -0,0 +1,61 @@
+import asyncio
+from tempfile import SpooledTemporaryFile
+
+from aiogram import Router, types
+from aiogram.filters import Command, CommandObject
+
+from app.config import settings
+from app.database.dao.export import ExportDAO
+from app.database.dao.user import UserDAO
+from app.database.unit_of_work import current_unit_of_work
+from app.utils.task_file import EXPORT_FORMATS, SpooledInputFile, write_export
+
+router = Router()
+
+# Лимит Bot API на отправку документа
+MAX_DOCUMENT_SIZE = 50 * 1024 * 1024
+
+# Чтение выгрузки держит соединение с БД всё время курсора: одновременно — не больше
+# EXPORT_MAX_CONCURRENT, чтобы остальные хендлеры не ждали пул. Отправка файла
+# идёт уже без слота и без соединения
+_export_slots = asyncio.Semaphore(settings.EXPORT_MAX_CONCURRENT)
+
+
+@router.message(Command("export"))
+async def cmd_export(message: types.Message, command: CommandObject):
+    fmt = (command.args or "csv").strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        await message.answer(
+            "📤 Выгрузка всех задач файлом:\n"
+            "<code>/export</code> — CSV (открывается в Excel)\n"
+            "<code>/export jsonl</code> — JSON Lines",
+            parse_mode="HTML"
+        )
+        return
+
+    # Не ждём в очереди: апдейт, ожидающий слот, держал бы своё соединение
+    if _export_slots.locked():
+        await message.answer("⏳ Сейчас выгружается много файлов, попробуйте через минуту.")
+        return
+
+    # До EXPORT_SPOOL_SIZE файл в памяти, дальше — на диске
+    with SpooledTemporaryFile(max_size=settings.EXPORT_SPOOL_SIZE) as file:
+        async with _export_slots:
+            user = await UserDAO.get_or_create_user(message.from_user)
+            count = await write_export(file, ExportDAO.stream_tasks(user.id, settings.EXPORT_CHUNK_SIZE), fmt)
+            # Транзакция апдейта больше не нужна: соединение — обратно в пул до загрузки файла
+            uow = current_unit_of_work()
+            if uow is not None:
+                await uow.release()
+
+        if not count:
+            await message.answer("📭 Задач пока нет — выгружать нечего.")
+            return
+        if file.tell() > MAX_DOCUMENT_SIZE:
+            await message.answer("Файл получился больше 50 МБ — Telegram не примет его.")
+            return
+
+        await message.answer_document(
+            SpooledInputFile(file, filename=f"tasks.{fmt}"),
+            caption=f"📤 Задач в файле: {count}"
+        )
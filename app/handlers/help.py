@@ -1,6 +1,7 @@
 from aiogram import Router, types
 from aiogram.filters import Command
-from app.keyboards.reply import get_main_keyboard
+from app.handlers.menu import router as menu
+from app.keyboards.reply import get_main_keyboard, MENU_HELP
 
 router = Router()
 
@@ -22,7 +23,19 @@ async def cmd_help(message: types.Message):
         "   ✅ Сделано - отметить выполненной\n"
         "   🔄 В работе - изменить статус\n"
         "   ✏️ Изменить - редактировать задачу\n"
-        "   🗑️ Удалить - удалить задачу\n\n"
+        "   🗑️ Удалить - удалить задачу\n"
+        "   ☑️ Чек-лист - пункты задачи; когда отмечены все, задача выполнена\n"
+        "4. «☑️ Выбрать несколько» под списком — отметьте задачи и выполните, "
+        "удалите, перенесите или смените приоритет всем сразу\n\n"
+
+        "<b>Теги и фильтры:</b>\n"
+        "Добавьте #тег в название задачи («Отчёт #работа»). Под списком задач — "
+        "кнопки «Просрочено», «Сегодня», «Важные» и «Теги».\n\n"
+
+        "<b>Повторяющиеся задачи:</b>\n"
+        "При создании задачи выберите, как часто она повторяется. "
+        "Когда задача выполнена, появляется следующая; "
+        "пропущенная переносится на ближайшую дату сама.\n\n"
 
         "<b>Статусы задач:</b>\n"
         "⏳ pending - ожидает начала\n"
@@ -33,6 +46,10 @@ async def cmd_help(message: types.Message):
         "/start - перезапустить бота\n"
         "/add - добавить задачу\n"
         "/tasks - список задач\n"
+        "/search текст - поиск по задачам\n"
+        "/archive - задачи, завершённые больше месяца назад\n"
+        "/export - все задачи файлом (CSV; /export jsonl — JSON Lines)\n"
+        "/import - загрузить задачи из файла CSV или JSON Lines\n"
         "/help - эта справка\n\n"
 
         "Для навигации используйте кнопки под сообщениями!"
@@ -42,6 +59,6 @@ async def cmd_help(message: types.Message):
 
 
 # Хендлер для кнопки "Помощь"
-@router.message(lambda message: message.text == "❓ Помощь")
+@menu.command(MENU_HELP)
 async def help_button(message: types.Message):
     await cmd_help(message)
\ No newline at end of file
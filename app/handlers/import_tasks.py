@@ -0,0 +1,162 @@
+from tempfile import SpooledTemporaryFile
+from typing import List, NamedTuple, Tuple
+
+from aiogram import F, Router, types
+from aiogram.filters import Command
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+
+from app.config import settings
+from app.constants.gamification import ACHIEVEMENTS
+from app.database.dao.gamification import GamificationDAO
+from app.database.dao.task import TaskDAO
+from app.database.dao.user import UserDAO
+from app.keyboards.reply import get_main_keyboard
+from app.utils.task_fields import DESCRIPTION_MAX_LENGTH, PRIORITY_MAX, PRIORITY_MIN, TITLE_MAX_LENGTH
+from app.utils.task_file import import_format, read_tasks
+
+router = Router()
+
+# Лимит Bot API на скачивание файла ботом
+MAX_DOWNLOAD_SIZE = 20 * 1024 * 1024
+# Сколько ошибок перечислять построчно, остальные — только числом
+IMPORT_ERRORS_SHOWN = 10
+
+
+class ImportStates(StatesGroup):
+    waiting_for_file = State()
+
+
+class ImportResult(NamedTuple):
+    created: int
+    error_count: int
+    errors: List[Tuple[int, str]]
+    truncated: bool
+
+
+def check_file(file, fmt: str) -> ImportResult:
+    """
+    Первый проход: проверяет и декодирует файл целиком, ничего не создавая.
+    created — сколько задач будет создано. UnicodeDecodeError — файл не в UTF-8
+    """
+    accepted = 0
+    error_count = 0
+    errors = []
+    truncated = False
+
+    for line_no, values, error in read_tasks(file, fmt):
+        if error is not None:
+            error_count += 1
+            if len(errors) < IMPORT_ERRORS_SHOWN:
+                errors.append((line_no, error))
+            continue
+
+        if accepted >= settings.IMPORT_MAX_TASKS:
+            truncated = True
+            break
+        accepted += 1
+
+    return ImportResult(accepted, error_count, errors, truncated)
+
+
+async def import_tasks(user_id: int, file, fmt: str) -> ImportResult:
+    """
+    Создаёт задачи из файла пачками по IMPORT_BATCH_SIZE.
+    Вставка начинается только после проверки всего файла (check_file): ошибка
+    кодировки в конце файла не оставит созданной его начало
+    """
+    result = check_file(file, fmt)
+    file.seek(0)
+
+    created = 0
+    batch = []
+    for _, values, error in read_tasks(file, fmt):
+        if error is not None:
+            continue
+        if created + len(batch) >= result.created:
+            break
+
+        batch.append(values)
+        if len(batch) == settings.IMPORT_BATCH_SIZE:
+            created += await TaskDAO.create_many(user_id, batch)
+            batch = []
+
+    if batch:
+        created += await TaskDAO.create_many(user_id, batch)
+
+    return result._replace(created=created)
+
+
+@router.message(Command("import"))
+async def cmd_import(message: types.Message, state: FSMContext):
+    await message.answer(
+        "📥 Отправьте файл с задачами документом: <b>.csv</b> или <b>.jsonl</b>.\n\n"
+        "Колонки (поля): <code>title</code> — название, до "
+        f"{TITLE_MAX_LENGTH} символов; <code>description</code> — описание, до {DESCRIPTION_MAX_LENGTH}; "
+        f"<code>priority</code> — от {PRIORITY_MIN} до {PRIORITY_MAX}; "
+        "<code>due_date</code> — срок ДД.ММ.ГГГГ. Обязательно только название.\n"
+        "Подходит и файл из /export.",
+        parse_mode="HTML"
+    )
+    await state.set_state(ImportStates.waiting_for_file)
+
+
+@router.message(ImportStates.waiting_for_file, F.document)
+async def process_import_file(message: types.Message, state: FSMContext):
+    document = message.document
+    fmt = import_format(document.file_name)
+    if fmt is None:
+        await message.answer("Нужен файл .csv или .jsonl — отправьте другой:")
+        return
+    if document.file_size and document.file_size > MAX_DOWNLOAD_SIZE:
+        await message.answer("Файл больше 20 МБ — Telegram не даст его скачать. Разбейте его на части:")
+        return
+
+    await state.clear()
+    user = await UserDAO.get_or_create_user(message.from_user)
+
+    with SpooledTemporaryFile(max_size=settings.EXPORT_SPOOL_SIZE) as file:
+        await message.bot.download(document, destination=file)
+        try:
+            result = await import_tasks(user.id, file, fmt)
+        except UnicodeDecodeError:
+            await message.answer("Не удалось прочитать файл: сохраните его в кодировке UTF-8.")
+            return
+
+    message_parts = [f"📥 <b>Загружено задач: {result.created}</b>"]
+    if result.truncated:
+        message_parts.append(f"\nЗа один раз — не больше {settings.IMPORT_MAX_TASKS}, остальные не загружены.")
+
+    if result.error_count:
+        message_parts.append(f"\n\n⚠️ Пропущено строк: {result.error_count}")
+        for line_no, error in result.errors:
+            message_parts.append(f"\nстрока {line_no}: {error}")
+        if result.error_count > len(result.errors):
+            message_parts.append(f"\n…и ещё {result.error_count - len(result.errors)}")
+
+    # === ГЕЙМИФИКАЦИЯ === один раз на весь файл
+    if result.created:
+        await GamificationDAO.increment_created(user.id, result.created)
+
+        new_achievements = await GamificationDAO.check_and_unlock_achievements(user.id)
+        total_bonus_xp = 0
+        if new_achievements:
+            message_parts.append("\n\n🏆 <b>Новые достижения:</b>")
+            for ach_id in new_achievements:
+                ach = ACHIEVEMENTS.get(ach_id)
+                if ach:
+                    message_parts.append(f"\n{ach.icon} <b>{ach.name}</b>")
+                    if ach.xp_reward > 0:
+                        message_parts.append(f" (+{ach.xp_reward} XP)")
+                        total_bonus_xp += ach.xp_reward
+
+            if total_bonus_xp > 0:
+                await GamificationDAO.add_xp(user.id, total_bonus_xp)
+
+    await message.answer("".join(message_parts), parse_mode="HTML", reply_markup=get_main_keyboard())
+
+
+@router.message(ImportStates.waiting_for_file)
+async def import_without_file(message: types.Message, state: FSMContext):
+    await state.clear()
+    await message.answer("Загрузка задач отменена. Чтобы начать заново — /import", reply_markup=get_main_keyboard())
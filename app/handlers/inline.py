@@ -0,0 +1,56 @@
+from aiogram import Router, types
+
+from app.config import settings
+from app.database.dao.task import TaskDAO
+from app.database.dao.user import UserDAO
+from app.keyboards.inline import get_shared_task_keyboard
+from app.texts.tasks import render_task_inline_description, render_task_shared
+from app.utils.task_index import UserTaskIndex, task_index
+
+router = Router()
+
+# Больше Telegram в одном ответе не принимает
+INLINE_RESULTS_LIMIT = 50
+
+
+async def get_task_index(tg_user: types.User) -> UserTaskIndex:
+    """Индекс открытых задач пользователя; из БД — только если его нет в памяти"""
+    user_id = task_index.user_id(tg_user.id)
+    if user_id is None:
+        user = await UserDAO.get_or_create_user(tg_user)
+        user_id = user.id
+        task_index.remember_user(tg_user.id, user_id)
+
+    index = task_index.get(user_id)
+    if index is None:
+        loaded_at = task_index.clock()
+        tasks = await TaskDAO.get_open_tasks(user_id, limit=settings.INLINE_INDEX_MAX_TASKS)
+        index = task_index.put(user_id, tasks, loaded_at)
+    return index
+
+
+@router.inline_query()
+async def inline_tasks(inline_query: types.InlineQuery):
+    index = await get_task_index(inline_query.from_user)
+    tasks = index.search(inline_query.query, INLINE_RESULTS_LIMIT)
+
+    results = [
+        types.InlineQueryResultArticle(
+            id=str(task.id),
+            title=task.title,
+            description=render_task_inline_description(task),
+            input_message_content=types.InputTextMessageContent(
+                message_text=render_task_shared(task),
+                parse_mode="HTML",
+            ),
+            reply_markup=get_shared_task_keyboard(task.id),
+        )
+        for task in tasks
+    ]
+
+    # Результаты у каждого свои; ключ кэша Telegram — пользователь и текст запроса
+    await inline_query.answer(
+        results,
+        cache_time=settings.INLINE_CACHE_TIME,
+        is_personal=True,
+    )
@@ -0,0 +1,4 @@
+from app.utils.dispatch import MenuRouter
+
+# Кнопки главного меню: словарь «текст кнопки — хендлер», проверяется до остальных роутеров
+router = MenuRouter(name="menu")
@@ -1,6 +1,5 @@
-from aiogram import Router, types, F
+from aiogram import Router, types
 from aiogram.filters import Command
-from datetime import datetime
 
 from app.database.dao.user import UserDAO
 from app.database.dao.gamification import GamificationDAO
@@ -10,7 +9,11 @@ from app.constants.gamification import (
     get_level_emoji,
     get_title,
 )
-from app.keyboards.reply import get_main_keyboard
+from app.handlers.actions import router as actions
+from app.handlers.menu import router as menu
+from app.keyboards.reply import MENU_PROFILE
+from app.utils.callback_data import Action, pack
+from app.utils.edit_cache import edit_text
 
 router = Router()
 
@@ -23,7 +26,7 @@ def create_progress_bar(current: int, maximum: int, length: int = 10) -> str:
 
 
 @router.message(Command("profile"))
-@router.message(lambda m: m.text == "👤 Профиль")
+@menu.command(MENU_PROFILE)
 async def cmd_profile(message: types.Message):
     user = await UserDAO.get_or_create_user(message.from_user)
     stats = await GamificationDAO.get_user_stats(user.id)
@@ -63,18 +66,18 @@ async def cmd_profile(message: types.Message):
 
     keyboard = types.InlineKeyboardMarkup(inline_keyboard=[
         [
-            types.InlineKeyboardButton(text="🏅 Достижения", callback_data="show_achievements"),
-            types.InlineKeyboardButton(text="📈 Лидерборд", callback_data="show_leaderboard")
+            types.InlineKeyboardButton(text="🏅 Достижения", callback_data=pack(Action.ACHIEVEMENTS)),
+            types.InlineKeyboardButton(text="📈 Лидерборд", callback_data=pack(Action.LEADERBOARD))
         ],
         [
-            types.InlineKeyboardButton(text="📊 Подробная статистика", callback_data="detailed_stats")
+            types.InlineKeyboardButton(text="📊 Подробная статистика", callback_data=pack(Action.DETAILED_STATS))
         ]
     ])
 
     await message.answer(profile_text, parse_mode="HTML", reply_markup=keyboard)
 
 
-@router.callback_query(F.data == "show_achievements")
+@actions.action(Action.ACHIEVEMENTS)
 async def show_achievements(callback: types.CallbackQuery):
     user = await UserDAO.get_or_create_user(callback.from_user)
     user_achievements = await GamificationDAO.get_user_achievements(user.id)
@@ -104,10 +107,11 @@ async def show_achievements(callback: types.CallbackQuery):
             text_parts.append(f"\n...и ещё {len(locked) - 5}")
 
     keyboard = types.InlineKeyboardMarkup(inline_keyboard=[
-        [types.InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_profile")]
+        [types.InlineKeyboardButton(text="🔙 Назад", callback_data=pack(Action.PROFILE))]
     ])
 
-    await callback.message.edit_text(
+    await edit_text(
+        callback.message,
         "\n".join(text_parts),
         parse_mode="HTML",
         reply_markup=keyboard
@@ -115,7 +119,7 @@ async def show_achievements(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@router.callback_query(F.data == "show_leaderboard")
+@actions.action(Action.LEADERBOARD)
 async def show_leaderboard(callback: types.CallbackQuery):
     user = await UserDAO.get_or_create_user(callback.from_user)
     leaderboard = await GamificationDAO.get_leaderboard(10)
@@ -136,10 +140,11 @@ async def show_leaderboard(callback: types.CallbackQuery):
         )
 
     keyboard = types.InlineKeyboardMarkup(inline_keyboard=[
-        [types.InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_profile")]
+        [types.InlineKeyboardButton(text="🔙 Назад", callback_data=pack(Action.PROFILE))]
     ])
 
-    await callback.message.edit_text(
+    await edit_text(
+        callback.message,
         "".join(text_parts),
         parse_mode="HTML",
         reply_markup=keyboard
@@ -147,7 +152,7 @@ async def show_leaderboard(callback: types.CallbackQuery):
     await callback.answer()
 
 
-@router.callback_query(F.data == "detailed_stats")
+@actions.action(Action.DETAILED_STATS)
 async def show_detailed_stats(callback: types.CallbackQuery):
     user = await UserDAO.get_or_create_user(callback.from_user)
     stats = await GamificationDAO.get_user_stats(user.id)
@@ -186,14 +191,14 @@ async def show_detailed_stats(callback: types.CallbackQuery):
     )
 
     keyboard = types.InlineKeyboardMarkup(inline_keyboard=[
-        [types.InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_profile")]
+        [types.InlineKeyboardButton(text="🔙 Назад", callback_data=pack(Action.PROFILE))]
     ])
 
-    await callback.message.edit_text(text, parse_mode="HTML", reply_markup=keyboard)
+    await edit_text(callback.message, text, parse_mode="HTML", reply_markup=keyboard)
     await callback.answer()
 
 
-@router.callback_query(F.data == "back_to_profile")
+@actions.action(Action.PROFILE)
 async def back_to_profile(callback: types.CallbackQuery):
     user = await UserDAO.get_or_create_user(callback.from_user)
     stats = await GamificationDAO.get_user_stats(user.id)
@@ -228,101 +233,13 @@ async def back_to_profile(callback: types.CallbackQuery):
 
     keyboard = types.InlineKeyboardMarkup(inline_keyboard=[
         [
-            types.InlineKeyboardButton(text="🏅 Достижения", callback_data="show_achievements"),
-            types.InlineKeyboardButton(text="📈 Лидерборд", callback_data="show_leaderboard")
+            types.InlineKeyboardButton(text="🏅 Достижения", callback_data=pack(Action.ACHIEVEMENTS)),
+            types.InlineKeyboardButton(text="📈 Лидерборд", callback_data=pack(Action.LEADERBOARD))
         ],
         [
-            types.InlineKeyboardButton(text="📊 Подробная статистика", callback_data="detailed_stats")
+            types.InlineKeyboardButton(text="📊 Подробная статистика", callback_data=pack(Action.DETAILED_STATS))
         ]
     ])
 
-    await callback.message.edit_text(profile_text, parse_mode="HTML", reply_markup=keyboard)
+    await edit_text(callback.message, profile_text, parse_mode="HTML", reply_markup=keyboard)
     await callback.answer()
-
-    # Обновляем обработчик выполнения задачи
-    @router.callback_query(F.data.startswith("done_"))
-    async def mark_task_done(callback: types.CallbackQuery):
-        task_id = int(callback.data.split("_")[1])
-        user = await UserDAO.get_or_create_user(callback.from_user)
-
-        # Получаем задачу до обновления
-        task = await TaskDAO.get_task(task_id, user.id)
-        if not task:
-            await callback.answer("Задача не найдена!", show_alert=True)
-            return
-
-        # Проверяем, была ли задача уже выполнена
-        if task.status == TaskStatus.COMPLETED:
-            await callback.answer("Задача уже выполнена!", show_alert=True)
-            return
-
-        # Отмечаем задачу выполненной
-        updated_task = await TaskDAO.mark_status(
-            task_id=task_id,
-            user_id=user.id,
-            status=TaskStatus.COMPLETED
-        )
-
-        if not updated_task:
-            await callback.answer("Ошибка при обновлении задачи!", show_alert=True)
-            return
-
-        # === ГЕЙМИФИКАЦИЯ ===
-
-        # Рассчитываем XP
-        is_on_time = task.due_date and datetime.utcnow() <= task.due_date
-        is_same_day = task.created_at.date() == datetime.now().date()
-        xp_earned = get_task_xp(task.priority, is_on_time, is_same_day)
-
-        # Добавляем XP
-        new_xp, new_level, leveled_up = await GamificationDAO.add_xp(user.id, xp_earned)
-
-        # Обновляем стрик
-        new_streak, streak_lost, old_streak = await GamificationDAO.update_streak(user.id)
-
-        # Увеличиваем счётчик выполненных
-        await GamificationDAO.increment_completed(user.id)
-
-        # Проверяем достижения
-        new_achievements = await GamificationDAO.check_and_unlock_achievements(user.id, task)
-
-        # Формируем сообщение
-        message_parts = [get_random_completion_phrase()]
-        message_parts.append(f"\n\n✅ <b>{task.title}</b> выполнена!")
-        message_parts.append(f"\n💫 +{xp_earned} XP")
-
-        # Сообщение о повышении уровня
-        if leveled_up:
-            level_emoji = get_level_emoji(new_level)
-            message_parts.append(f"\n\n🎉 <b>УРОВЕНЬ {new_level}!</b> {level_emoji}")
-
-        # Сообщение о стрике
-        if streak_lost:
-            message_parts.append(f"\n\n{get_random_streak_lost_phrase()}")
-        else:
-            streak_phrase = get_streak_phrase(new_streak)
-            if streak_phrase:
-                message_parts.append(f"\n\n{streak_phrase}")
-            elif new_streak > 1:
-                message_parts.append(f"\n\n🔥 Стрик: {new_streak} дней!")
-
-        # Сообщение о новых достижениях
-        if new_achievements:
-            message_parts.append("\n\n🏆 <b>Новые достижения:</b>")
-            for ach_id in new_achievements:
-                ach = ACHIEVEMENTS.get(ach_id)
-                if ach:
-                    message_parts.append(f"\n{ach.icon} <b>{ach.name}</b> (+{ach.xp_reward} XP)")
-                    # Добавляем XP за достижение
-                    await GamificationDAO.add_xp(user.id, ach.xp_reward)
-
-        # Отправляем сообщение
-        await callback.message.answer(
-            "".join(message_parts),
-            parse_mode="HTML",
-            reply_markup=get_main_keyboard()
-        )
-
-        # Обновляем детали задачи
-        await show_task_detail(callback)
-        await callback.answer("✅ Задача выполнена!")
@@ -0,0 +1,71 @@
+from aiogram import Router, types
+from aiogram.filters import Command, CommandObject
+from aiogram.fsm.context import FSMContext
+
+from app.database.dao.task import TaskDAO
+from app.database.dao.user import UserDAO
+from app.handlers.actions import router as actions
+from app.keyboards.inline import get_search_keyboard
+from app.texts.tasks import render_search_page
+from app.utils.callback_data import Action
+from app.utils.edit_cache import edit_text
+
+router = Router()
+
+SEARCH_QUERY_MAX_LENGTH = 200
+
+
+async def find_tasks(user_id: int, query: str, after: tuple | None = None) -> tuple[list, bool]:
+    """Страница результатов и есть ли следующая"""
+    tasks = await TaskDAO.search(user_id, query, limit=TaskDAO.TASKS_PER_PAGE + 1, after=after)
+    return tasks[:TaskDAO.TASKS_PER_PAGE], len(tasks) > TaskDAO.TASKS_PER_PAGE
+
+
+@router.message(Command("search"))
+async def cmd_search(message: types.Message, command: CommandObject, state: FSMContext):
+    query = (command.args or "").strip()[:SEARCH_QUERY_MAX_LENGTH]
+    if not query:
+        await message.answer(
+            "🔍 Напишите, что искать: <code>/search молоко</code>\n"
+            "Ищется по названию и описанию задач.",
+            parse_mode="HTML"
+        )
+        return
+
+    user = await UserDAO.get_or_create_user(message.from_user)
+    tasks, has_more = await find_tasks(user.id, query)
+
+    # Запрос нужен кнопке «Ещё»: в callback_data он не помещается
+    await state.update_data(search_query=query, search_shown=len(tasks))
+
+    await message.answer(
+        render_search_page(query, tasks),
+        parse_mode="HTML",
+        reply_markup=get_search_keyboard(tasks, has_more)
+    )
+
+
+@actions.action(Action.SEARCH_MORE)
+async def search_more(callback: types.CallbackQuery, state: FSMContext, after_rank: int, after_id: int):
+    data = await state.get_data()
+    query = data.get("search_query")
+    if not query:
+        await callback.answer("Поиск устарел, повторите /search", show_alert=True)
+        return
+
+    user = await UserDAO.get_or_create_user(callback.from_user)
+    tasks, has_more = await find_tasks(user.id, query, after=(after_rank, after_id))
+    if not tasks:
+        await callback.answer("Больше ничего не найдено!", show_alert=True)
+        return
+
+    shown = data.get("search_shown", 0)
+    await state.update_data(search_shown=shown + len(tasks))
+
+    await edit_text(
+        callback.message,
+        render_search_page(query, tasks, offset=shown),
+        parse_mode="HTML",
+        reply_markup=get_search_keyboard(tasks, has_more)
+    )
+    await callback.answer()
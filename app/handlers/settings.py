@@ -1,10 +1,14 @@
-from aiogram import Router, types, F
+from aiogram import Router, types
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from datetime import time
 
 from app.database.dao.user import UserDAO
-from app.keyboards.reply import get_main_keyboard
+from app.handlers.actions import router as actions
+from app.handlers.menu import router as menu
+from app.keyboards.reply import get_main_keyboard, MENU_SETTINGS
+from app.utils.callback_data import Action, pack
+from app.utils.edit_cache import edit_text
 
 router = Router()
 
@@ -18,13 +22,13 @@ def get_settings_keyboard(reminders_enabled: bool) -> types.InlineKeyboardMarkup
     toggle_text = "🔕 Выключить напоминания" if reminders_enabled else "🔔 Включить напоминания"
 
     return types.InlineKeyboardMarkup(inline_keyboard=[
-        [types.InlineKeyboardButton(text=toggle_text, callback_data="toggle_reminders")],
-        [types.InlineKeyboardButton(text="⏰ Изменить время сводки", callback_data="change_reminder_time")],
-        [types.InlineKeyboardButton(text="🔙 Назад", callback_data="close_settings")]
+        [types.InlineKeyboardButton(text=toggle_text, callback_data=pack(Action.TOGGLE_REMINDERS))],
+        [types.InlineKeyboardButton(text="⏰ Изменить время сводки", callback_data=pack(Action.CHANGE_REMINDER_TIME))],
+        [types.InlineKeyboardButton(text="🔙 Назад", callback_data=pack(Action.CLOSE_SETTINGS))]
     ])
 
 
-@router.message(lambda message: message.text == "⚙️ Настройки")
+@menu.command(MENU_SETTINGS)
 async def cmd_settings(message: types.Message):
     user = await UserDAO.get_or_create_user(message.from_user)
 
@@ -46,7 +50,7 @@ async def cmd_settings(message: types.Message):
     )
 
 
-@router.callback_query(F.data == "toggle_reminders")
+@actions.action(Action.TOGGLE_REMINDERS)
 async def toggle_reminders(callback: types.CallbackQuery):
     user = await UserDAO.get_or_create_user(callback.from_user)
 
@@ -69,14 +73,15 @@ async def toggle_reminders(callback: types.CallbackQuery):
         "Выберите, что хотите изменить:"
     )
 
-    await callback.message.edit_text(
+    await edit_text(
+        callback.message,
         settings_text,
         parse_mode="HTML",
         reply_markup=get_settings_keyboard(new_state)
     )
 
 
-@router.callback_query(F.data == "change_reminder_time")
+@actions.action(Action.CHANGE_REMINDER_TIME)
 async def change_reminder_time(callback: types.CallbackQuery, state: FSMContext):
     await state.set_state(SettingsStates.waiting_for_reminder_time)
 
@@ -132,7 +137,7 @@ async def process_reminder_time(message: types.Message, state: FSMContext):
     await state.clear()
 
 
-@router.callback_query(F.data == "close_settings")
+@actions.action(Action.CLOSE_SETTINGS)
 async def close_settings(callback: types.CallbackQuery):
     await callback.message.delete()
     await callback.answer()
\ No newline at end of file
@@ -1,10 +1,24 @@
 from aiogram import Router, types
 from aiogram.filters import Command
-from datetime import datetime
+from app.database.dao.archive import ArchiveDAO
+from app.database.dao.tag import TagDAO
 from app.database.dao.task import TaskDAO
 from app.database.dao.user import UserDAO
-from app.keyboards.inline import get_tasks_keyboard
-from app.keyboards.reply import get_main_keyboard
+from app.database.enums import TaskView
+from app.handlers.actions import router as actions
+from app.handlers.menu import router as menu
+from app.keyboards.inline import get_archive_keyboard, get_tags_keyboard, get_task_view_keyboard, get_tasks_keyboard
+from app.keyboards.reply import get_main_keyboard, MENU_TASKS
+from app.texts.tasks import (
+    ARCHIVE_TITLE,
+    TAGS_EMPTY,
+    TAGS_HEADER,
+    render_task_view,
+    render_tasks_page,
+    view_title,
+)
+from app.utils.callback_data import Action, unpack_timestamp
+from app.utils.edit_cache import edit_text
 
 router = Router()
 
@@ -15,7 +29,7 @@ async def cmd_tasks(message: types.Message):
 
 
 # Хендлер для кнопки "Мои задачи"
-@router.message(lambda message: message.text == "📋 Мои задачи")
+@menu.command(MENU_TASKS)
 async def tasks_button(message: types.Message):
     await cmd_tasks(message)
 
@@ -43,36 +57,99 @@ async def show_tasks_page(message: types.Message, page: int = 0):
     total_tasks = await TaskDAO.count_tasks(user.id)
     total_pages = (total_tasks + TaskDAO.TASKS_PER_PAGE - 1) // TaskDAO.TASKS_PER_PAGE
 
-    tasks_text = "📋 <b>Ваши задачи:</b>\n\n"
-    for i, task in enumerate(tasks, 1):
-        status_icons = {
-            "pending": "⏳",
-            "in_progress": "🔄",
-            "completed": "✅"
-        }
-
-        # Берем первую иконку из статуса
-        icon = status_icons.get(task.status, "📝")
-
-        due_text = ""
-        if task.due_date:
-            task_due_date = task.due_date.date()
-            today = datetime.now().date()
-            if task_due_date < today and task.status != "completed":
-                due_text = " 🔴 Просрочена!"
-            else:
-                due_text = f" 📅 {task.due_date.strftime('%d.%m.%Y')}"
-
-        tasks_text += (
-            f"{i}. {icon} "
-            f"<b>{task.title}</b>\n"
-            f"   Приоритет: {task.priority}{due_text}\n\n"
-        )
-
-    tasks_text += f"\nСтраница {page + 1}/{total_pages}"
+    tasks_text = render_tasks_page(tasks, page, total_pages)
 
     await message.answer(
         tasks_text,
         parse_mode="HTML",
         reply_markup=get_tasks_keyboard(tasks, page=page, total_pages=total_pages)
-    )
\ No newline at end of file
+    )
+
+
+@actions.action(Action.VIEW)
+async def show_task_view(
+        callback: types.CallbackQuery,
+        view: int,
+        tag_id: int,
+        shown: int,
+        after_created: int,
+        after_id: int,
+):
+    """Отфильтрованный список: просроченные, на сегодня, важные или задачи тега"""
+    try:
+        view = TaskView(view)
+    except ValueError:
+        await callback.answer("Список устарел, откройте задачи заново", show_alert=True)
+        return
+
+    user = await UserDAO.get_or_create_user(callback.from_user)
+
+    tag_name = None
+    if view == TaskView.TAG:
+        tag_name = await TagDAO.get_tag_name(tag_id, user.id)
+        if tag_name is None:
+            await callback.answer("Тег не найден!", show_alert=True)
+            return
+
+    after = (unpack_timestamp(after_created), after_id) if after_created else None
+    tasks, total = await TaskDAO.get_view(
+        user.id, view, limit=TaskDAO.TASKS_PER_PAGE, tag_id=tag_id, after=after
+    )
+    if after is not None and not tasks:
+        await callback.answer("Больше нет задач!", show_alert=True)
+        return
+
+    await edit_text(
+        callback.message,
+        render_task_view(view_title(view, tag_name), tasks, total, offset=shown),
+        parse_mode="HTML",
+        reply_markup=get_task_view_keyboard(
+            tasks, view, tag_id, shown + len(tasks), has_more=shown + len(tasks) < total
+        )
+    )
+    await callback.answer()
+
+
+@actions.action(Action.TAGS)
+async def show_tags(callback: types.CallbackQuery):
+    user = await UserDAO.get_or_create_user(callback.from_user)
+
+    tags = await TagDAO.get_user_tags(user.id)
+
+    await edit_text(
+        callback.message,
+        TAGS_HEADER if tags else TAGS_EMPTY,
+        parse_mode="HTML",
+        reply_markup=get_tags_keyboard(tags)
+    )
+    await callback.answer()
+
+
+async def load_archive_page(user_id: int, shown: int = 0, after: tuple | None = None) -> tuple:
+    """Текст и клавиатура страницы архива"""
+    tasks, total = await ArchiveDAO.get_archived(user_id, limit=TaskDAO.TASKS_PER_PAGE, after=after)
+    text = render_task_view(ARCHIVE_TITLE, tasks, total, offset=shown)
+    keyboard = get_archive_keyboard(tasks, shown + len(tasks), has_more=shown + len(tasks) < total)
+    return tasks, text, keyboard
+
+
+@router.message(Command("archive"))
+async def cmd_archive(message: types.Message):
+    user = await UserDAO.get_or_create_user(message.from_user)
+    _, text, keyboard = await load_archive_page(user.id)
+    await message.answer(text, parse_mode="HTML", reply_markup=keyboard)
+
+
+@actions.action(Action.ARCHIVE)
+async def show_archive(callback: types.CallbackQuery, shown: int, after_finished: int, after_id: int):
+    """Завершённые задачи, перенесённые в архив, — только просмотр"""
+    user = await UserDAO.get_or_create_user(callback.from_user)
+
+    after = (unpack_timestamp(after_finished), after_id) if after_finished else None
+    tasks, text, keyboard = await load_archive_page(user.id, shown, after)
+    if after is not None and not tasks:
+        await callback.answer("Больше нет задач!", show_alert=True)
+        return
+
+    await edit_text(callback.message, text, parse_mode="HTML", reply_markup=keyboard)
+    await callback.answer()
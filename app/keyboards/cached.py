@@ -0,0 +1,23 @@
+"""
+Неизменяемые клавиатуры для кэша.
+
+Такие клавиатуры строятся один раз (lru_cache в app.keyboards) и переиспользуются
+между апдейтами, поэтому их нельзя изменять после создания. Сериализацию они
+не ускоряют: сессия бота дампит reply_markup вместе со всем методом
+(SendMessage.model_dump), и pydantic обходит вложенную модель сам, не вызывая её методов.
+"""
+from aiogram.types import InlineKeyboardMarkup, ReplyKeyboardMarkup
+from pydantic import ConfigDict
+
+
+class CachedInlineKeyboardMarkup(InlineKeyboardMarkup):
+    model_config = ConfigDict(frozen=True)
+
+
+class CachedReplyKeyboardMarkup(ReplyKeyboardMarkup):
+    model_config = ConfigDict(frozen=True)
+
+
+def freeze(markup: InlineKeyboardMarkup) -> CachedInlineKeyboardMarkup:
+    """Превращает собранную клавиатуру в неизменяемую"""
+    return CachedInlineKeyboardMarkup.model_construct(inline_keyboard=markup.inline_keyboard)
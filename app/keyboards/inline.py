@@ -1,16 +1,38 @@
+from functools import lru_cache
+
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from app.database.enums import TaskStatus
+from app.config import settings
+from app.database.enums import TaskStatus, TaskView
+from app.keyboards.cached import CachedInlineKeyboardMarkup, freeze
+from app.utils.callback_data import Action, BulkOp, pack, pack_timestamp
+
+# Кнопки отфильтрованных списков под списком задач
+VIEW_BUTTONS = (
+    ("🔴 Просрочено", TaskView.OVERDUE),
+    ("📅 Сегодня", TaskView.TODAY),
+    ("❗ Важные", TaskView.HIGH_PRIORITY),
+)
+
+
+def _view_buttons() -> list:
+    buttons = [
+        InlineKeyboardButton(text=text, callback_data=pack(Action.VIEW, view, 0, 0, 0, 0))
+        for text, view in VIEW_BUTTONS
+    ]
+    buttons.append(InlineKeyboardButton(text="🏷 Теги", callback_data=pack(Action.TAGS)))
+    buttons.append(InlineKeyboardButton(text="📦 Архив", callback_data=pack(Action.ARCHIVE, 0, 0, 0)))
+    return buttons
 
 
 def get_tasks_keyboard(tasks: list, page: int = 0, total_pages: int = 1) -> InlineKeyboardMarkup:
-    """Клавиатура для списка задач"""
+    """Клавиатура для списка задач (зависит от названий, поэтому не кэшируется)"""
     builder = InlineKeyboardBuilder()
 
     for task in tasks:
         builder.button(
             text=f"📝 {task.title[:30]}",
-            callback_data=f"task_{task.id}"
+            callback_data=pack(Action.TASK, task.id)
         )
 
     builder.adjust(1)
@@ -20,79 +42,279 @@ def get_tasks_keyboard(tasks: list, page: int = 0, total_pages: int = 1) -> Inli
     if page > 0:
         pagination_buttons.append(InlineKeyboardButton(
             text="⬅️ Назад",
-            callback_data=f"page_{page - 1}"
+            callback_data=pack(Action.PAGE, page - 1)
         ))
     if page < total_pages - 1:
         pagination_buttons.append(InlineKeyboardButton(
             text="Вперед ➡️",
-            callback_data=f"page_{page + 1}"
+            callback_data=pack(Action.PAGE, page + 1)
         ))
 
     if pagination_buttons:
         builder.row(*pagination_buttons)
 
+    view_buttons = _view_buttons()
+    builder.row(*view_buttons[:2])
+    builder.row(*view_buttons[2:])
+    builder.row(InlineKeyboardButton(text="☑️ Выбрать несколько", callback_data=pack(Action.SELECT, page)))
+
+    return builder.as_markup()
+
+
+def get_task_selection_keyboard(
+        tasks: list, selected: set, page: int = 0, total_pages: int = 1
+) -> InlineKeyboardMarkup:
+    """Список задач в режиме выбора: нажатие отмечает задачу, внизу — действия над отмеченными"""
+    builder = InlineKeyboardBuilder()
+
+    for task in tasks:
+        builder.button(
+            text=f"{'☑️' if task.id in selected else '⬜'} {task.title[:30]}",
+            callback_data=pack(Action.SELECT_TOGGLE, task.id)
+        )
+
+    builder.adjust(1)
+
+    pagination_buttons = []
+    if page > 0:
+        pagination_buttons.append(InlineKeyboardButton(text="⬅️ Назад", callback_data=pack(Action.SELECT, page - 1)))
+    if page < total_pages - 1:
+        pagination_buttons.append(InlineKeyboardButton(text="Вперед ➡️", callback_data=pack(Action.SELECT, page + 1)))
+    if pagination_buttons:
+        builder.row(*pagination_buttons)
+
+    if selected:
+        builder.row(
+            InlineKeyboardButton(text=f"✅ Выполнить ({len(selected)})", callback_data=pack(Action.BULK, BulkOp.COMPLETE)),
+            InlineKeyboardButton(text="🗑️ Удалить", callback_data=pack(Action.BULK, BulkOp.DELETE)),
+        )
+        builder.row(
+            InlineKeyboardButton(text="🔢 Приоритет", callback_data=pack(Action.BULK, BulkOp.PRIORITY)),
+            InlineKeyboardButton(text="📅 Срок", callback_data=pack(Action.BULK, BulkOp.RESCHEDULE)),
+        )
+    builder.row(InlineKeyboardButton(text="✖️ Отмена", callback_data=pack(Action.BULK, BulkOp.CANCEL)))
+
+    return builder.as_markup()
+
+
+@lru_cache(maxsize=None)
+def get_bulk_priority_keyboard() -> CachedInlineKeyboardMarkup:
+    """Новый приоритет для выбранных задач"""
+    builder = InlineKeyboardBuilder()
+    for priority in range(1, 11):
+        builder.button(text=str(priority), callback_data=pack(Action.BULK_PRIORITY, priority))
+    builder.button(text="🔙 Назад", callback_data=pack(Action.BULK, BulkOp.BACK))
+    builder.adjust(5, 5, 1)
+    return freeze(builder.as_markup())
+
+
+# Варианты нового срока для выбранных задач: номер → (подпись, через сколько дней; None — без срока)
+BULK_DUE_PRESETS = {
+    1: ("Сегодня", 0),
+    2: ("Завтра", 1),
+    3: ("Через неделю", 7),
+    4: ("Без срока", None),
+}
+
+
+@lru_cache(maxsize=None)
+def get_bulk_due_keyboard() -> CachedInlineKeyboardMarkup:
+    """Новый срок для выбранных задач"""
+    builder = InlineKeyboardBuilder()
+    for preset, (text, _) in BULK_DUE_PRESETS.items():
+        builder.button(text=text, callback_data=pack(Action.BULK_DUE, preset))
+    builder.button(text="🔙 Назад", callback_data=pack(Action.BULK, BulkOp.BACK))
+    builder.adjust(2, 2, 1)
+    return freeze(builder.as_markup())
+
+
+@lru_cache(maxsize=None)
+def get_bulk_delete_keyboard() -> CachedInlineKeyboardMarkup:
+    """Подтверждение удаления выбранных задач"""
+    builder = InlineKeyboardBuilder()
+    builder.button(text="✅ Да", callback_data=pack(Action.BULK, BulkOp.CONFIRM_DELETE))
+    builder.button(text="❌ Нет", callback_data=pack(Action.BULK, BulkOp.BACK))
+    builder.adjust(2)
+    return freeze(builder.as_markup())
+
+
+def get_task_view_keyboard(tasks: list, view: TaskView, tag_id: int, shown: int, has_more: bool) -> InlineKeyboardMarkup:
+    """Клавиатура отфильтрованного списка; «Ещё» продолжает после последней задачи страницы"""
+    builder = InlineKeyboardBuilder()
+
+    for task in tasks:
+        builder.button(
+            text=f"📝 {task.title[:30]}",
+            callback_data=pack(Action.TASK, task.id)
+        )
+
+    builder.adjust(1)
+
+    if has_more:
+        last = tasks[-1]
+        builder.row(InlineKeyboardButton(
+            text="Ещё ➡️",
+            callback_data=pack(Action.VIEW, view, tag_id, shown, pack_timestamp(last.created_at), last.id)
+        ))
+
+    builder.row(InlineKeyboardButton(text="📋 Все задачи", callback_data=pack(Action.BACK_TO_LIST)))
     return builder.as_markup()
 
 
-def get_task_detail_keyboard(task_id: int) -> InlineKeyboardMarkup:
-    """Клавиатура для конкретной задачи"""
+def get_archive_keyboard(tasks: list, shown: int, has_more: bool) -> InlineKeyboardMarkup:
+    """Клавиатура архива: задачи только для просмотра, «Ещё» продолжает после последней"""
+    builder = InlineKeyboardBuilder()
+
+    if has_more:
+        last = tasks[-1]
+        builder.button(
+            text="Ещё ➡️",
+            callback_data=pack(Action.ARCHIVE, shown, pack_timestamp(last.finished_at), last.id)
+        )
+
+    builder.button(text="📋 Все задачи", callback_data=pack(Action.BACK_TO_LIST))
+    builder.adjust(1)
+    return builder.as_markup()
+
+
+def get_tags_keyboard(tags: list) -> InlineKeyboardMarkup:
+    """Теги пользователя; нажатие открывает задачи тега"""
+    builder = InlineKeyboardBuilder()
+
+    for tag in tags:
+        builder.button(
+            text=f"#{tag.name} ({tag.tasks})",
+            callback_data=pack(Action.VIEW, TaskView.TAG, tag.id, 0, 0, 0)
+        )
+
+    builder.adjust(2)
+    builder.row(InlineKeyboardButton(text="📋 Все задачи", callback_data=pack(Action.BACK_TO_LIST)))
+    return builder.as_markup()
+
+
+def get_search_keyboard(tasks: list, has_more: bool) -> InlineKeyboardMarkup:
+    """Клавиатура результатов поиска; «Ещё» продолжает после последней найденной задачи"""
+    builder = InlineKeyboardBuilder()
+
+    for task in tasks:
+        builder.button(
+            text=f"📝 {task.title[:30]}",
+            callback_data=pack(Action.TASK, task.id)
+        )
+
+    builder.adjust(1)
+
+    if has_more:
+        last = tasks[-1]
+        builder.row(InlineKeyboardButton(
+            text="Ещё ➡️",
+            callback_data=pack(Action.SEARCH_MORE, last.rank, last.id)
+        ))
+
+    return builder.as_markup()
+
+
+@lru_cache(maxsize=settings.KEYBOARD_CACHE_SIZE)
+def get_task_detail_keyboard(task_id: int) -> CachedInlineKeyboardMarkup:
+    """
+    Клавиатура для конкретной задачи.
+    Клавиатуры по task_id кэшируются и общие для всех вызовов — не изменяйте их
+    """
     builder = InlineKeyboardBuilder()
 
     builder.button(
         text="✅ Сделано",
-        callback_data=f"done_{task_id}"
+        callback_data=pack(Action.DONE, task_id)
     )
     builder.button(
         text="🔄 В работе",
-        callback_data=f"progress_{task_id}"
+        callback_data=pack(Action.PROGRESS, task_id)
     )
     builder.button(
         text="✏️ Изменить",
-        callback_data=f"edit_{task_id}"
+        callback_data=pack(Action.EDIT, task_id)
     )
     builder.button(
         text="🗑️ Удалить",
-        callback_data=f"delete_{task_id}"
+        callback_data=pack(Action.DELETE, task_id)
+    )
+    builder.button(
+        text="☑️ Чек-лист",
+        callback_data=pack(Action.CHECKLIST, task_id)
     )
     builder.button(
         text="📋 К списку",
-        callback_data="back_to_list"
+        callback_data=pack(Action.BACK_TO_LIST)
     )
 
-    builder.adjust(2, 2, 1)
+    builder.adjust(2, 2, 2)
+    return freeze(builder.as_markup())
+
+
+def get_checklist_keyboard(task_id: int, items: list) -> InlineKeyboardMarkup:
+    """Клавиатура чек-листа: пункт — кнопка, нажатие меняет отметку"""
+    builder = InlineKeyboardBuilder()
+
+    for item in items:
+        builder.button(
+            text=f"{'✅' if item.done else '⬜'} {item.title[:30]}",
+            callback_data=pack(Action.CHECK_TOGGLE, item.id)
+        )
+
+    builder.adjust(1)
+
+    controls = [InlineKeyboardButton(text="➕ Пункт", callback_data=pack(Action.CHECK_ADD, task_id))]
+    if any(item.done for item in items):
+        controls.append(InlineKeyboardButton(text="🧹 Убрать отмеченные", callback_data=pack(Action.CHECK_CLEAR, task_id)))
+    builder.row(*controls)
+    builder.row(InlineKeyboardButton(text="🔙 К задаче", callback_data=pack(Action.TASK, task_id)))
+
     return builder.as_markup()
 
 
-def get_edit_task_keyboard(task_id: int) -> InlineKeyboardMarkup:
+@lru_cache(maxsize=settings.KEYBOARD_CACHE_SIZE)
+def get_shared_task_keyboard(task_id: int) -> CachedInlineKeyboardMarkup:
+    """Клавиатура задачи, отправленной в чат через инлайн-режим"""
+    builder = InlineKeyboardBuilder()
+    builder.button(
+        text="✅ Выполнено",
+        callback_data=pack(Action.DONE, task_id)
+    )
+    return freeze(builder.as_markup())
+
+
+@lru_cache(maxsize=settings.KEYBOARD_CACHE_SIZE)
+def get_edit_task_keyboard(task_id: int) -> CachedInlineKeyboardMarkup:
     """Клавиатура для редактирования задачи"""
     builder = InlineKeyboardBuilder()
 
     builder.button(
         text="📝 Название",
-        callback_data=f"edit_title_{task_id}"
+        callback_data=pack(Action.EDIT_TITLE, task_id)
     )
     builder.button(
         text="📄 Описание",
-        callback_data=f"edit_desc_{task_id}"
+        callback_data=pack(Action.EDIT_DESC, task_id)
     )
     builder.button(
         text="📅 Срок",
-        callback_data=f"edit_due_{task_id}"
+        callback_data=pack(Action.EDIT_DUE, task_id)
     )
     builder.button(
         text="🔢 Приоритет",
-        callback_data=f"edit_priority_{task_id}"
+        callback_data=pack(Action.EDIT_PRIORITY, task_id)
     )
     builder.button(
         text="🔙 Назад",
-        callback_data=f"task_{task_id}"
+        callback_data=pack(Action.TASK, task_id)
     )
 
     builder.adjust(2, 2, 1)
-    return builder.as_markup()
+    return freeze(builder.as_markup())
 
 
-def get_status_keyboard() -> InlineKeyboardMarkup:
+@lru_cache(maxsize=None)
+def get_status_keyboard() -> CachedInlineKeyboardMarkup:
     """Клавиатура для выбора статуса"""
     builder = InlineKeyboardBuilder()
 
@@ -103,21 +325,22 @@ def get_status_keyboard() -> InlineKeyboardMarkup:
         )
 
     builder.adjust(1)
-    return builder.as_markup()
+    return freeze(builder.as_markup())
 
 
-def get_confirmation_keyboard(task_id: int, action: str) -> InlineKeyboardMarkup:
-    """Клавиатура подтверждения удаления"""
+@lru_cache(maxsize=settings.KEYBOARD_CACHE_SIZE)
+def get_confirmation_keyboard(task_id: int, action: Action) -> CachedInlineKeyboardMarkup:
+    """Клавиатура подтверждения; action — действие кнопки «Да»"""
     builder = InlineKeyboardBuilder()
 
     builder.button(
         text="✅ Да",
-        callback_data=f"confirm_{action}_{task_id}"
+        callback_data=pack(action, task_id)
     )
     builder.button(
         text="❌ Нет",
-        callback_data=f"task_{task_id}"
+        callback_data=pack(Action.TASK, task_id)
     )
 
     builder.adjust(2)
-    return builder.as_markup()
\ No newline at end of file
+    return freeze(builder.as_markup())
\ No newline at end of file
@@ -1,14 +1,61 @@
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, ReplyKeyboardRemove
+from functools import lru_cache
 
+from aiogram.types import KeyboardButton, ReplyKeyboardRemove
 
-def get_main_keyboard() -> ReplyKeyboardMarkup:
-    """Основная клавиатура с командами"""
+from app.keyboards.cached import CachedReplyKeyboardMarkup
+from app.utils.recurrence import REPEAT_DAILY, REPEAT_MONTHLY, REPEAT_NONE, REPEAT_WEEKLY, REPEAT_WORKDAYS
+
+# Тексты кнопок главного меню
+MENU_ADD_TASK = "➕ Добавить задачу"
+MENU_TASKS = "📋 Мои задачи"
+MENU_PROFILE = "👤 Профиль"
+MENU_SETTINGS = "⚙️ Настройки"
+MENU_HELP = "❓ Помощь"
+
+
+@lru_cache(maxsize=None)
+def get_main_keyboard() -> CachedReplyKeyboardMarkup:
+    """Основная клавиатура с командами (строится один раз)"""
+    keyboard = [
+        [KeyboardButton(text=MENU_ADD_TASK)],
+        [KeyboardButton(text=MENU_TASKS), KeyboardButton(text=MENU_PROFILE)],
+        [KeyboardButton(text=MENU_SETTINGS), KeyboardButton(text=MENU_HELP)],
+    ]
+    return CachedReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
+
+
+@lru_cache(maxsize=None)
+def get_due_date_keyboard() -> CachedReplyKeyboardMarkup:
+    """Выбор срока при создании задачи"""
+    keyboard = [
+        [KeyboardButton(text="Пропустить")],
+        [KeyboardButton(text="Сегодня")],
+        [KeyboardButton(text="Завтра")],
+        [KeyboardButton(text="Через неделю")]
+    ]
+    return CachedReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True, one_time_keyboard=True)
+
+
+@lru_cache(maxsize=None)
+def get_repeat_keyboard() -> CachedReplyKeyboardMarkup:
+    """Выбор повторения при создании задачи"""
+    keyboard = [
+        [KeyboardButton(text=REPEAT_NONE)],
+        [KeyboardButton(text=REPEAT_DAILY), KeyboardButton(text=REPEAT_WORKDAYS)],
+        [KeyboardButton(text=REPEAT_WEEKLY), KeyboardButton(text=REPEAT_MONTHLY)]
+    ]
+    return CachedReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True, one_time_keyboard=True)
+
+
+@lru_cache(maxsize=None)
+def get_edit_due_date_keyboard() -> CachedReplyKeyboardMarkup:
+    """Выбор нового срока при редактировании задачи"""
     keyboard = [
-        [KeyboardButton(text="➕ Добавить задачу")],
-        [KeyboardButton(text="📋 Мои задачи"), KeyboardButton(text="👤 Профиль")],
-        [KeyboardButton(text="⚙️ Настройки"), KeyboardButton(text="❓ Помощь")],
+        [KeyboardButton(text="Удалить срок")],
+        [KeyboardButton(text="Сегодня"), KeyboardButton(text="Завтра")],
+        [KeyboardButton(text="Через неделю")]
     ]
-    return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
+    return CachedReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True, one_time_keyboard=True)
 
 
 def remove_keyboard() -> ReplyKeyboardRemove:
@@ -9,10 +9,26 @@ from app.handlers.start import router as start_router
 from app.handlers.help import router as help_router
 from app.handlers.add_task import router as add_task_router
 from app.handlers.tasks import router as tasks_router
+from app.handlers.search import router as search_router
+from app.handlers.export import router as export_router
+from app.handlers.import_tasks import router as import_router
+from app.handlers.inline import router as inline_router
 from app.handlers.callbacks import router as callbacks_router
+from app.handlers.checklist import router as checklist_router
+from app.handlers.bulk import router as bulk_router
 from app.handlers.settings import router as settings_router
 from app.handlers.profile import router as profile_router
+from app.handlers.actions import router as actions_router
+from app.handlers.menu import router as menu_router
+from app.middlewares import (
+    CommitBeforeRequestMiddleware,
+    ConsistencyMiddleware,
+    QueryBudgetMiddleware,
+    ThrottlingMiddleware,
+    UnitOfWorkMiddleware,
+)
 from app.scheduler import setup_scheduler, scheduler
+from app.utils.metrics import start_metrics_server
 
 # Настройка логирования
 logging.basicConfig(
@@ -22,24 +38,67 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main() -> None:
-    # Initialize bot and dispatcher
-    bot = Bot(token=settings.BOT_TOKEN)
+def create_dispatcher(throttling: bool = True) -> Dispatcher:
+    """Создаёт диспетчер со всеми роутерами и мидлварями бота; throttling=False — без антифлуда"""
     storage = MemoryStorage()
     dp = Dispatcher(storage=storage)
 
+    # Антифлуд до роутинга; один экземпляр, чтобы лимиты были общими
+    if throttling:
+        throttling_middleware = ThrottlingMiddleware()
+        dp.message.outer_middleware(throttling_middleware)
+        dp.callback_query.outer_middleware(throttling_middleware)
+
+    # Чтения с реплики до первой записи в апдейте
+    dp.update.outer_middleware(ConsistencyMiddleware())
+
+    # Учёт SQL-запросов на каждый хендлер
+    # Загрузка из файла: до трёх запросов (задачи и теги) на каждую пачку
+    import_budget = settings.QUERY_BUDGET + 3 * -(-settings.IMPORT_MAX_TASKS // settings.IMPORT_BATCH_SIZE)
+    dp.message.middleware(QueryBudgetMiddleware(budgets={"process_import_file": import_budget}))
+    dp.callback_query.middleware(QueryBudgetMiddleware())
+
+    # Одно соединение и одна транзакция на хендлер
+    unit_of_work_middleware = UnitOfWorkMiddleware()
+    dp.message.middleware(unit_of_work_middleware)
+    dp.callback_query.middleware(unit_of_work_middleware)
+
     # Register routers
+    # Кнопки главного меню — до остальных роутеров и FSM-сценариев
+    dp.include_router(menu_router)
     dp.include_router(start_router)
     dp.include_router(help_router)
     dp.include_router(add_task_router)
     dp.include_router(tasks_router)
+    dp.include_router(search_router)
+    dp.include_router(export_router)
+    dp.include_router(import_router)
+    dp.include_router(inline_router)
     dp.include_router(profile_router)
     dp.include_router(settings_router)
     dp.include_router(callbacks_router)
+    dp.include_router(checklist_router)
+    dp.include_router(bulk_router)
+    # Все callback-кнопки: выбор хендлера по коду действия
+    dp.include_router(actions_router)
+
+    return dp
+
+
+async def main() -> None:
+    # Initialize bot and dispatcher
+    bot = Bot(token=settings.BOT_TOKEN)
+    # Коммит транзакции апдейта перед каждым запросом к Bot API
+    bot.session.middleware(CommitBeforeRequestMiddleware())
+    dp = create_dispatcher()
 
     # Setup scheduler
     setup_scheduler(bot)
 
+    metrics_runner = None
+    if settings.METRICS_PORT:
+        metrics_runner = await start_metrics_server(settings.METRICS_PORT)
+
     try:
         # Skip previous updates and run polling
         await bot.delete_webhook(drop_pending_updates=True)
@@ -48,6 +107,8 @@ async def main() -> None:
     finally:
         # Shutdown scheduler
         scheduler.shutdown()
+        if metrics_runner:
+            await metrics_runner.cleanup()
         await bot.session.close()
 
 
@@ -0,0 +1,12 @@
+from .consistency import ConsistencyMiddleware
+from .query_budget import QueryBudgetMiddleware
+from .throttling import ThrottlingMiddleware
+from .unit_of_work import CommitBeforeRequestMiddleware, UnitOfWorkMiddleware
+
+__all__ = [
+    'CommitBeforeRequestMiddleware',
+    'ConsistencyMiddleware',
+    'QueryBudgetMiddleware',
+    'ThrottlingMiddleware',
+    'UnitOfWorkMiddleware',
+]
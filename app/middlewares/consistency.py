@@ -0,0 +1,23 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.database.routing import consistency_scope
+
+
+class ConsistencyMiddleware(BaseMiddleware):
+    """
+    Выполняет обработку апдейта в consistency_scope: до первой записи
+    чтения могут идти на реплику, после неё — только на основную базу.
+    Ставится outer-мидлварью на update, чтобы охватить и фильтры
+    """
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        with consistency_scope():
+            return await handler(event, data)
@@ -0,0 +1,41 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.config import settings
+from app.database.query_stats import query_scope
+from app.utils.dispatch import handler_name
+
+
+class QueryBudgetMiddleware(BaseMiddleware):
+    """
+    Считает SQL-запросы каждого хендлера и логирует превышение бюджета.
+    Бюджет можно переопределить для отдельных хендлеров через budgets.
+    """
+
+    def __init__(
+            self,
+            budget: int = settings.QUERY_BUDGET,
+            budgets: Optional[Dict[str, int]] = None,
+            n_plus_one_threshold: int = settings.QUERY_N_PLUS_ONE_THRESHOLD,
+    ) -> None:
+        self.budget = budget
+        self.budgets = budgets or {}
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        # Для ActionRouter и MenuRouter — имя найденного хендлера действия или кнопки
+        name = handler_name(data) or type(event).__name__
+
+        with query_scope(
+                name,
+                budget=self.budgets.get(name, self.budget),
+                n_plus_one_threshold=self.n_plus_one_threshold,
+        ):
+            return await handler(event, data)
@@ -0,0 +1,102 @@
+import time
+from collections import deque
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import CallbackQuery, TelegramObject
+
+from app.config import settings
+from app.utils.callback_data import SEPARATOR
+from app.utils.metrics import counter
+
+DROPPED_UPDATES = counter("bot_updates_dropped_total", "Updates dropped before routing", ["event", "reason"])
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Отбрасывает апдейты до роутинга (ставится как outer-мидлварь).
+
+    Лимит — скользящее окно: не больше rate апдейтов за window секунд на пару
+    (пользователь, тип действия). Тип действия сообщения — «message»,
+    callback-а — код действия из callback_data.
+    Повтор того же callback_data от того же пользователя в пределах debounce
+    секунд — двойное нажатие: хендлер выполняется только для первого.
+    Отброшенные сообщения Bot API не вызывают — при флуде это только добавило бы запросов.
+    На отброшенный callback отвечается answerCallbackQuery, иначе у кнопки
+    крутится индикатор загрузки до таймаута Telegram: на двойное нажатие — молча,
+    при превышении лимита — короткой подсказкой.
+    """
+
+    def __init__(
+            self,
+            rate: int = settings.THROTTLE_RATE,
+            window: float = settings.THROTTLE_WINDOW,
+            debounce: float = settings.CALLBACK_DEBOUNCE,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.window = window
+        self.debounce = debounce
+        self.clock = clock
+        self._hits: Dict[Tuple[int, str], Deque[float]] = {}
+        self._last_callbacks: Dict[Tuple[int, str], float] = {}
+        self._next_sweep = 0.0
+
+    def _sweep(self, now: float) -> None:
+        """Удаляет пользователей, от которых давно ничего не было"""
+        window_start = now - self.window
+        self._hits = {key: hits for key, hits in self._hits.items() if hits[-1] > window_start}
+        debounce_start = now - self.debounce
+        self._last_callbacks = {key: ts for key, ts in self._last_callbacks.items() if ts > debounce_start}
+        self._next_sweep = now + max(self.window, self.debounce)
+
+    def check(self, event: TelegramObject) -> Optional[str]:
+        """Причина отбросить апдейт или None"""
+        user = event.from_user
+        if user is None:
+            return None
+
+        now = self.clock()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        if isinstance(event, CallbackQuery):
+            data = event.data or ""
+            key = (user.id, data)
+            last = self._last_callbacks.get(key)
+            if last is not None and now - last < self.debounce:
+                return "duplicate"
+            self._last_callbacks[key] = now
+            action = data.partition(SEPARATOR)[0]
+        else:
+            action = "message"
+
+        hits = self._hits.get((user.id, action))
+        if hits is None:
+            hits = self._hits[(user.id, action)] = deque()
+        window_start = now - self.window
+        while hits and hits[0] <= window_start:
+            hits.popleft()
+        if len(hits) >= self.rate:
+            return "throttled"
+        hits.append(now)
+        return None
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        reason = self.check(event)
+        if reason is not None:
+            is_callback = isinstance(event, CallbackQuery)
+            DROPPED_UPDATES.inc(event="callback_query" if is_callback else "message", reason=reason)
+            if is_callback:
+                # Ответ не обязателен: устаревший запрос Telegram отклонит — это не ошибка апдейта
+                with suppress(TelegramAPIError):
+                    await event.answer("Слишком часто, подождите немного" if reason == "throttled" else None)
+            return None
+        return await handler(event, data)
@@ -0,0 +1,48 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject
+
+from app.database.base import engine
+from app.database.unit_of_work import current_unit_of_work, unit_of_work
+
+
+class UnitOfWorkMiddleware(BaseMiddleware):
+    """
+    Выполняет хендлер в одной транзакции основной базы: все вызовы DAO
+    делят одно соединение, изменения фиксируются одним коммитом после хендлера
+    (или раньше — перед запросом к Bot API, см. CommitBeforeRequestMiddleware).
+    Ошибка в хендлере откатывает всё, что он успел записать после коммита
+    """
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        async with unit_of_work(engine):
+            return await handler(event, data)
+
+
+class CommitBeforeRequestMiddleware(BaseRequestMiddleware):
+    """
+    Мидлварь сессии бота: перед запросом к Bot API фиксирует транзакцию
+    текущего апдейта и отпускает его соединение. Ответ уходит после коммита,
+    а блокировки строк и соединение (в PgBouncer тоже) не держатся на время
+    запроса в Telegram. Вне unit_of_work (планировщик) ничего не делает
+    """
+
+    async def __call__(
+            self,
+            make_request: NextRequestMiddlewareType[TelegramType],
+            bot: Bot,
+            method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        uow = current_unit_of_work()
+        if uow is not None:
+            await uow.release()
+        return await make_request(bot, method)
@@ -0,0 +1,47 @@
+"""Job run history
+
+Revision ID: 8d2f1c7a9b34
+Revises: 4a3c0f4bc13f
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f1c7a9b34'
+down_revision: Union[str, Sequence[str], None] = '4a3c0f4bc13f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('start_lag', sa.Float(), nullable=True),
+        sa.Column('duration', sa.Float(), nullable=False),
+        sa.Column('rows_scanned', sa.Integer(), nullable=False),
+        sa.Column('messages_attempted', sa.Integer(), nullable=False),
+        sa.Column('messages_sent', sa.Integer(), nullable=False),
+        sa.Column('messages_failed', sa.Integer(), nullable=False),
+        sa.Column('queries', sa.Integer(), nullable=False),
+        sa.Column('db_time', sa.Float(), nullable=False),
+        sa.Column('api_time', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_runs_job_id_started_at', 'job_runs', ['job_id', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_runs_job_id_started_at', table_name='job_runs')
+    op.drop_table('job_runs')
@@ -0,0 +1,60 @@
+"""Tasks archive
+
+Revision ID: a61d3e9c4f27
+Revises: f2c7d9a4b158
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61d3e9c4f27'
+down_revision: Union[str, Sequence[str], None] = 'f2c7d9a4b158'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_STATUS = postgresql.ENUM(
+    'PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='task_status', create_type=False
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tasks_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=False),
+        sa.Column('status', TASK_STATUS, nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('due_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('children_total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('children_done', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_tasks_archive_user_id_finished_at', 'tasks_archive',
+        ['user_id', 'finished_at', 'id'], unique=False,
+    )
+    op.create_index(
+        'ix_tasks_finished_at', 'tasks', [sa.text('coalesce(completed_at, updated_at)')], unique=False,
+        postgresql_where=sa.text("status IN ('COMPLETED', 'CANCELLED')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_finished_at', table_name='tasks')
+    op.drop_index('ix_tasks_archive_user_id_finished_at', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
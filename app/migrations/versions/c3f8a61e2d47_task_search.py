@@ -0,0 +1,48 @@
+"""Task full-text search
+
+Revision ID: c3f8a61e2d47
+Revises: b7e4a2d91c05
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a61e2d47'
+down_revision: Union[str, Sequence[str], None] = 'b7e4a2d91c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    # Хранимая генерируемая колонка: ALTER перепишет таблицу tasks
+    op.add_column('tasks', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_tasks_user_id_search_vector', 'tasks', ['user_id', 'search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_tasks_user_id_title_trgm', 'tasks', ['user_id', 'title'], unique=False,
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_id_title_trgm', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_search_vector', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
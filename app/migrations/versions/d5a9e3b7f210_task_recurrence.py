@@ -0,0 +1,41 @@
+"""Task recurrence rules
+
+Revision ID: d5a9e3b7f210
+Revises: c3f8a61e2d47
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9e3b7f210'
+down_revision: Union[str, Sequence[str], None] = 'c3f8a61e2d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+task_recurrence = sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', 'EVERY_N_DAYS', name='task_recurrence')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    task_recurrence.create(op.get_bind())
+    op.add_column('tasks', sa.Column('recurrence', task_recurrence, nullable=True))
+    op.add_column('tasks', sa.Column('recurrence_interval', sa.Integer(), nullable=True))
+    op.add_column('tasks', sa.Column('recurrence_weekdays', sa.Integer(), nullable=True))
+    op.create_index(
+        'ix_tasks_recurring_due_date', 'tasks', ['due_date'], unique=False,
+        postgresql_where=sa.text("recurrence IS NOT NULL AND status IN ('PENDING', 'IN_PROGRESS')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_recurring_due_date', table_name='tasks')
+    op.drop_column('tasks', 'recurrence_weekdays')
+    op.drop_column('tasks', 'recurrence_interval')
+    op.drop_column('tasks', 'recurrence')
+    task_recurrence.drop(op.get_bind())
@@ -0,0 +1,42 @@
+"""Task checklists
+
+Revision ID: e8b1c4d6a932
+Revises: d5a9e3b7f210
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b1c4d6a932'
+down_revision: Union[str, Sequence[str], None] = 'd5a9e3b7f210'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('checklist_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('done', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_checklist_items_task_id', 'checklist_items', ['task_id'], unique=False)
+    op.add_column('tasks', sa.Column('children_total', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('tasks', sa.Column('children_done', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'children_done')
+    op.drop_column('tasks', 'children_total')
+    op.drop_index('ix_checklist_items_task_id', table_name='checklist_items')
+    op.drop_table('checklist_items')
@@ -0,0 +1,72 @@
+"""Task tags and filtered list indexes
+
+Revision ID: f2c7d9a4b158
+Revises: e8b1c4d6a932
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7d9a4b158'
+down_revision: Union[str, Sequence[str], None] = 'e8b1c4d6a932'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_TASKS = sa.text("status IN ('PENDING', 'IN_PROGRESS')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tags',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'name', name='uq_tags_user_id_name')
+    )
+    op.create_table('task_tags',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('task_id', 'tag_id')
+    )
+    op.create_index(
+        'ix_task_tags_user_id_tag_id_created_at', 'task_tags',
+        ['user_id', 'tag_id', 'created_at', 'task_id'], unique=False,
+    )
+    op.create_index('ix_tasks_user_id_created_at', 'tasks', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_open_user_id_due_date', 'tasks', ['user_id', 'due_date'], unique=False, postgresql_where=OPEN_TASKS)
+    op.create_index('ix_tasks_open_user_id_priority', 'tasks', ['user_id', 'priority'], unique=False, postgresql_where=OPEN_TASKS)
+
+    # Теги уже существующих задач — из #слов в названиях, как в app.utils.tags
+    op.execute(
+        "INSERT INTO tags (user_id, name) "
+        "SELECT DISTINCT user_id, left(lower(m[1]), 32) FROM tasks, regexp_matches(title, '#(\\w+)', 'g') AS m "
+        "ON CONFLICT DO NOTHING"
+    )
+    op.execute(
+        "INSERT INTO task_tags (task_id, tag_id, user_id, created_at) "
+        "SELECT DISTINCT t.id, g.id, t.user_id, t.created_at "
+        "FROM tasks t CROSS JOIN regexp_matches(t.title, '#(\\w+)', 'g') AS m "
+        "JOIN tags g ON g.user_id = t.user_id AND g.name = left(lower(m[1]), 32)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_open_user_id_priority', table_name='tasks')
+    op.drop_index('ix_tasks_open_user_id_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_created_at', table_name='tasks')
+    op.drop_index('ix_task_tags_user_id_tag_id_created_at', table_name='task_tags')
+    op.drop_table('task_tags')
+    op.drop_table('tags')
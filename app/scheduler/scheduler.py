@@ -3,6 +3,8 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
+from app.scheduler.telemetry import install_job_telemetry, tracked_job
+
 logger = logging.getLogger(__name__)
 
 scheduler = AsyncIOScheduler()
@@ -16,11 +18,16 @@ def setup_scheduler(bot):
         send_daily_summary,
         check_streak_reminder,
         weekly_stats,
+        roll_forward_recurring_tasks,
+        archive_finished_tasks,
     )
 
+    # Метрики запусков: задержка старта, время, строки, отправки, время в БД и Bot API
+    install_job_telemetry(scheduler)
+
     # Проверка приближающихся дедлайнов каждые 30 минут
     scheduler.add_job(
-        check_upcoming_deadlines,
+        tracked_job("check_upcoming_deadlines")(check_upcoming_deadlines),
         trigger=IntervalTrigger(minutes=30),
         id="check_upcoming_deadlines",
         replace_existing=True,
@@ -29,16 +36,32 @@ def setup_scheduler(bot):
 
     # Проверка просроченных задач каждый час
     scheduler.add_job(
-        check_overdue_tasks,
+        tracked_job("check_overdue_tasks")(check_overdue_tasks),
         trigger=IntervalTrigger(hours=1),
         id="check_overdue_tasks",
         replace_existing=True,
         kwargs={"bot": bot}
     )
 
+    # Перенос пропущенных повторяющихся задач сразу после полуночи (UTC, как и сроки)
+    scheduler.add_job(
+        tracked_job("roll_forward_recurring")(roll_forward_recurring_tasks),
+        trigger=CronTrigger(hour=0, minute=5, timezone="UTC"),
+        id="roll_forward_recurring",
+        replace_existing=True,
+    )
+
+    # Архивация завершённых задач ночью, когда пользователей меньше всего
+    scheduler.add_job(
+        tracked_job("archive_finished_tasks")(archive_finished_tasks),
+        trigger=CronTrigger(hour=3, minute=30, timezone="UTC"),
+        id="archive_finished_tasks",
+        replace_existing=True,
+    )
+
     # Утренняя сводка в 9:00
     scheduler.add_job(
-        send_daily_summary,
+        tracked_job("daily_summary")(send_daily_summary),
         trigger=CronTrigger(hour=9, minute=0),
         id="daily_summary",
         replace_existing=True,
@@ -47,7 +70,7 @@ def setup_scheduler(bot):
 
     # Напоминание о стрике в 21:00
     scheduler.add_job(
-        check_streak_reminder,
+        tracked_job("streak_reminder")(check_streak_reminder),
         trigger=CronTrigger(hour=21, minute=0),
         id="streak_reminder",
         replace_existing=True,
@@ -56,7 +79,7 @@ def setup_scheduler(bot):
 
     # Еженедельная статистика по воскресеньям в 20:00
     scheduler.add_job(
-        weekly_stats,
+        tracked_job("weekly_stats")(weekly_stats),
         trigger=CronTrigger(day_of_week='sun', hour=20, minute=0),
         id="weekly_stats",
         replace_existing=True,
@@ -64,4 +87,4 @@ def setup_scheduler(bot):
     )
 
     scheduler.start()
-    logger.info("Scheduler started with 5 jobs")
\ No newline at end of file
+    logger.info("Scheduler started with 7 jobs")
\ No newline at end of file
@@ -0,0 +1,174 @@
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from aiogram import Bot
+from apscheduler.events import EVENT_JOB_SUBMITTED, JobSubmissionEvent
+
+from app.config import settings
+from app.database.dao.job_run import JobRunDAO
+from app.database.query_stats import QueryStats, query_scope
+from app.database.routing import consistency_scope
+from app.utils.metrics import counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+JOB_RUNS = counter("scheduler_job_runs_total", "Job runs by result", ["job", "status"])
+JOB_DURATION = histogram("scheduler_job_duration_seconds", "Job wall time", ["job"])
+JOB_START_LAG = gauge(
+    "scheduler_job_start_lag_seconds", "Delay between scheduled and actual start of the last run", ["job"]
+)
+JOB_ROWS_SCANNED = counter("scheduler_job_rows_scanned_total", "Rows loaded by jobs", ["job"])
+JOB_MESSAGES = counter("scheduler_job_messages_total", "Messages sent by jobs", ["job", "result"])
+JOB_QUERIES = counter("scheduler_job_queries_total", "SQL statements issued by jobs", ["job"])
+JOB_DB_TIME = counter("scheduler_job_db_seconds_total", "Time jobs spent in the database", ["job"])
+JOB_API_TIME = counter("scheduler_job_api_seconds_total", "Time jobs spent in the Bot API", ["job"])
+
+# Плановое время запуска, которое APScheduler сообщает при постановке задачи в executor
+_scheduled_times: Dict[str, datetime] = {}
+
+_current_run: ContextVar[Optional["JobRunStats"]] = ContextVar("job_run", default=None)
+
+
+@dataclass
+class JobRunStats:
+    """Счётчики одного запуска задачи"""
+    job_id: str
+    started_at: datetime
+    scheduled_at: Optional[datetime] = None
+    rows_scanned: int = 0
+    messages_attempted: int = 0
+    messages_sent: int = 0
+    messages_failed: int = 0
+    api_time: float = 0.0
+
+    @property
+    def start_lag(self) -> Optional[float]:
+        if self.scheduled_at is None:
+            return None
+        return (self.started_at - self.scheduled_at).total_seconds()
+
+
+def get_current_run() -> Optional[JobRunStats]:
+    return _current_run.get()
+
+
+def add_rows_scanned(count: int) -> None:
+    """Учитывает строки, загруженные задачей из БД"""
+    run = _current_run.get()
+    if run is not None:
+        run.rows_scanned += count
+
+
+async def send_message(bot: Bot, **kwargs):
+    """bot.send_message с подсчётом отправок и времени Bot API в текущем запуске"""
+    run = _current_run.get()
+    if run is None:
+        return await bot.send_message(**kwargs)
+
+    run.messages_attempted += 1
+    started = time.perf_counter()
+    try:
+        message = await bot.send_message(**kwargs)
+    except Exception:
+        run.messages_failed += 1
+        raise
+    finally:
+        run.api_time += time.perf_counter() - started
+
+    run.messages_sent += 1
+    return message
+
+
+def _on_job_submitted(event: JobSubmissionEvent) -> None:
+    if event.scheduled_run_times:
+        _scheduled_times[event.job_id] = event.scheduled_run_times[-1]
+
+
+def install_job_telemetry(scheduler) -> None:
+    """Подписывается на события планировщика, чтобы знать плановое время запусков"""
+    scheduler.add_listener(_on_job_submitted, EVENT_JOB_SUBMITTED)
+
+
+def _export(run: JobRunStats, queries: QueryStats, duration: float, status: str) -> None:
+    job = run.job_id
+    JOB_RUNS.inc(job=job, status=status)
+    JOB_DURATION.observe(duration, job=job)
+    if run.start_lag is not None:
+        JOB_START_LAG.set(run.start_lag, job=job)
+    JOB_ROWS_SCANNED.inc(run.rows_scanned, job=job)
+    JOB_MESSAGES.inc(run.messages_sent, job=job, result="sent")
+    JOB_MESSAGES.inc(run.messages_failed, job=job, result="failed")
+    JOB_QUERIES.inc(queries.count, job=job)
+    JOB_DB_TIME.inc(queries.total_time, job=job)
+    JOB_API_TIME.inc(run.api_time, job=job)
+
+    logger.info(
+        "job=%s status=%s duration=%.3fs lag=%s rows=%d attempted=%d sent=%d failed=%d "
+        "queries=%d db=%.3fs api=%.3fs",
+        job, status, duration,
+        f"{run.start_lag:.3f}s" if run.start_lag is not None else "-",
+        run.rows_scanned, run.messages_attempted, run.messages_sent, run.messages_failed,
+        queries.count, queries.total_time, run.api_time,
+    )
+
+
+async def _save(run: JobRunStats, queries: QueryStats, duration: float, status: str, error: Optional[str]) -> None:
+    try:
+        await JobRunDAO.add_run(
+            retention_days=settings.JOB_RUN_RETENTION_DAYS,
+            job_id=run.job_id,
+            status=status,
+            error=error,
+            scheduled_at=run.scheduled_at,
+            started_at=run.started_at,
+            start_lag=run.start_lag,
+            duration=duration,
+            rows_scanned=run.rows_scanned,
+            messages_attempted=run.messages_attempted,
+            messages_sent=run.messages_sent,
+            messages_failed=run.messages_failed,
+            queries=queries.count,
+            db_time=queries.total_time,
+            api_time=run.api_time,
+        )
+    except Exception:
+        logger.exception("Failed to save run history for job %s", run.job_id)
+
+
+def tracked_job(job_id: str) -> Callable:
+    """
+    Декоратор задачи планировщика: собирает метрики запуска,
+    логирует ошибки с трейсбеком и пишет запуск в историю job_runs
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            run = JobRunStats(
+                job_id=job_id,
+                started_at=datetime.now(timezone.utc),
+                scheduled_at=_scheduled_times.pop(job_id, None),
+            )
+            token = _current_run.set(run)
+            started = time.perf_counter()
+            status, error = "ok", None
+
+            try:
+                with query_scope(job_id, n_plus_one_threshold=settings.QUERY_N_PLUS_ONE_THRESHOLD) as queries, \
+                        consistency_scope():
+                    await func(*args, **kwargs)
+            except Exception as e:
+                status, error = "failed", repr(e)
+                logger.exception("Job %s failed", job_id)
+            finally:
+                _current_run.reset(token)
+
+            duration = time.perf_counter() - started
+            _export(run, queries, duration, status)
+            await _save(run, queries, duration, status, error)
+        return wrapper
+    return decorator
@@ -0,0 +1,276 @@
+"""
+Тексты задач: строка списка, карточка задачи, чек-лист и сообщение о создании.
+
+Пользовательские поля экранируются здесь один раз. Готовые фрагменты кэшируются
+по (task.id, updated_at): updated_at меняется при любом изменении задачи,
+поэтому неизменённая задача повторно не рендерится. В ключ входит и текущая дата —
+от неё зависят пометки «Сегодня» и «Просрочена».
+"""
+from collections import OrderedDict
+from datetime import date
+from html import escape
+from typing import Callable, Hashable, Optional
+
+from app.config import settings
+from app.database.enums import TaskStatus, TaskView
+from app.utils.recurrence import Recurrence
+
+STATUS_ICONS = {
+    TaskStatus.PENDING: "⏳",
+    TaskStatus.IN_PROGRESS: "🔄",
+    TaskStatus.COMPLETED: "✅",
+    TaskStatus.CANCELLED: "❌",
+}
+
+STATUS_NAMES = {
+    TaskStatus.PENDING: "⏳ Ожидает",
+    TaskStatus.IN_PROGRESS: "🔄 В работе",
+    TaskStatus.COMPLETED: "✅ Выполнена",
+    TaskStatus.CANCELLED: "❌ Отменена",
+}
+
+TASKS_HEADER = "📋 <b>Ваши задачи:</b>\n\n"
+SEARCH_HEADER = "🔍 <b>Поиск:</b> {query}\n\n"
+SEARCH_NOTHING_FOUND = "🔍 По запросу <b>{query}</b> ничего не найдено."
+TASK_LINE = "{icon} <b>{title}</b>{due}{progress}\n   Приоритет: {priority}/10\n\n"
+TASK_LINE_PROGRESS = " ☑️ {done}/{total}"
+PAGE_FOOTER = "\nСтраница {page}/{total_pages}"
+SELECTION_HINT = "☑️ <b>Отметьте задачи</b> — выбрано: {count}\n\n"
+
+VIEW_TITLES = {
+    TaskView.OVERDUE: "🔴 Просроченные задачи",
+    TaskView.TODAY: "📅 Задачи на сегодня",
+    TaskView.HIGH_PRIORITY: "❗ Важные задачи",
+}
+VIEW_HEADER = "<b>{title}</b> ({total})\n\n"
+VIEW_EMPTY = "<b>{title}</b>\n\nЗдесь пока пусто."
+VIEW_FOOTER = "\nПоказано {first}–{last} из {total}"
+ARCHIVE_TITLE = "📦 Архив"
+TAGS_HEADER = "🏷 <b>Ваши теги</b>\n\nДобавьте #тег в название задачи, чтобы она попала в список тега."
+TAGS_EMPTY = "🏷 Тегов пока нет.\n\nДобавьте #тег в название задачи: «Отчёт #работа»."
+
+TASK_DETAIL = (
+    "📋 <b>Детали задачи</b>\n\n"
+    "<b>Название:</b> {title}\n"
+    "<b>Описание:</b>\n{description}\n\n"
+    "<b>Статус:</b> {status}\n"
+    "<b>Приоритет:</b> {stars} ({priority}/10)\n"
+    "<b>Создана:</b> {created_at}\n"
+)
+TASK_DETAIL_DUE = "<b>Срок:</b> {due}\n"
+TASK_DETAIL_COMPLETED = "<b>Завершена:</b> {completed_at}\n"
+TASK_DETAIL_CHECKLIST = "<b>Чек-лист:</b> ☑️ {done}/{total}\n"
+TASK_DETAIL_REPEAT = "<b>Повтор:</b> 🔁 {rule}\n"
+TASK_CREATED_REPEAT = "\n<b>Повтор:</b> 🔁 {rule}"
+
+CHECKLIST_HEADER = "☑️ <b>Чек-лист:</b> {title}\nГотово: {done}/{total}\n\n"
+CHECKLIST_EMPTY = "Пунктов пока нет — добавьте первый кнопкой ниже."
+CHECKLIST_ITEM = "{icon} {title}\n"
+
+TASK_SHARED = "{icon} <b>{title}</b>\nПриоритет: {priority}/10{due}"
+TASK_SHARED_DUE = "\nСрок: {due}"
+TASK_INLINE_DESCRIPTION = "{status} · приоритет {priority}/10{due}"
+
+TASK_CREATED = (
+    "✅ <b>Задача создана!</b>\n\n"
+    "<b>Название:</b> {title}\n"
+    "<b>Описание:</b> {description}\n"
+    "<b>Приоритет:</b> {stars} ({priority}/10)\n"
+    "<b>Срок:</b> {due}\n"
+    "<b>Статус:</b> {status}"
+)
+
+
+class RenderCache:
+    """Ограниченный LRU-кэш отрендеренных фрагментов"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get_or_render(self, key: Hashable, render: Callable[[], str]) -> str:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = self._data[key] = render()
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+render_cache = RenderCache(settings.RENDER_CACHE_SIZE)
+
+
+def _cached(kind: str, task, render: Callable[[], str]) -> str:
+    updated_at = getattr(task, "updated_at", None)
+    # Без updated_at изменение задачи не отследить — рендерим без кэша
+    if updated_at is None:
+        return render()
+    return render_cache.get_or_render((kind, task.id, updated_at, date.today()), render)
+
+
+def _is_overdue(task, today: date) -> bool:
+    return task.due_date.date() < today and task.status != TaskStatus.COMPLETED
+
+
+def _stars(priority: Optional[int]) -> str:
+    return "⭐" * min(priority or 0, 5)
+
+
+def _render_task_line(task) -> str:
+    due = ""
+    if task.due_date:
+        today = date.today()
+        if _is_overdue(task, today):
+            due = " 🔴"
+        elif task.due_date.date() == today:
+            due = " ⚠️"
+        else:
+            due = f" 📅 {task.due_date.strftime('%d.%m')}"
+
+    progress = ""
+    if task.children_total:
+        progress = TASK_LINE_PROGRESS.format(done=task.children_done, total=task.children_total)
+
+    return TASK_LINE.format(
+        icon=STATUS_ICONS.get(task.status, "📝"),
+        title=escape(task.title),
+        due=due,
+        progress=progress,
+        priority=task.priority,
+    )
+
+
+def render_tasks_page(tasks: list, page: int, total_pages: int) -> str:
+    """Текст страницы списка задач"""
+    parts = [TASKS_HEADER]
+    for i, task in enumerate(tasks, 1):
+        parts.append(f"{i}. ")
+        parts.append(_cached("line", task, lambda: _render_task_line(task)))
+    parts.append(PAGE_FOOTER.format(page=page + 1, total_pages=total_pages))
+    return "".join(parts)
+
+
+def view_title(view: TaskView, tag_name: Optional[str] = None) -> str:
+    """Заголовок отфильтрованного списка (без разметки, тег экранируется)"""
+    if view == TaskView.TAG:
+        return f"🏷 #{escape(tag_name or '')}"
+    return VIEW_TITLES[view]
+
+
+def render_task_view(title: str, tasks: list, total: int, offset: int = 0) -> str:
+    """Страница отфильтрованного списка; offset — сколько задач показано на прошлых страницах"""
+    if not tasks:
+        return VIEW_EMPTY.format(title=title)
+    parts = [VIEW_HEADER.format(title=title, total=total)]
+    for i, task in enumerate(tasks, offset + 1):
+        parts.append(f"{i}. ")
+        parts.append(_cached("line", task, lambda: _render_task_line(task)))
+    parts.append(VIEW_FOOTER.format(first=offset + 1, last=offset + len(tasks), total=total))
+    return "".join(parts)
+
+
+def render_search_page(query: str, tasks: list, offset: int = 0) -> str:
+    """Текст страницы результатов поиска; offset — сколько задач показано на прошлых страницах"""
+    if not tasks:
+        return SEARCH_NOTHING_FOUND.format(query=escape(query))
+    parts = [SEARCH_HEADER.format(query=escape(query))]
+    for i, task in enumerate(tasks, offset + 1):
+        parts.append(f"{i}. ")
+        parts.append(_cached("line", task, lambda: _render_task_line(task)))
+    return "".join(parts)
+
+
+def _render_task_detail(task) -> str:
+    text = TASK_DETAIL.format(
+        title=escape(task.title),
+        description=escape(task.description),
+        status=STATUS_NAMES.get(task.status, task.status),
+        stars=_stars(task.priority),
+        priority=task.priority,
+        created_at=task.created_at.strftime('%d.%m.%Y %H:%M'),
+    )
+
+    if task.due_date:
+        due = task.due_date.strftime('%d.%m.%Y')
+        today = date.today()
+        if _is_overdue(task, today):
+            due += " 🔴 Просрочена!"
+        elif task.due_date.date() == today:
+            due += " ⚠️ Сегодня!"
+        text += TASK_DETAIL_DUE.format(due=due)
+
+    if task.children_total:
+        text += TASK_DETAIL_CHECKLIST.format(done=task.children_done, total=task.children_total)
+
+    rule = Recurrence.of(task)
+    if rule:
+        text += TASK_DETAIL_REPEAT.format(rule=rule.describe())
+
+    if task.completed_at:
+        text += TASK_DETAIL_COMPLETED.format(completed_at=task.completed_at.strftime('%d.%m.%Y %H:%M'))
+
+    return text
+
+
+def render_task_detail(task) -> str:
+    """Текст карточки задачи"""
+    return _cached("detail", task, lambda: _render_task_detail(task))
+
+
+def render_checklist(task, items: list) -> str:
+    """Текст чек-листа задачи; счётчики — из задачи"""
+    parts = [CHECKLIST_HEADER.format(title=escape(task.title), done=task.children_done, total=task.children_total)]
+    if not items:
+        parts.append(CHECKLIST_EMPTY)
+    for item in items:
+        parts.append(CHECKLIST_ITEM.format(icon="✅" if item.done else "⬜", title=escape(item.title)))
+    return "".join(parts)
+
+
+def render_task_created(task) -> str:
+    """Текст сообщения о созданной задаче (без блока достижений)"""
+    text = TASK_CREATED.format(
+        title=escape(task.title),
+        description=escape(task.description),
+        stars=_stars(task.priority),
+        priority=task.priority,
+        due=task.due_date.strftime('%d.%m.%Y') if task.due_date else "Не установлен",
+        status=STATUS_NAMES.get(task.status, task.status),
+    )
+    rule = Recurrence.of(task)
+    if rule:
+        text += TASK_CREATED_REPEAT.format(rule=rule.describe())
+    return text
+
+
+def render_task_shared(task) -> str:
+    """Текст задачи, отправленной в чат через инлайн-режим"""
+    return _cached("shared", task, lambda: TASK_SHARED.format(
+        icon=STATUS_ICONS.get(task.status, "📝"),
+        title=escape(task.title),
+        priority=task.priority,
+        due=TASK_SHARED_DUE.format(due=task.due_date.strftime('%d.%m.%Y')) if task.due_date else "",
+    ))
+
+
+def render_task_inline_description(task) -> str:
+    """Подпись под названием задачи в списке инлайн-результатов (без разметки)"""
+    return TASK_INLINE_DESCRIPTION.format(
+        status=STATUS_NAMES.get(task.status, task.status),
+        priority=task.priority,
+        due=f" · до {task.due_date.strftime('%d.%m')}" if task.due_date else "",
+    )
@@ -0,0 +1,196 @@
+"""
+Компактный формат callback_data.
+
+Строка состоит из короткого кода действия и целочисленных аргументов в base36
+через двоеточие: «t:2s» — карточка задачи 100, «p:1» — вторая страница списка.
+Имена аргументов задаёт ACTION_ARGS, хендлер получает их именованными параметрами.
+Моменты времени (курсоры пагинации) передаются микросекундами от эпохи — pack_timestamp().
+
+Кнопки в уже отправленных сообщениях несут старый формат («task_100», «edit_title_5»,
+«show_leaderboard»); unpack() понимает и его.
+"""
+from datetime import datetime, timedelta, timezone
+from enum import Enum, IntEnum
+from typing import Any, Dict, NamedTuple, Tuple
+
+SEPARATOR = ":"
+_BASE36_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class Action(str, Enum):
+    # Задачи
+    TASK = "t"
+    PAGE = "p"
+    DONE = "d"
+    PROGRESS = "w"
+    EDIT = "e"
+    EDIT_TITLE = "et"
+    EDIT_DESC = "ed"
+    EDIT_PRIORITY = "ep"
+    EDIT_DUE = "eu"
+    DELETE = "x"
+    CONFIRM_DELETE = "xc"
+    BACK_TO_LIST = "l"
+    SEARCH_MORE = "q"
+    VIEW = "v"
+    TAGS = "tg"
+    ARCHIVE = "ar"
+    # Выбор нескольких задач и действия над ними
+    SELECT = "m"
+    SELECT_TOGGLE = "mt"
+    BULK = "mb"
+    BULK_PRIORITY = "mp"
+    BULK_DUE = "md"
+    # Чек-лист
+    CHECKLIST = "c"
+    CHECK_TOGGLE = "ct"
+    CHECK_ADD = "ca"
+    CHECK_CLEAR = "cx"
+    # Профиль
+    PROFILE = "pf"
+    ACHIEVEMENTS = "pa"
+    LEADERBOARD = "pl"
+    DETAILED_STATS = "ps"
+    # Настройки
+    TOGGLE_REMINDERS = "sr"
+    CHANGE_REMINDER_TIME = "st"
+    CLOSE_SETTINGS = "sc"
+
+
+class BulkOp(IntEnum):
+    """Аргумент op действия BULK"""
+    COMPLETE = 1
+    DELETE = 2
+    CONFIRM_DELETE = 3
+    PRIORITY = 4
+    RESCHEDULE = 5
+    BACK = 6
+    CANCEL = 7
+
+
+# Имена аргументов каждого действия, в порядке упаковки
+ACTION_ARGS: Dict[Action, Tuple[str, ...]] = {
+    Action.TASK: ("task_id",),
+    Action.PAGE: ("page",),
+    Action.DONE: ("task_id",),
+    Action.PROGRESS: ("task_id",),
+    Action.EDIT: ("task_id",),
+    Action.EDIT_TITLE: ("task_id",),
+    Action.EDIT_DESC: ("task_id",),
+    Action.EDIT_PRIORITY: ("task_id",),
+    Action.EDIT_DUE: ("task_id",),
+    Action.DELETE: ("task_id",),
+    Action.CONFIRM_DELETE: ("task_id",),
+    Action.SEARCH_MORE: ("after_rank", "after_id"),
+    # after_created = 0 — первая страница
+    Action.VIEW: ("view", "tag_id", "shown", "after_created", "after_id"),
+    Action.ARCHIVE: ("shown", "after_finished", "after_id"),
+    Action.SELECT: ("page",),
+    Action.SELECT_TOGGLE: ("task_id",),
+    Action.BULK: ("op",),
+    Action.BULK_PRIORITY: ("priority",),
+    Action.BULK_DUE: ("preset",),
+    Action.CHECKLIST: ("task_id",),
+    Action.CHECK_TOGGLE: ("item_id",),
+    Action.CHECK_ADD: ("task_id",),
+    Action.CHECK_CLEAR: ("task_id",),
+}
+
+# Старый формат: точные строки и префиксы перед последним «_<число>»
+LEGACY_EXACT: Dict[str, Action] = {
+    "back_to_list": Action.BACK_TO_LIST,
+    "back_to_profile": Action.PROFILE,
+    "show_achievements": Action.ACHIEVEMENTS,
+    "show_leaderboard": Action.LEADERBOARD,
+    "detailed_stats": Action.DETAILED_STATS,
+    "toggle_reminders": Action.TOGGLE_REMINDERS,
+    "change_reminder_time": Action.CHANGE_REMINDER_TIME,
+    "close_settings": Action.CLOSE_SETTINGS,
+}
+
+LEGACY_PREFIXES: Dict[str, Action] = {
+    "task": Action.TASK,
+    "page": Action.PAGE,
+    "done": Action.DONE,
+    "progress": Action.PROGRESS,
+    "edit": Action.EDIT,
+    "edit_title": Action.EDIT_TITLE,
+    "edit_desc": Action.EDIT_DESC,
+    "edit_priority": Action.EDIT_PRIORITY,
+    "edit_due": Action.EDIT_DUE,
+    "delete": Action.DELETE,
+    "confirm_delete": Action.CONFIRM_DELETE,
+}
+
+
+class CallbackData(NamedTuple):
+    action: Action
+    args: Tuple[int, ...] = ()
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        """Аргументы по именам из ACTION_ARGS"""
+        return dict(zip(ACTION_ARGS.get(self.action, ()), self.args))
+
+
+def _to_base36(value: int) -> str:
+    if value < 0:
+        raise ValueError(f"Callback arguments must be non-negative, got {value}")
+    if value < 36:
+        return _BASE36_DIGITS[value]
+    digits = []
+    while value:
+        value, rem = divmod(value, 36)
+        digits.append(_BASE36_DIGITS[rem])
+    return "".join(reversed(digits))
+
+
+def pack(action: Action, *args: int) -> str:
+    """Упаковывает действие и его аргументы в callback_data"""
+    expected = len(ACTION_ARGS.get(action, ()))
+    if len(args) != expected:
+        raise ValueError(f"{action.name} expects {expected} argument(s), got {len(args)}")
+    if not args:
+        return action.value
+    return SEPARATOR.join((action.value, *map(_to_base36, args)))
+
+
+def pack_timestamp(value: datetime) -> int:
+    """Момент времени как неотрицательное целое для pack()"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def unpack_timestamp(value: int) -> datetime:
+    return _EPOCH + value * _MICROSECOND
+
+
+def _check_arity(action: Action, args: Tuple[int, ...], data: str) -> CallbackData:
+    if len(args) != len(ACTION_ARGS.get(action, ())):
+        raise ValueError(f"Wrong number of arguments in callback data {data!r}")
+    return CallbackData(action, args)
+
+
+def _unpack_legacy(data: str) -> CallbackData:
+    action = LEGACY_EXACT.get(data)
+    if action is not None:
+        return CallbackData(action)
+
+    prefix, _, number = data.rpartition("_")
+    action = LEGACY_PREFIXES.get(prefix)
+    if action is None or not number.isdigit():
+        raise ValueError(f"Unknown callback data {data!r}")
+    return _check_arity(action, (int(number),), data)
+
+
+def unpack(data: str) -> CallbackData:
+    """Разбирает callback_data; ValueError — если строка не наша"""
+    code, _, packed = data.partition(SEPARATOR)
+    action = Action._value2member_map_.get(code)
+    if action is None:
+        return _unpack_legacy(data)
+    args = tuple(int(part, 36) for part in packed.split(SEPARATOR)) if packed else ()
+    return _check_arity(action, args, data)
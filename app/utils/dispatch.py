@@ -0,0 +1,106 @@
+"""
+Роутеры с выбором хендлера одним поиском в словаре.
+
+Вместо цепочки фильтров на каждый хендлер такой роутер регистрирует в aiogram
+один фильтр, который находит хендлер по ключу: ActionRouter — по коду действия
+из callback_data, MenuRouter — по точному тексту кнопки reply-клавиатуры.
+Хендлер получает обычные аргументы (state, bot и т.д.), лишние aiogram
+отбрасывает по сигнатуре. Найденный хендлер кладётся в данные апдейта
+(resolved_handler) — по нему мидлвари узнают настоящее имя, а не _dispatch.
+"""
+from typing import Any, Callable, Dict, Optional, Union
+
+from aiogram import Router
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message
+
+from app.utils.callback_data import CallbackData, unpack
+
+# Ключ данных апдейта с хендлером, найденным ActionRouter или MenuRouter
+RESOLVED_HANDLER = "resolved_handler"
+
+
+def handler_name(data: Dict[str, Any]) -> Optional[str]:
+    """Имя хендлера апдейта: найденного по ключу, иначе зарегистрированного в aiogram"""
+    handler = data.get(RESOLVED_HANDLER) or data.get("handler")
+    return handler.callback.__name__ if handler else None
+
+
+class ActionRouter(Router):
+    """Callback-запросы; аргументы из callback_data приходят в хендлер именованными параметрами"""
+
+    def __init__(self, *, name: str | None = None, decoder: Callable[[str], CallbackData] = unpack) -> None:
+        super().__init__(name=name)
+        self._decoder = decoder
+        self._handlers: Dict[str, CallableObject] = {}
+        self.callback_query.register(self._dispatch, self._match)
+
+    def action(self, action: str) -> Callable:
+        """Декоратор: регистрирует хендлер действия"""
+        def decorator(callback: Callable) -> Callable:
+            if action in self._handlers:
+                raise ValueError(f"Handler for action {action!r} is already registered")
+            self._handlers[action] = CallableObject(callback)
+            return callback
+        return decorator
+
+    async def _match(self, callback: CallbackQuery) -> Union[bool, Dict[str, Any]]:
+        if not callback.data:
+            return False
+        try:
+            callback_data = self._decoder(callback.data)
+        except ValueError:
+            return False
+        handler = self._handlers.get(callback_data.action)
+        if handler is None:
+            return False
+        return {"callback_data": callback_data, RESOLVED_HANDLER: handler}
+
+    async def _dispatch(
+            self,
+            callback: CallbackQuery,
+            callback_data: CallbackData,
+            resolved_handler: CallableObject,
+            **kwargs: Any,
+    ) -> Any:
+        return await resolved_handler.call(callback, callback_data=callback_data, **callback_data.kwargs, **kwargs)
+
+
+class MenuRouter(Router):
+    """
+    Кнопки reply-клавиатуры по точному тексту сообщения.
+    Подключается первым: кнопка меню срабатывает в любом состоянии FSM
+    и сбрасывает незаконченный сценарий
+    """
+
+    def __init__(self, *, name: str | None = None) -> None:
+        super().__init__(name=name)
+        self._handlers: Dict[str, CallableObject] = {}
+        self.message.register(self._dispatch, self._match)
+
+    def command(self, text: str) -> Callable:
+        """Декоратор: регистрирует хендлер кнопки с текстом text"""
+        def decorator(callback: Callable) -> Callable:
+            if text in self._handlers:
+                raise ValueError(f"Handler for menu button {text!r} is already registered")
+            self._handlers[text] = CallableObject(callback)
+            return callback
+        return decorator
+
+    async def _match(self, message: Message) -> Union[bool, Dict[str, Any]]:
+        handler = self._handlers.get(message.text)
+        if handler is None:
+            return False
+        return {RESOLVED_HANDLER: handler}
+
+    async def _dispatch(
+            self,
+            message: Message,
+            resolved_handler: CallableObject,
+            state: Optional[FSMContext] = None,
+            **kwargs: Any,
+    ) -> Any:
+        if state is not None and await state.get_state() is not None:
+            await state.clear()
+        return await resolved_handler.call(message, state=state, **kwargs)
@@ -0,0 +1,78 @@
+"""
+Пропуск редактирований, которые ничего не меняют.
+
+Для каждого сообщения запоминается хэш последнего отправленного текста,
+parse_mode и клавиатуры. Повторное нажатие той же кнопки даёт тот же хэш —
+запрос к Bot API не делается вообще, вместо ответа «message is not modified».
+
+Кэш живёт в памяти процесса, поэтому все edit_text в боте должны идти через
+edit_text() отсюда: правка в обход кэша оставит в нём устаревший хэш.
+"""
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from aiogram import types
+from aiogram.exceptions import TelegramBadRequest
+
+from app.config import settings
+from app.utils.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+EDITS = counter("telegram_message_edits_total", "edit_text calls by result", ["result"])
+
+MessageKey = Tuple[int, int]
+
+_last_render: "OrderedDict[MessageKey, int]" = OrderedDict()
+
+
+def _render_hash(text: str, parse_mode: Optional[str], reply_markup: Optional[types.InlineKeyboardMarkup]) -> int:
+    markup = reply_markup.model_dump(warnings=False) if reply_markup is not None else None
+    return hash((text, parse_mode, repr(markup)))
+
+
+def _remember(key: MessageKey, render_hash: int) -> None:
+    _last_render[key] = render_hash
+    _last_render.move_to_end(key)
+    if len(_last_render) > settings.EDIT_CACHE_SIZE:
+        _last_render.popitem(last=False)
+
+
+def forget(message: types.Message) -> None:
+    """Сбрасывает запомненное состояние сообщения"""
+    _last_render.pop((message.chat.id, message.message_id), None)
+
+
+async def edit_text(
+        message: types.Message,
+        text: str,
+        parse_mode: Optional[str] = None,
+        reply_markup: Optional[types.InlineKeyboardMarkup] = None,
+) -> bool:
+    """
+    Редактирует сообщение, если текст или клавиатура изменились.
+    Возвращает True, если запрос к Bot API был отправлен
+    """
+    key = (message.chat.id, message.message_id)
+    render_hash = _render_hash(text, parse_mode, reply_markup)
+
+    if _last_render.get(key) == render_hash:
+        _last_render.move_to_end(key)
+        EDITS.inc(result="skipped")
+        return False
+
+    try:
+        await message.edit_text(text, parse_mode=parse_mode, reply_markup=reply_markup)
+    except TelegramBadRequest as e:
+        # Кэш мог быть пуст (перезапуск) — Telegram сам сообщит, что менять нечего
+        if "message is not modified" not in e.message:
+            forget(message)
+            raise
+        EDITS.inc(result="not_modified")
+        logger.debug("Message %s in chat %s is not modified", message.message_id, message.chat.id)
+    else:
+        EDITS.inc(result="sent")
+
+    _remember(key, render_hash)
+    return True
@@ -0,0 +1,131 @@
+"""
+Правила повторения задач.
+
+У повторяющейся задачи в базе хранится только ближайшее вхождение. Следующее
+создаёт TaskDAO.transition в той же транзакции, в которой выполнено текущее.
+Вхождения, срок которых прошёл без выполнения, раз в сутки отменяет
+TaskDAO.roll_forward_missed и одним INSERT создаёт им замену.
+"""
+import calendar
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+from app.database.enums import RecurrenceKind
+
+WEEKDAY_NAMES = ("пн", "вт", "ср", "чт", "пт", "сб", "вс")
+WORKDAYS = 0b0011111
+
+# Варианты на кнопках шага «Повтор» при создании задачи
+REPEAT_NONE = "Не повторять"
+REPEAT_DAILY = "Каждый день"
+REPEAT_WORKDAYS = "По будням"
+REPEAT_WEEKLY = "Каждую неделю"
+REPEAT_MONTHLY = "Каждый месяц"
+
+_EVERY_N_DAYS_RE = re.compile(r"каждые\s+(\d+)\s+(?:день|дня|дней)")
+_WEEKDAY_RE = re.compile(r"[а-я]+")
+
+
+class Recurrence(NamedTuple):
+    kind: RecurrenceKind
+    interval: int = 1
+    weekdays: int = 0
+
+    @classmethod
+    def of(cls, task) -> Optional["Recurrence"]:
+        """Правило задачи (ORM-объекта или строки с колонками recurrence_*); None — не повторяется"""
+        if task.recurrence is None:
+            return None
+        return cls(task.recurrence, task.recurrence_interval or 1, task.recurrence_weekdays or 0)
+
+    def columns(self) -> dict:
+        """Значения колонок Task для этого правила"""
+        return {
+            "recurrence": self.kind,
+            "recurrence_interval": self.interval if self.kind == RecurrenceKind.EVERY_N_DAYS else None,
+            "recurrence_weekdays": self.weekdays if self.kind == RecurrenceKind.WEEKLY else None,
+        }
+
+    def next_after(self, due: datetime, not_before: datetime) -> datetime:
+        """
+        Первое вхождение позже due и не раньше not_before; время суток сохраняется.
+        Наивные datetime считаются UTC
+        """
+        if due.tzinfo is None:
+            due = due.replace(tzinfo=timezone.utc)
+        if not_before.tzinfo is None:
+            not_before = not_before.replace(tzinfo=timezone.utc)
+
+        if self.kind == RecurrenceKind.MONTHLY:
+            months = 1
+            while (candidate := _add_months(due, months)) < not_before:
+                months += 1
+            return candidate
+
+        if self.kind == RecurrenceKind.WEEKLY:
+            weekdays = self.weekdays or 1 << due.weekday()
+            candidate = due + timedelta(days=1)
+            if candidate < not_before:
+                candidate += timedelta(days=-(-(not_before - candidate) // timedelta(days=1)))
+            while not weekdays & 1 << candidate.weekday():
+                candidate += timedelta(days=1)
+            return candidate
+
+        step = timedelta(days=self.interval if self.kind == RecurrenceKind.EVERY_N_DAYS else 1)
+        steps = max(1, -(-(not_before - due) // step))
+        return due + step * steps
+
+    def describe(self) -> str:
+        """Правило словами: «каждый день», «по пн, ср», «каждые 3 дня»"""
+        if self.kind == RecurrenceKind.DAILY:
+            return "каждый день"
+        if self.kind == RecurrenceKind.MONTHLY:
+            return "каждый месяц"
+        if self.kind == RecurrenceKind.EVERY_N_DAYS:
+            return f"каждые {self.interval} дн."
+        if self.weekdays == WORKDAYS:
+            return "по будням"
+        days = [name for i, name in enumerate(WEEKDAY_NAMES) if self.weekdays & 1 << i]
+        return "по " + ", ".join(days) if days else "каждую неделю"
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    # 31-е число в коротком месяце становится последним днём месяца
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1]))
+
+
+def parse_recurrence(text: str, due: date) -> Optional[Recurrence]:
+    """
+    Правило из ответа пользователя: вариант с кнопки, «каждые N дней»
+    или дни недели («пн ср пт»). None — не повторять; ValueError — не понято
+    """
+    text = text.strip().lower()
+    if text == REPEAT_NONE.lower():
+        return None
+    if text == REPEAT_DAILY.lower():
+        return Recurrence(RecurrenceKind.DAILY)
+    if text == REPEAT_WORKDAYS.lower():
+        return Recurrence(RecurrenceKind.WEEKLY, weekdays=WORKDAYS)
+    if text == REPEAT_WEEKLY.lower():
+        return Recurrence(RecurrenceKind.WEEKLY, weekdays=1 << due.weekday())
+    if text == REPEAT_MONTHLY.lower():
+        return Recurrence(RecurrenceKind.MONTHLY)
+
+    match = _EVERY_N_DAYS_RE.fullmatch(text)
+    if match:
+        interval = int(match.group(1))
+        if not 1 <= interval <= 365:
+            raise ValueError("Interval must be between 1 and 365 days")
+        return Recurrence(RecurrenceKind.EVERY_N_DAYS, interval=interval)
+
+    weekdays = 0
+    for word in _WEEKDAY_RE.findall(text):
+        if word not in WEEKDAY_NAMES:
+            raise ValueError(f"Unknown recurrence {text!r}")
+        weekdays |= 1 << WEEKDAY_NAMES.index(word)
+    if not weekdays:
+        raise ValueError(f"Unknown recurrence {text!r}")
+    return Recurrence(RecurrenceKind.WEEKLY, weekdays=weekdays)
@@ -0,0 +1,14 @@
+"""Теги задач: слова с «#» в названии («Купить молоко #дом»)."""
+import re
+from typing import List
+
+TAG_MAX_LENGTH = 32
+TAGS_PER_TASK = 10
+
+_TAG_RE = re.compile(r"#(\w+)")
+
+
+def extract_tags(text: str) -> List[str]:
+    """Теги в порядке появления, без повторов: нижний регистр, без «#», не длиннее TAG_MAX_LENGTH"""
+    tags = dict.fromkeys(match[:TAG_MAX_LENGTH].lower() for match in _TAG_RE.findall(text))
+    return list(tags)[:TAGS_PER_TASK]
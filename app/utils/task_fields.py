@@ -0,0 +1,21 @@
+"""Правила полей задачи — общие для пошагового создания и загрузки из файла."""
+from datetime import date, datetime
+
+TITLE_MAX_LENGTH = 100
+DESCRIPTION_MAX_LENGTH = 500
+PRIORITY_MIN = 1
+PRIORITY_MAX = 10
+DUE_DATE_FORMAT = "%d.%m.%Y"
+
+
+def parse_priority(text: str) -> int:
+    """Приоритет из текста; ValueError — не число или вне PRIORITY_MIN..PRIORITY_MAX"""
+    priority = int(text)
+    if not PRIORITY_MIN <= priority <= PRIORITY_MAX:
+        raise ValueError(f"Priority must be between {PRIORITY_MIN} and {PRIORITY_MAX}")
+    return priority
+
+
+def parse_due_date(text: str) -> date:
+    """Срок в формате ДД.ММ.ГГГГ; ValueError — другой формат"""
+    return datetime.strptime(text, DUE_DATE_FORMAT).date()
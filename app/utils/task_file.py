@@ -0,0 +1,156 @@
+"""
+Файлы задач: выгрузка /export и загрузка задач из файла.
+
+Форматы — CSV (UTF-8 с BOM, чтобы Excel узнал кодировку) и JSON Lines,
+по объекту задачи на строку. Поля одинаковые, срок — ДД.ММ.ГГГГ, как при
+создании задачи, поэтому выгруженный файл можно загрузить обратно.
+"""
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import IO, AsyncGenerator, AsyncIterator, Iterable, Iterator, Optional, Tuple
+
+from aiogram.types import InputFile
+
+from app.utils.task_fields import (
+    DESCRIPTION_MAX_LENGTH,
+    DUE_DATE_FORMAT,
+    PRIORITY_MAX,
+    PRIORITY_MIN,
+    TITLE_MAX_LENGTH,
+    parse_due_date,
+    parse_priority,
+)
+
+EXPORT_FORMATS = ("csv", "jsonl")
+IMPORT_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl"}
+FIELDS = ("id", "title", "description", "status", "priority", "due_date", "created_at", "completed_at", "archived")
+
+
+def _record(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "status": row.status.value,
+        "priority": row.priority,
+        "due_date": row.due_date.strftime(DUE_DATE_FORMAT) if row.due_date else None,
+        "created_at": row.created_at.isoformat(),
+        "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+        "archived": row.archived,
+    }
+
+
+def encode_rows(rows: Iterable, fmt: str) -> bytes:
+    """Пачка строк выгрузки в байтах файла (без заголовка)"""
+    if fmt == "jsonl":
+        return "".join(json.dumps(_record(row), ensure_ascii=False) + "\n" for row in rows).encode()
+
+    buffer = io.StringIO()
+    csv.DictWriter(buffer, FIELDS).writerows(map(_record, rows))
+    return buffer.getvalue().encode()
+
+
+async def write_export(file: IO[bytes], chunks: AsyncIterator[list], fmt: str) -> int:
+    """Пишет выгрузку в file пачка за пачкой; возвращает число задач"""
+    if fmt == "csv":
+        file.write(("\ufeff" + ",".join(FIELDS) + "\r\n").encode())
+
+    count = 0
+    async for rows in chunks:
+        file.write(encode_rows(rows, fmt))
+        count += len(rows)
+    return count
+
+
+class SpooledInputFile(InputFile):
+    """Документ для отправки из открытого файла (SpooledTemporaryFile) — по кускам, без чтения целиком"""
+
+    def __init__(self, file: IO[bytes], filename: str, chunk_size: int = 64 * 1024):
+        super().__init__(filename=filename, chunk_size=chunk_size)
+        self.file = file
+
+    async def read(self, bot) -> AsyncGenerator[bytes, None]:
+        self.file.seek(0)
+        while chunk := self.file.read(self.chunk_size):
+            yield chunk
+
+
+def import_format(filename: Optional[str]) -> Optional[str]:
+    """Формат загружаемого файла по расширению; None — не поддерживается"""
+    return IMPORT_EXTENSIONS.get(os.path.splitext(filename or "")[1].lower())
+
+
+def _task_values(record: dict) -> dict:
+    """
+    Колонки новой задачи из записи файла по правилам пошагового создания.
+    ValueError — запись не подходит, текст ошибки показывается пользователю
+    """
+    title = str(record.get("title") or "").strip()
+    if not title:
+        raise ValueError("нет названия")
+    if len(title) > TITLE_MAX_LENGTH:
+        raise ValueError(f"название длиннее {TITLE_MAX_LENGTH} символов")
+
+    description = str(record.get("description") or "").strip()
+    if len(description) > DESCRIPTION_MAX_LENGTH:
+        raise ValueError(f"описание длиннее {DESCRIPTION_MAX_LENGTH} символов")
+
+    # Выгрузка /export содержит и завершённые задачи — заново их не создаём
+    if str(record.get("status") or "").strip().lower() in ("completed", "cancelled"):
+        raise ValueError("задача уже завершена")
+
+    priority = PRIORITY_MIN
+    if record.get("priority") not in (None, ""):
+        try:
+            priority = parse_priority(str(record["priority"]).strip())
+        except ValueError:
+            raise ValueError(f"приоритет — не число от {PRIORITY_MIN} до {PRIORITY_MAX}") from None
+
+    due_date = None
+    if record.get("due_date"):
+        try:
+            due_date = datetime.combine(parse_due_date(str(record["due_date"]).strip()), datetime.min.time())
+        except ValueError:
+            raise ValueError("срок не в формате ДД.ММ.ГГГГ") from None
+
+    return {"title": title, "description": description, "priority": priority, "due_date": due_date}
+
+
+def _records(text: IO[str], fmt: str) -> Iterator[Tuple[int, object]]:
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_no, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError:
+            yield line_no, None
+
+
+def read_tasks(file: IO[bytes], fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Задачи загруженного файла по одной, без чтения файла целиком:
+    (номер строки, колонки задачи, None) или (номер строки, None, причина ошибки).
+    UnicodeDecodeError — файл не в UTF-8
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        for line_no, record in _records(text, fmt):
+            if not isinstance(record, dict):
+                yield line_no, None, "не удалось разобрать строку"
+                continue
+            try:
+                yield line_no, _task_values(record), None
+            except ValueError as e:
+                yield line_no, None, str(e)
+    finally:
+        # Файл закрывает вызывающий код
+        text.detach()
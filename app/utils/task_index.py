@@ -0,0 +1,123 @@
+"""
+Индекс открытых задач для инлайн-режима.
+
+Инлайн-запрос приходит на каждое нажатие клавиши, поэтому задачи пользователя
+загружаются из БД один раз и держатся в памяти: отсортированный список слов
+названий, поиск по префиксу — двоичным поиском. Индекс сбрасывается, когда
+задачи пользователя меняются (TaskDAO вызывает invalidate после коммита),
+и в любом случае живёт не дольше ttl секунд — на случай записи из другого процесса.
+"""
+import re
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.config import settings
+from app.utils.metrics import counter
+
+INDEX_LOOKUPS = counter("inline_task_index_lookups_total", "Inline task index lookups by result", ["result"])
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_words(text: str) -> List[str]:
+    """Слова в нижнем регистре, «ё» приравнена к «е»"""
+    return _WORD_RE.findall(text.casefold().replace("ё", "е"))
+
+
+class UserTaskIndex:
+    """Открытые задачи одного пользователя с поиском по префиксам слов названия"""
+    __slots__ = ("tasks", "loaded_at", "_words", "_task_ids")
+
+    def __init__(self, tasks: Sequence, loaded_at: float) -> None:
+        # Порядок задач из DAO сохраняется в выдаче
+        self.tasks = {task.id: task for task in tasks}
+        self.loaded_at = loaded_at
+        pairs = sorted({(word, task.id) for task in tasks for word in normalize_words(task.title)})
+        self._words = [word for word, _ in pairs]
+        self._task_ids = [task_id for _, task_id in pairs]
+
+    def _with_prefix(self, prefix: str) -> set:
+        start = bisect_left(self._words, prefix)
+        end = bisect_left(self._words, prefix + "\U0010ffff", start)
+        return set(self._task_ids[start:end])
+
+    def search(self, query: str, limit: int) -> List:
+        """Задачи, в названии которых на каждое слово запроса есть слово с таким началом"""
+        matched = None
+        for prefix in normalize_words(query):
+            ids = self._with_prefix(prefix)
+            matched = ids if matched is None else matched & ids
+            if not matched:
+                return []
+
+        tasks = self.tasks.values() if matched is None else (t for t in self.tasks.values() if t.id in matched)
+        result = []
+        for task in tasks:
+            result.append(task)
+            if len(result) >= limit:
+                break
+        return result
+
+
+class TaskIndexCache:
+    """LRU индексов по id пользователя в БД и соответствие Telegram id → id в БД"""
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._indexes: "OrderedDict[int, UserTaskIndex]" = OrderedDict()
+        self._user_ids: "OrderedDict[int, int]" = OrderedDict()
+        # Время последнего сброса: загрузка, начатая раньше него, в кэш не попадёт
+        self._invalidated: Dict[int, float] = {}
+
+    def user_id(self, tg_id: int) -> Optional[int]:
+        user_id = self._user_ids.get(tg_id)
+        if user_id is not None:
+            self._user_ids.move_to_end(tg_id)
+        return user_id
+
+    def remember_user(self, tg_id: int, user_id: int) -> None:
+        self._user_ids[tg_id] = user_id
+        self._user_ids.move_to_end(tg_id)
+        if len(self._user_ids) > self.maxsize:
+            self._user_ids.popitem(last=False)
+
+    def get(self, user_id: int) -> Optional[UserTaskIndex]:
+        index = self._indexes.get(user_id)
+        if index is None or self.clock() - index.loaded_at > self.ttl:
+            INDEX_LOOKUPS.inc(result="miss")
+            return None
+        INDEX_LOOKUPS.inc(result="hit")
+        self._indexes.move_to_end(user_id)
+        return index
+
+    def put(self, user_id: int, tasks: Sequence, loaded_at: float) -> UserTaskIndex:
+        """
+        Строит индекс из задач, загруженных в момент loaded_at (значение clock() до запроса).
+        Если задачи менялись во время загрузки, индекс возвращается, но не кэшируется
+        """
+        index = UserTaskIndex(tasks, loaded_at)
+        if self._invalidated.get(user_id, float("-inf")) >= loaded_at:
+            return index
+
+        self._indexes[user_id] = index
+        self._indexes.move_to_end(user_id)
+        if len(self._indexes) > self.maxsize:
+            self._indexes.popitem(last=False)
+        return index
+
+    def invalidate(self, user_id: int) -> None:
+        """Сбрасывает индекс пользователя после изменения его задач"""
+        now = self.clock()
+        self._indexes.pop(user_id, None)
+        self._invalidated[user_id] = now
+        if len(self._invalidated) > self.maxsize:
+            # Загрузки дольше ttl не бывает — старые отметки больше не нужны
+            horizon = now - self.ttl
+            self._invalidated = {uid: ts for uid, ts in self._invalidated.items() if ts > horizon}
+
+
+task_index = TaskIndexCache(settings.INLINE_INDEX_SIZE, settings.INLINE_INDEX_TTL)
@@ -0,0 +1,94 @@
+"""
+Стоимость выбора callback-хендлера в зависимости от их числа.
+
+Сравниваются два роутера с N пустыми хендлерами:
+  prefix — как раньше, по F.data.startswith(...) на каждый хендлер;
+  action — ActionRouter, один фильтр и поиск хендлера в словаре.
+Апдейты идут через Dispatcher.feed_update с заглушкой Bot API, так что
+в замер входит вся обвязка aiogram. Замеряются первый и последний
+зарегистрированный хендлер: для prefix это лучший и худший случай.
+
+    python -m benchmarks.callback_dispatch --handlers 5 10 25 50 100 200
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from aiogram import Dispatcher, F, Router
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from app.utils.callback_data import CallbackData, SEPARATOR
+from app.utils.dispatch import ActionRouter
+from benchmarks.common import make_stub_bot, time_feed_update, write_results
+
+USER = User(id=1, is_bot=False, first_name="Bench")
+MESSAGE = Message(message_id=1, date=datetime.now(timezone.utc), chat=Chat(id=1, type="private"))
+
+
+async def noop(callback: CallbackQuery) -> None:
+    pass
+
+
+def make_update(data: str) -> Update:
+    return Update(
+        update_id=1,
+        callback_query=CallbackQuery(id="1", from_user=USER, chat_instance="1", message=MESSAGE, data=data),
+    )
+
+
+def prefix_router(count: int) -> Router:
+    router = Router()
+    for i in range(count):
+        router.callback_query.register(noop, F.data.startswith(f"action{i}_"))
+    return router
+
+
+def decode_synthetic(data: str) -> CallbackData:
+    code, _, packed = data.partition(SEPARATOR)
+    return CallbackData(code, (int(packed, 36),))
+
+
+def action_router(count: int) -> Router:
+    router = ActionRouter(decoder=decode_synthetic)
+    for i in range(count):
+        router.action(f"a{i}")(noop)
+    return router
+
+
+async def run(args: argparse.Namespace) -> dict:
+    bot = make_stub_bot()
+    variants: List[tuple[str, Callable[[int], Router], Callable[[int], str]]] = [
+        ("prefix", prefix_router, lambda i: f"action{i}_42"),
+        ("action", action_router, lambda i: f"a{i}{SEPARATOR}16"),
+    ]
+
+    results = {}
+    print(f"{'handlers':>9} {'router':<8}{'first us':>11}{'last us':>11}")
+    for count in args.handlers:
+        for name, build, data in variants:
+            dp = Dispatcher()
+            dp.include_router(build(count))
+            first = await time_feed_update(dp, bot, make_update(data(0)), args.iterations, args.repeat)
+            last = await time_feed_update(dp, bot, make_update(data(count - 1)), args.iterations, args.repeat)
+            results[f"{name}@{count}"] = {"first_us": first, "last_us": last}
+            print(f"{count:>9} {name:<8}{first:>11.1f}{last:>11.1f}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--handlers", type=int, nargs="+", default=[5, 10, 25, 50, 100, 200])
+    parser.add_argument("--iterations", type=int, default=2000, help="апдейтов в одной серии")
+    parser.add_argument("--repeat", type=int, default=5, help="число серий")
+    parser.add_argument("--output", help="куда сохранить JSON с результатами")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = asyncio.run(run(args))
+    write_results(args.output, "callback_dispatch", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Общие утилиты бенчмарков: заглушка сессии Bot API, статистика и JSON-отчёты"""
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import time
+import typing
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import TelegramMethod
+from aiogram.types import Chat, Message
+
+STUB_TOKEN = "123456:BENCHMARK"
+
+
+class StubSession(BaseSession):
+    """
+    Сессия Bot API без сети: запоминает вызванные методы и возвращает
+    правдоподобные ответы. latency — искусственная задержка каждого запроса.
+    """
+
+    def __init__(self, latency: float = 0.0, record: bool = False) -> None:
+        super().__init__()
+        self.latency = latency
+        self.record = record
+        self.calls: Counter = Counter()
+        self.requests: List[TelegramMethod] = []
+        self._message_id = 0
+
+    async def make_request(self, bot: Bot, method: TelegramMethod, timeout: Optional[int] = None) -> Any:
+        self.calls[type(method).__name__] += 1
+        if self.record:
+            self.requests.append(method)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._fake_result(method)
+
+    def _fake_result(self, method: TelegramMethod) -> Any:
+        returning = method.__returning__
+        if returning is bool or bool in typing.get_args(returning):
+            return True
+        if returning is Message:
+            self._message_id += 1
+            return Message(
+                message_id=self._message_id,
+                date=datetime.now(timezone.utc),
+                chat=Chat(id=getattr(method, "chat_id", 0) or 0, type="private"),
+                text=getattr(method, "text", None),
+            )
+        return None
+
+    async def stream_content(self, url: str, headers=None, timeout: int = 30,
+                             chunk_size: int = 65536, raise_for_status: bool = True):
+        yield b""
+
+    async def close(self) -> None:
+        pass
+
+
+def make_stub_bot(latency: float = 0.0, record: bool = False) -> Bot:
+    return Bot(token=STUB_TOKEN, session=StubSession(latency=latency, record=record))
+
+
+async def time_feed_update(dp: Any, bot: Bot, update: Any, iterations: int, repeat: int) -> float:
+    """Медиана времени обработки одного апдейта через dp.feed_update, микросекунды"""
+    for _ in range(max(1, iterations // 10)):
+        await dp.feed_update(bot, update)
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await dp.feed_update(bot, update)
+        samples.append((time.perf_counter() - started) / iterations * 1e6)
+    return statistics.median(samples)
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """Среднее, медиана и перцентили p50/p95/p99 (в миллисекундах для секундных сэмплов)"""
+    if not samples:
+        return {"count": 0}
+    ms = [s * 1000 for s in samples]
+    if len(ms) > 1:
+        q = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p95, p99 = q[49], q[94], q[98]
+    else:
+        p50 = p95 = p99 = ms[0]
+    return {
+        "count": len(ms),
+        "mean_ms": statistics.fmean(ms),
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "max_ms": max(ms),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: Optional[str], name: str, params: Dict[str, Any], results: Dict[str, Any]) -> None:
+    """Сохраняет результаты в JSON вместе с ревизией и параметрами запуска"""
+    if not path:
+        return
+    payload = {
+        "benchmark": name,
+        "revision": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": params,
+        "results": results,
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(payload, indent=2, ensure_ascii=False))
+    print(f"Results saved to {path}")
+
+
+def compare_results(baseline_path: str, results: Dict[str, Dict[str, float]], key: str) -> None:
+    """Печатает изменение метрики key относительно сохранённого прогона"""
+    baseline = json.loads(Path(baseline_path).read_text())["results"]
+    print(f"\nCompared to {baseline_path} ({key}):")
+    for name, current in results.items():
+        old = baseline.get(name, {}).get(key)
+        new = current.get(key)
+        if not old or new is None:
+            continue
+        print(f"  {name:<28} {old:10.3f} -> {new:10.3f}  ({(new - old) / old * 100:+.1f}%)")
+
+
+class Timer:
+    def __enter__(self) -> "Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elapsed = time.perf_counter() - self.started
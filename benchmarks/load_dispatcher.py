@@ -0,0 +1,272 @@
+"""
+Нагрузочный прогон бота: синтетические апдейты через Dispatcher.feed_update.
+
+Бот работает с заглушкой Bot API (benchmarks.common.StubSession) и с реальной
+БД из настроек (.env) — запускайте на отдельной локальной базе Postgres.
+
+    python -m benchmarks.load_dispatcher --users 50 --concurrency 10 \\
+        --iterations 5 --output results/load.json [--baseline results/old.json]
+
+Отчёт: апдейтов в секунду и p50/p95/p99 задержки и SQL-запросы на апдейт по каждому сценарию.
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, List
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import CallbackQuery, Chat, InlineKeyboardMarkup, Message, Update, User
+from sqlalchemy import delete, select, text
+
+from app.database.base import Base, async_session_maker, engine
+from app.database.dao.task import TaskDAO
+from app.database.dao.user import UserDAO
+from app.database.models import Task, User as DBUser, UserAchievement
+from app.database.query_stats import query_scope
+from app.keyboards.inline import get_task_detail_keyboard, get_tasks_keyboard
+from app.main import create_dispatcher
+from app.middlewares import CommitBeforeRequestMiddleware
+from app.utils.callback_data import Action, pack
+from app.utils.recurrence import REPEAT_NONE
+from benchmarks.common import StubSession, compare_results, summarize, write_results
+
+# Синтетические пользователи живут в своём диапазоне tg_id
+TG_ID_OFFSET = 9_000_000_000
+
+FLOWS = ["start", "add_task", "list", "pagination", "task_detail", "mark_done", "profile", "leaderboard"]
+
+
+def button_data(markup: InlineKeyboardMarkup, text_prefix: str) -> str:
+    """callback_data кнопки по началу её текста"""
+    for row in markup.inline_keyboard:
+        for button in row:
+            if button.text.startswith(text_prefix):
+                return button.callback_data
+    raise LookupError(f"Button {text_prefix!r} not found")
+
+
+class UpdateFactory:
+    def __init__(self) -> None:
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+
+    def _message(self, user: User, text: str | None = None) -> Message:
+        return Message(
+            message_id=next(self._message_ids),
+            date=datetime.now(timezone.utc),
+            chat=Chat(id=user.id, type="private"),
+            from_user=user,
+            text=text,
+        )
+
+    def message(self, user: User, text: str) -> Update:
+        return Update(update_id=next(self._update_ids), message=self._message(user, text))
+
+    def callback(self, user: User, data: str) -> Update:
+        return Update(
+            update_id=next(self._update_ids),
+            callback_query=CallbackQuery(
+                id=str(next(self._update_ids)),
+                from_user=user,
+                chat_instance=str(user.id),
+                message=self._message(user, "…"),
+                data=data,
+            ),
+        )
+
+
+@dataclass
+class VirtualUser:
+    tg_user: User
+    db_id: int = 0
+    open_task_ids: List[int] = field(default_factory=list)
+    task_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class Recorder:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    queries: Dict[str, List[int]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class LoadRunner:
+    def __init__(self, dp: Dispatcher, bot: Bot, args: argparse.Namespace) -> None:
+        self.dp = dp
+        self.bot = bot
+        self.args = args
+        self.factory = UpdateFactory()
+        self.recorder = Recorder()
+
+    async def feed(self, flow: str, update: Update) -> None:
+        started = time.perf_counter()
+        try:
+            with query_scope(flow) as stats:
+                await self.dp.feed_update(self.bot, update)
+        except Exception:
+            self.recorder.errors[flow] += 1
+            logging.getLogger(__name__).exception("Update failed in flow %s", flow)
+            return
+        self.recorder.latencies[flow].append(time.perf_counter() - started)
+        self.recorder.queries[flow].append(stats.count)
+
+    async def add_task(self, vu: VirtualUser, n: int) -> None:
+        user = vu.tg_user
+        await self.feed("add_task", self.factory.message(user, "/add"))
+        await self.feed("add_task", self.factory.message(user, f"Задача {n} пользователя {user.id}"))
+        await self.feed("add_task", self.factory.message(user, "Описание синтетической задачи " * 3))
+        await self.feed("add_task", self.factory.message(user, str(random.randint(1, 10))))
+        await self.feed("add_task", self.factory.message(user, random.choice(["Сегодня", "Завтра", "Через неделю"])))
+        await self.feed("add_task", self.factory.message(user, REPEAT_NONE))
+
+    async def run_flow(self, vu: VirtualUser, flow: str) -> None:
+        user = vu.tg_user
+        if flow == "start":
+            await self.feed(flow, self.factory.message(user, "/start"))
+        elif flow == "add_task":
+            await self.add_task(vu, random.randint(1, 10 ** 6))
+        elif flow == "list":
+            await self.feed(flow, self.factory.message(user, "📋 Мои задачи"))
+        elif flow == "pagination":
+            markup = get_tasks_keyboard([], page=0, total_pages=2)
+            await self.feed(flow, self.factory.callback(user, button_data(markup, "Вперед")))
+        elif flow == "task_detail" and vu.task_ids:
+            task_id = random.choice(vu.task_ids)
+            tasks = [SimpleNamespace(id=task_id, title="")]
+            markup = get_tasks_keyboard(tasks, page=0, total_pages=1)
+            await self.feed(flow, self.factory.callback(user, button_data(markup, "📝")))
+        elif flow == "mark_done" and vu.open_task_ids:
+            task_id = vu.open_task_ids.pop()
+            markup = get_task_detail_keyboard(task_id)
+            await self.feed(flow, self.factory.callback(user, button_data(markup, "✅")))
+        elif flow == "profile":
+            await self.feed(flow, self.factory.message(user, "👤 Профиль"))
+        elif flow == "leaderboard":
+            await self.feed(flow, self.factory.callback(user, pack(Action.LEADERBOARD)))
+
+    async def prepare_user(self, vu: VirtualUser) -> None:
+        """Регистрация и стартовый набор задач через тот же FSM-сценарий"""
+        await self.feed("start", self.factory.message(vu.tg_user, "/start"))
+        for n in range(self.args.tasks_per_user):
+            await self.add_task(vu, n)
+
+        db_user = await UserDAO.get_or_create_user(vu.tg_user)
+        vu.db_id = db_user.id
+        tasks = await TaskDAO.get_tasks(user_id=db_user.id)
+        vu.task_ids = [task.id for task in tasks]
+        vu.open_task_ids = list(vu.task_ids)
+
+    async def run_user(self, vu: VirtualUser, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            for _ in range(self.args.iterations):
+                flows = list(FLOWS)
+                random.shuffle(flows)
+                for flow in flows:
+                    await self.run_flow(vu, flow)
+
+
+async def create_schema() -> None:
+    async with engine.begin() as conn:
+        # Расширения для поисковых индексов tasks (см. миграцию c3f8a61e2d47)
+        for extension in ("pg_trgm", "btree_gin"):
+            await conn.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def cleanup(tg_ids: List[int]) -> None:
+    async with async_session_maker() as session:
+        user_ids = select(DBUser.id).where(DBUser.tg_id.in_(tg_ids))
+        await session.execute(delete(Task).where(Task.user_id.in_(user_ids)))
+        await session.execute(delete(UserAchievement).where(UserAchievement.user_id.in_(user_ids)))
+        await session.execute(delete(DBUser).where(DBUser.tg_id.in_(tg_ids)))
+        await session.commit()
+
+
+async def run(args: argparse.Namespace) -> None:
+    random.seed(args.seed)
+    if args.create_schema:
+        await create_schema()
+
+    session = StubSession(latency=args.api_latency)
+    # Как в app.main: транзакция апдейта фиксируется перед запросом к Bot API
+    session.middleware(CommitBeforeRequestMiddleware())
+    bot = Bot(token="123456:LOADTEST", session=session)
+    # Виртуальные пользователи жмут кнопки быстрее людей — антифлуд отбросил бы часть апдейтов
+    runner = LoadRunner(create_dispatcher(throttling=args.throttling), bot, args)
+
+    users = [
+        VirtualUser(User(id=TG_ID_OFFSET + i, is_bot=False, first_name=f"Load{i}", username=f"load_{i}"))
+        for i in range(args.users)
+    ]
+    tg_ids = [vu.tg_user.id for vu in users]
+    await cleanup(tg_ids)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def prepare(vu: VirtualUser) -> None:
+        async with semaphore:
+            await runner.prepare_user(vu)
+
+    await asyncio.gather(*(prepare(vu) for vu in users))
+
+    # Замеряем только основную фазу
+    runner.recorder = Recorder()
+    started = time.perf_counter()
+    await asyncio.gather(*(runner.run_user(vu, semaphore) for vu in users))
+    elapsed = time.perf_counter() - started
+
+    total_updates = sum(len(v) for v in runner.recorder.latencies.values())
+    results = {}
+    print(f"\n{total_updates} updates in {elapsed:.2f}s — {total_updates / elapsed:.1f} updates/s")
+    print(f"{'flow':<14}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'errors':>8}")
+    for flow in FLOWS:
+        summary = summarize(runner.recorder.latencies[flow])
+        queries = runner.recorder.queries[flow]
+        summary["queries_per_update"] = sum(queries) / len(queries) if queries else 0
+        summary["errors"] = runner.recorder.errors[flow]
+        results[flow] = summary
+        if summary["count"]:
+            print(
+                f"{flow:<14}{summary['count']:>7}{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}"
+                f"{summary['p99_ms']:>10.2f}{summary['queries_per_update']:>9.1f}{summary['errors']:>8}"
+            )
+    results["_total"] = {"updates": total_updates, "seconds": elapsed, "updates_per_s": total_updates / elapsed}
+    print(f"Bot API calls: {dict(session.calls)}")
+
+    write_results(args.output, "load_dispatcher", vars(args), results)
+    if args.baseline:
+        compare_results(args.baseline, results, "p95_ms")
+
+    if not args.keep_data:
+        await cleanup(tg_ids)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="число виртуальных пользователей")
+    parser.add_argument("--concurrency", type=int, default=10, help="сколько пользователей активны одновременно")
+    parser.add_argument("--iterations", type=int, default=3, help="проходов по всем сценариям на пользователя")
+    parser.add_argument("--tasks-per-user", type=int, default=8, help="задач, создаваемых при подготовке")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="задержка заглушки Bot API, секунды")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="куда сохранить JSON с результатами")
+    parser.add_argument("--baseline", help="JSON прошлого прогона для сравнения")
+    parser.add_argument("--create-schema", action="store_true", help="создать таблицы через metadata.create_all")
+    parser.add_argument("--throttling", action="store_true", help="включить антифлуд, как в боевом диспетчере")
+    parser.add_argument("--keep-data", action="store_true", help="не удалять синтетических пользователей")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
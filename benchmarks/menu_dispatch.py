@@ -0,0 +1,129 @@
+"""
+Накладные расходы маршрутизации текстового сообщения.
+
+Сравниваются два варианта с одинаковым набором хендлеров — кнопки меню
+и FSM-сценарии, разложенные по нескольким роутерам как в боте:
+  lambda — кнопки через lambda message: message.text == ... в каждом роутере
+           (синхронные фильтры aiogram выполняет в отдельном потоке);
+  table  — MenuRouter, подключённый первым: один поиск в словаре.
+Замеряются последняя кнопка меню и обычный текст в состоянии FSM,
+который проходит мимо всех кнопок до хендлера состояния.
+
+    python -m benchmarks.menu_dispatch --buttons 5 20 50
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from aiogram import Dispatcher, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Chat, Message, Update, User
+
+from app.utils.dispatch import MenuRouter
+from benchmarks.common import make_stub_bot, time_feed_update, write_results
+
+USER = User(id=1, is_bot=False, first_name="Bench")
+ROUTERS = 5
+STATES_PER_ROUTER = 4
+
+
+class BenchStates(StatesGroup):
+    waiting = State()
+    other = State()
+
+
+async def noop(message: Message) -> None:
+    pass
+
+
+def make_update(text: str) -> Update:
+    return Update(
+        update_id=1,
+        message=Message(
+            message_id=1,
+            date=datetime.now(timezone.utc),
+            chat=Chat(id=USER.id, type="private"),
+            from_user=USER,
+            text=text,
+        ),
+    )
+
+
+def _add_state_handlers(routers: List[Router]) -> None:
+    # Как в боте: сценарии после кнопок, нужный — в последнем роутере
+    for router in routers:
+        for _ in range(STATES_PER_ROUTER):
+            router.message.register(noop, BenchStates.other)
+    routers[-1].message.register(noop, BenchStates.waiting)
+
+
+def _make_filter(text: str) -> Callable[[Message], bool]:
+    return lambda message: message.text == text
+
+
+def lambda_dispatcher(buttons: int) -> Dispatcher:
+    dp = Dispatcher(storage=MemoryStorage())
+    routers = [Router() for _ in range(ROUTERS)]
+    for i in range(buttons):
+        routers[i % ROUTERS].message.register(noop, _make_filter(f"button {i}"))
+    _add_state_handlers(routers)
+    for router in routers:
+        dp.include_router(router)
+    return dp
+
+
+def table_dispatcher(buttons: int) -> Dispatcher:
+    dp = Dispatcher(storage=MemoryStorage())
+    menu = MenuRouter()
+    for i in range(buttons):
+        menu.command(f"button {i}")(noop)
+    dp.include_router(menu)
+    routers = [Router() for _ in range(ROUTERS)]
+    _add_state_handlers(routers)
+    for router in routers:
+        dp.include_router(router)
+    return dp
+
+
+async def run(args: argparse.Namespace) -> dict:
+    bot = make_stub_bot()
+    results = {}
+    print(f"{'buttons':>8} {'router':<8}{'button us':>11}{'fsm text us':>13}")
+    for buttons in args.buttons:
+        for name, build in (("lambda", lambda_dispatcher), ("table", table_dispatcher)):
+            dp = build(buttons)
+            state = FSMContext(dp.storage, StorageKey(bot_id=bot.id, chat_id=USER.id, user_id=USER.id))
+
+            # Кнопка меню вне сценария
+            await state.clear()
+            button = await time_feed_update(dp, bot, make_update(f"button {buttons - 1}"), args.iterations, args.repeat)
+
+            # Ввод в сценарии: MenuRouter сбрасывает состояние только на кнопках, здесь оно сохраняется
+            await state.set_state(BenchStates.waiting)
+            text = await time_feed_update(dp, bot, make_update("Купить молоко"), args.iterations, args.repeat)
+
+            results[f"{name}@{buttons}"] = {"button_us": button, "fsm_text_us": text}
+            print(f"{buttons:>8} {name:<8}{button:>11.1f}{text:>13.1f}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buttons", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--iterations", type=int, default=1000, help="апдейтов в одной серии")
+    parser.add_argument("--repeat", type=int, default=5, help="число серий")
+    parser.add_argument("--output", help="куда сохранить JSON с результатами")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = asyncio.run(run(args))
+    write_results(args.output, "menu_dispatch", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Микробенчмарки чистых горячих путей: геймификация, тексты и клавиатуры.
+
+Каждый кейс прогревается, затем замеряется repeat раз по number вызовов
+(number подбирается автоматически на ~0.2 с). В отчёте — время одного
+вызова: медиана, среднее, стандартное отклонение и минимум.
+
+    python -m benchmarks.micro                         # прогон и таблица
+    python -m benchmarks.micro --save-baseline         # сохранить как базовую линию
+    python -m benchmarks.micro --compare --threshold 10 # сравнить и упасть при регрессии
+    python -m benchmarks.micro -k keyboard             # только кейсы с «keyboard» в имени
+
+Базовые линии лежат в benchmarks/baselines/ и имеют смысл только на той же машине.
+"""
+import argparse
+import json
+import statistics
+import sys
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from aiogram import Bot
+from aiogram.methods import SendMessage
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, User
+
+from app.constants.gamification import get_level_from_xp, get_task_xp, get_title
+from app.database.enums import TaskStatus
+from app.handlers.profile import create_progress_bar
+from app.keyboards.inline import (
+    get_confirmation_keyboard,
+    get_edit_task_keyboard,
+    get_task_detail_keyboard,
+    get_tasks_keyboard,
+)
+from app.keyboards.reply import get_main_keyboard
+from app.middlewares import ThrottlingMiddleware
+from app.texts.tasks import render_cache, render_task_created, render_task_detail, render_tasks_page
+from app.utils.callback_data import Action
+from app.utils.task_index import UserTaskIndex
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DEFAULT_BASELINE = BASELINE_DIR / "micro.json"
+
+
+def make_task(task_id: int, status: TaskStatus, due_in_days: int | None) -> SimpleNamespace:
+    now = datetime.now()
+    return SimpleNamespace(
+        id=task_id,
+        title=f"Подготовить квартальный отчёт №{task_id} для отдела продаж",
+        description="Собрать данные по продажам, сверить с бухгалтерией и оформить презентацию. " * 3,
+        status=status,
+        priority=task_id % 10 + 1,
+        created_at=now - timedelta(days=3),
+        updated_at=now - timedelta(hours=task_id),
+        due_date=now + timedelta(days=due_in_days) if due_in_days is not None else None,
+        completed_at=now if status == TaskStatus.COMPLETED else None,
+        children_total=7 if task_id % 2 else 0,
+        children_done=3 if task_id % 2 else 0,
+        recurrence=None,
+        recurrence_interval=None,
+        recurrence_weekdays=None,
+    )
+
+
+PAGE = [
+    make_task(1, TaskStatus.PENDING, 3),
+    make_task(2, TaskStatus.IN_PROGRESS, 0),
+    make_task(3, TaskStatus.PENDING, -2),
+    make_task(4, TaskStatus.COMPLETED, None),
+    make_task(5, TaskStatus.CANCELLED, 10),
+]
+DETAIL = make_task(42, TaskStatus.IN_PROGRESS, -1)
+
+# Сериализация сообщения с клавиатурой тем же путём, что и перед запросом к Bot API
+BOT = Bot(token="123456:BENCHMARK")
+
+
+def serialize(markup: InlineKeyboardMarkup) -> object:
+    return BOT.session.build_form_data(BOT, SendMessage(chat_id=1, text="Задача", reply_markup=markup))
+
+
+# Лимиты заведомо не срабатывают: замеряется проверка, а не отбрасывание
+THROTTLING = ThrottlingMiddleware(rate=10 ** 9, debounce=0)
+CALLBACK = CallbackQuery(id="1", from_user=User(id=1, is_bot=False, first_name="Bench"), chat_instance="1", data="t:2s")
+
+# Индекс инлайн-режима на полный лимит задач пользователя
+INLINE_TASKS = [make_task(i, TaskStatus.PENDING, i % 20 - 5) for i in range(500)]
+INLINE_INDEX = UserTaskIndex(INLINE_TASKS, loaded_at=0.0)
+
+
+def uncached(builder):
+    builder.cache_clear()
+    return builder.__wrapped__
+
+
+CASES: Dict[str, Callable[[], object]] = {
+    "gamification.get_level_from_xp[level 5]": lambda: get_level_from_xp(1_200),
+    "gamification.get_level_from_xp[level 60]": lambda: get_level_from_xp(470_000),
+    "gamification.get_task_xp": lambda: get_task_xp(7, True, False),
+    "gamification.get_title": lambda: get_title(37),
+    "profile.create_progress_bar": lambda: create_progress_bar(340, 1000, 15),
+    "text.render_tasks_page[5]": lambda: render_tasks_page(PAGE, 2, 7),
+    "text.render_tasks_page[5, cold]": lambda: (render_cache.clear(), render_tasks_page(PAGE, 2, 7)),
+    "text.render_task_detail": lambda: render_task_detail(DETAIL),
+    "text.render_task_detail[cold]": lambda: (render_cache.clear(), render_task_detail(DETAIL)),
+    "text.render_task_created": lambda: render_task_created(DETAIL),
+    "keyboard.get_tasks_keyboard[5]": lambda: get_tasks_keyboard(PAGE, page=2, total_pages=7),
+    "keyboard.get_task_detail_keyboard": lambda: get_task_detail_keyboard(42),
+    "keyboard.get_task_detail_keyboard[cold]": lambda: uncached(get_task_detail_keyboard)(42),
+    "keyboard.form_data[task detail]": lambda: serialize(get_task_detail_keyboard(42)),
+    "keyboard.form_data[task detail, cold]": lambda: serialize(uncached(get_task_detail_keyboard)(42)),
+    "keyboard.get_edit_task_keyboard": lambda: get_edit_task_keyboard(42),
+    "keyboard.get_confirmation_keyboard": lambda: get_confirmation_keyboard(42, Action.CONFIRM_DELETE),
+    "keyboard.get_main_keyboard": get_main_keyboard,
+    "middleware.throttling.check[callback]": lambda: THROTTLING.check(CALLBACK),
+    "inline.task_index.search[500, prefix]": lambda: INLINE_INDEX.search("кварт отч", 50),
+    "inline.task_index.build[500]": lambda: UserTaskIndex(INLINE_TASKS, loaded_at=0.0),
+}
+
+
+def measure(func: Callable[[], object], repeat: int, warmup: float) -> Dict[str, float]:
+    timer = timeit.Timer(func)
+
+    # Прогрев: кэши интерпретатора, ленивые импорты и сборка pydantic-моделей
+    deadline = timeit.default_timer() + warmup
+    while timeit.default_timer() < deadline:
+        func()
+
+    number, _ = timer.autorange()
+    number = max(1, number)
+    per_call = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median_us": statistics.median(per_call) * 1e6,
+        "mean_us": statistics.fmean(per_call) * 1e6,
+        "stdev_us": statistics.stdev(per_call) * 1e6 if len(per_call) > 1 else 0.0,
+        "min_us": min(per_call) * 1e6,
+        "loops": number,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """Возвращает кейсы, медиана которых выросла больше чем на threshold процентов"""
+    regressions = []
+    print(f"\n{'case':<44}{'baseline us':>13}{'current us':>13}{'change':>9}")
+    for name, current in results.items():
+        old = baseline.get(name)
+        if not old:
+            print(f"{name:<44}{'-':>13}{current['median_us']:>13.2f}{'new':>9}")
+            continue
+        change = (current["median_us"] - old["median_us"]) / old["median_us"] * 100
+        # Изменение в пределах шума (3 стандартных отклонения базовой линии) не считаем регрессией
+        noisy = abs(current["median_us"] - old["median_us"]) <= 3 * old.get("stdev_us", 0)
+        flag = ""
+        if change > threshold and not noisy:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<44}{old['median_us']:>13.2f}{current['median_us']:>13.2f}{change:>+8.1f}%{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", default="", help="запускать только кейсы с подстрокой в имени")
+    parser.add_argument("--repeat", type=int, default=7, help="число серий замеров")
+    parser.add_argument("--warmup", type=float, default=0.1, help="прогрев каждого кейса, секунды")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="файл базовой линии")
+    parser.add_argument("--save-baseline", action="store_true", help="сохранить результаты как базовую линию")
+    parser.add_argument("--compare", action="store_true", help="сравнить с базовой линией")
+    parser.add_argument("--threshold", type=float, default=10.0, help="допустимый рост медианы, %%")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<44}{'median us':>11}{'mean us':>11}{'stdev':>9}{'min us':>11}")
+    for name, func in CASES.items():
+        if args.pattern not in name:
+            continue
+        stats = measure(func, args.repeat, args.warmup)
+        results[name] = stats
+        print(
+            f"{name:<44}{stats['median_us']:>11.2f}{stats['mean_us']:>11.2f}"
+            f"{stats['stdev_us']:>9.2f}{stats['min_us']:>11.2f}"
+        )
+
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2, ensure_ascii=False))
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            sys.exit(f"No baseline at {args.baseline}, run with --save-baseline first")
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            sys.exit(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Загрузка строк: ORM-сущности против колонок в NamedTuple.
+
+Сравниваются запросы в старом виде (полные Task и User через ORM) и в новом
+(только нужные колонки, app.database.rows) на двух сценариях:
+  reminder_scan — скан напоминаний планировщика на --scan-rows строк;
+  task_list     — список задач на --list-rows строк.
+Для каждого варианта — медиана времени «запрос + разбор результата»
+и память по tracemalloc: пик и то, что остаётся занятым результатом.
+Работает с БД из настроек (.env) — данные заливаются через benchmarks.seed,
+используйте отдельную базу.
+
+    python -m benchmarks.row_hydration --scan-rows 100000 --list-rows 1000 \\
+        --output results/rows.json [--baseline results/old.json]
+"""
+import argparse
+import asyncio
+import gc
+import math
+import statistics
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List
+
+import asyncpg
+from sqlalchemy import select
+
+from benchmarks.common import compare_results, write_results
+from benchmarks.seed import SEED_TG_ID_RANGE, clear, dsn, seed
+
+Loader = Callable[[], Awaitable[List[Any]]]
+
+
+def make_loaders(scan_rows: int, list_rows: int) -> Dict[str, Dict[str, Loader]]:
+    from app.database.base import primary_session_maker
+    from app.database.models import Task, User
+    from app.database.rows import REMINDER_ROW_COLUMNS, TASK_ROW_COLUMNS, ReminderRow, TaskRow
+
+    seeded = User.tg_id.between(SEED_TG_ID_RANGE[0], SEED_TG_ID_RANGE[1] - 1)
+
+    def reminder_stmt(*columns):
+        return select(*columns).join(User, Task.user_id == User.id).where(seeded).limit(scan_rows)
+
+    def list_stmt(*columns):
+        return (
+            select(*columns)
+            .join(User, Task.user_id == User.id)
+            .where(seeded)
+            .order_by(Task.created_at.desc())
+            .limit(list_rows)
+        )
+
+    async def orm_scan() -> List[Any]:
+        async with primary_session_maker() as session:
+            return (await session.execute(reminder_stmt(Task, User))).all()
+
+    async def rows_scan() -> List[Any]:
+        async with primary_session_maker() as session:
+            return list(map(ReminderRow._make, await session.execute(reminder_stmt(*REMINDER_ROW_COLUMNS))))
+
+    async def orm_list() -> List[Any]:
+        async with primary_session_maker() as session:
+            return (await session.execute(list_stmt(Task))).scalars().all()
+
+    async def rows_list() -> List[Any]:
+        async with primary_session_maker() as session:
+            return list(map(TaskRow._make, await session.execute(list_stmt(*TASK_ROW_COLUMNS))))
+
+    return {
+        "reminder_scan": {"orm": orm_scan, "rows": rows_scan},
+        "task_list": {"orm": orm_list, "rows": rows_list},
+    }
+
+
+async def measure(load: Loader, repeat: int) -> dict:
+    await load()  # прогрев: соединение, кэш компиляции запроса
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = await load()
+        timings.append(time.perf_counter() - started)
+        del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = await load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "rows": len(result),
+        "median_ms": statistics.median(timings) * 1000,
+        "peak_mb": peak / 2 ** 20,
+        "retained_mb": retained / 2 ** 20,
+    }
+
+
+async def prepare(scan_rows: int, tasks_per_user: int) -> None:
+    conn = await asyncpg.connect(dsn())
+    try:
+        await clear(conn)
+        await seed(conn, max(1, math.ceil(scan_rows / tasks_per_user)), scan_rows)
+    finally:
+        await conn.close()
+
+
+async def cleanup() -> None:
+    conn = await asyncpg.connect(dsn())
+    try:
+        await clear(conn)
+    finally:
+        await conn.close()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from app.database.base import engine
+
+    results = {}
+    print(f"{'case':<15}{'variant':<8}{'rows':>8}{'median ms':>11}{'peak MB':>9}{'kept MB':>9}")
+    for case, variants in make_loaders(args.scan_rows, args.list_rows).items():
+        for variant, load in variants.items():
+            result = await measure(load, args.repeat)
+            results[f"{case}.{variant}"] = result
+            print(
+                f"{case:<15}{variant:<8}{result['rows']:>8}{result['median_ms']:>11.1f}"
+                f"{result['peak_mb']:>9.1f}{result['retained_mb']:>9.1f}"
+            )
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scan-rows", type=int, default=100_000, help="строк в скане напоминаний")
+    parser.add_argument("--list-rows", type=int, default=1000, help="строк в списке задач")
+    parser.add_argument("--tasks-per-user", type=int, default=20, help="среднее число задач на пользователя")
+    parser.add_argument("--repeat", type=int, default=5, help="замеров времени на вариант")
+    parser.add_argument("--output", help="куда сохранить JSON с результатами")
+    parser.add_argument("--baseline", help="JSON прошлого прогона для сравнения")
+    parser.add_argument("--keep-data", action="store_true", help="не удалять данные после прогона")
+    args = parser.parse_args()
+
+    asyncio.run(prepare(args.scan_rows, args.tasks_per_user))
+    results = asyncio.run(run(args))
+    if not args.keep_data:
+        asyncio.run(cleanup())
+
+    write_results(args.output, "row_hydration", vars(args), results)
+    if args.baseline:
+        compare_results(args.baseline, results, "median_ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Масштабный бенчмарк задач планировщика на синтетических данных.
+
+Для каждого объёма задач база заново заливается через benchmarks.seed,
+затем каждая задача планировщика запускается в отдельном процессе
+с заглушкой Bot API. Отдельный процесс нужен, чтобы пиковый RSS
+относился к одной задаче. Работает с БД из настроек (.env) — только
+на отдельной базе: задачи сканируют всех пользователей, не только синтетических.
+
+    python -m benchmarks.scheduler_scale --sizes 10000 100000 1000000 \\
+        --output results/scheduler.json [--baseline results/old.json]
+"""
+import argparse
+import asyncio
+import json
+import math
+import resource
+import subprocess
+import sys
+import time
+
+import asyncpg
+
+from benchmarks.common import compare_results, make_stub_bot, write_results
+from benchmarks.seed import clear, dsn, reset_reminder_flags, seed
+
+JOBS = [
+    "check_upcoming_deadlines",
+    "check_overdue_tasks",
+    "send_daily_summary",
+    "check_streak_reminder",
+    "weekly_stats",
+]
+
+
+async def run_job(name: str) -> dict:
+    """Выполняется в дочернем процессе: один запуск задачи и его замеры"""
+    from app.database.base import engine
+    from app.database.query_stats import query_scope
+    from app.scheduler import jobs
+
+    bot = make_stub_bot()
+    started = time.perf_counter()
+    with query_scope(name) as queries:
+        await getattr(jobs, name)(bot)
+    wall = time.perf_counter() - started
+    await engine.dispose()
+
+    messages = bot.session.calls["SendMessage"]
+    return {
+        "wall_s": wall,
+        # ru_maxrss в Linux — килобайты
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "queries": queries.count,
+        "db_s": queries.total_time,
+        "messages": messages,
+        "messages_per_s": messages / wall if wall else 0,
+    }
+
+
+def run_job_in_subprocess(name: str, timeout: float) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.scheduler_scale", "--run-job", name],
+        capture_output=True, text=True, timeout=timeout,
+    )
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr else f"exit {proc.returncode}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+async def prepare(size: int, tasks_per_user: int) -> None:
+    conn = await asyncpg.connect(dsn())
+    try:
+        await clear(conn)
+        await seed(conn, max(1, math.ceil(size / tasks_per_user)), size)
+    finally:
+        await conn.close()
+
+
+async def cleanup() -> None:
+    conn = await asyncpg.connect(dsn())
+    try:
+        await clear(conn)
+    finally:
+        await conn.close()
+
+
+async def reset_flags() -> None:
+    conn = await asyncpg.connect(dsn())
+    try:
+        await reset_reminder_flags(conn)
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--tasks-per-user", type=int, default=20, help="среднее число задач на пользователя")
+    parser.add_argument("--jobs", nargs="+", default=JOBS, choices=JOBS)
+    parser.add_argument("--timeout", type=float, default=3600, help="лимит на одну задачу, секунды")
+    parser.add_argument("--output", help="куда сохранить JSON с результатами")
+    parser.add_argument("--baseline", help="JSON прошлого прогона для сравнения")
+    parser.add_argument("--keep-data", action="store_true", help="не удалять данные после прогона")
+    parser.add_argument("--run-job", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_job:
+        print(json.dumps(asyncio.run(run_job(args.run_job))))
+        return
+
+    results = {}
+    print(f"{'tasks':>9} {'job':<26}{'wall s':>9}{'RSS MB':>9}{'queries':>9}{'msgs':>8}{'msg/s':>9}")
+    for size in args.sizes:
+        asyncio.run(prepare(size, args.tasks_per_user))
+        for job in args.jobs:
+            asyncio.run(reset_flags())
+            result = run_job_in_subprocess(job, args.timeout)
+            results[f"{job}@{size}"] = result
+            if "error" in result:
+                print(f"{size:>9} {job:<26} error: {result['error']}")
+                continue
+            print(
+                f"{size:>9} {job:<26}{result['wall_s']:>9.2f}{result['peak_rss_mb']:>9.1f}"
+                f"{result['queries']:>9}{result['messages']:>8}{result['messages_per_s']:>9.0f}"
+            )
+
+    if not args.keep_data:
+        asyncio.run(cleanup())
+
+    write_results(args.output, "scheduler_scale", vars(args), results)
+    if args.baseline:
+        compare_results(args.baseline, results, "wall_s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Задержка поиска задач (TaskDAO.search) у пользователя с большим числом задач.
+
+Заливается один синтетический пользователь с --tasks задачами, затем по каждому
+запросу замеряются первая страница и следующая за ней (keyset по rank, id).
+Цель — p95 меньше --target-ms. Работает с БД из настроек (.env) после миграций;
+используйте отдельную базу.
+
+    python -m benchmarks.search --tasks 50000 --output results/search.json
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import asyncpg
+
+from benchmarks.common import summarize, write_results
+from benchmarks.seed import SEED_TG_ID_RANGE, SEED_USER_IDS, TITLE_WORDS, clear, dsn, seed
+
+# Полные слова, формы (проверка стемминга), префиксы и опечатки (триграммы)
+QUERIES = [
+    "отчёт", "отчёты", "позвонить маме", "купить молоко", "презентацию код",
+    "синтетическая задача", "подгот", "провер", "оплатит счёт", "пресентация",
+]
+
+
+async def prepare(tasks: int) -> int:
+    conn = await asyncpg.connect(dsn())
+    try:
+        await clear(conn)
+        await seed(conn, 1, tasks)
+        return await conn.fetchval(SEED_USER_IDS, *SEED_TG_ID_RANGE)
+    finally:
+        await conn.close()
+
+
+async def cleanup() -> None:
+    conn = await asyncpg.connect(dsn())
+    try:
+        await clear(conn)
+    finally:
+        await conn.close()
+
+
+async def run(args: argparse.Namespace, user_id: int) -> dict:
+    from app.database.base import engine
+    from app.database.dao.task import TaskDAO
+
+    rng = random.Random(args.seed)
+    queries = QUERIES + [" ".join(rng.sample(TITLE_WORDS, 2)) for _ in range(10)]
+    limit = TaskDAO.TASKS_PER_PAGE + 1
+
+    for query in queries:  # прогрев: соединения пула, кэш планов
+        await TaskDAO.search(user_id, query, limit)
+
+    first, following = [], []
+    for _ in range(args.repeat):
+        for query in queries:
+            started = time.perf_counter()
+            page = await TaskDAO.search(user_id, query, limit)
+            first.append(time.perf_counter() - started)
+            if len(page) == limit:
+                last = page[-2]
+                started = time.perf_counter()
+                await TaskDAO.search(user_id, query, limit, after=(last.rank, last.id))
+                following.append(time.perf_counter() - started)
+    await engine.dispose()
+
+    results = {"first_page": summarize(first), "next_page": summarize(following)}
+    print(f"{'page':<12}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, summary in results.items():
+        if not summary["count"]:
+            print(f"{name:<12}{0:>7}")
+            continue
+        print(f"{name:<12}{summary['count']:>7}{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}{summary['max_ms']:>10.2f}")
+        if summary["p95_ms"] > args.target_ms:
+            print(f"  {name}: p95 exceeds target of {args.target_ms} ms")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50_000, help="задач у пользователя")
+    parser.add_argument("--repeat", type=int, default=20, help="прогонов набора запросов")
+    parser.add_argument("--target-ms", type=float, default=10.0, help="цель для p95")
+    parser.add_argument("--seed", type=int, default=1, help="seed выбора запросов")
+    parser.add_argument("--output", help="куда сохранить JSON с результатами")
+    parser.add_argument("--keep-data", action="store_true", help="не удалять данные после прогона")
+    args = parser.parse_args()
+
+    user_id = asyncio.run(prepare(args.tasks))
+    results = asyncio.run(run(args, user_id))
+    if not args.keep_data:
+        asyncio.run(cleanup())
+
+    write_results(args.output, "search", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
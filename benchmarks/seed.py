@@ -0,0 +1,196 @@
+"""
+Заливка синтетических пользователей и задач через COPY.
+
+Данные попадают в БД из настроек (.env) — используйте отдельную базу.
+Синтетические пользователи получают tg_id начиная с SEED_TG_ID_OFFSET,
+поэтому --clear удаляет только их.
+
+    python -m benchmarks.seed --users 5000 --tasks 100000 --clear
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Iterator, List, Tuple
+
+import asyncpg
+
+from app.config import settings
+from app.constants.gamification import get_level_from_xp
+
+SEED_TG_ID_OFFSET = 8_000_000_000
+SEED_TG_ID_RANGE = (SEED_TG_ID_OFFSET, SEED_TG_ID_OFFSET + 1_000_000_000)
+SEED_USER_IDS = "SELECT id FROM users WHERE tg_id >= $1 AND tg_id < $2"
+CHUNK_SIZE = 50_000
+
+USER_COLUMNS = [
+    "tg_id", "username", "reminders_enabled", "reminder_time", "remind_before_hours",
+    "xp", "level", "current_streak", "max_streak", "last_completed_date",
+    "total_completed", "total_created", "tasks_completed_today", "last_activity_date",
+]
+
+TASK_COLUMNS = [
+    "user_id", "title", "description", "status", "priority", "created_at",
+    "due_date", "completed_at", "reminder_sent", "overdue_reminder_sent",
+]
+
+# Примерное распределение статусов в живой базе
+STATUS_WEIGHTS = {"PENDING": 45, "IN_PROGRESS": 15, "COMPLETED": 33, "CANCELLED": 7}
+PRIORITY_WEIGHTS = [6, 8, 14, 12, 20, 10, 9, 8, 6, 7]
+
+TITLE_WORDS = [
+    "Купить", "Позвонить", "Написать", "Подготовить", "Проверить", "Оплатить",
+    "отчёт", "маме", "счёт", "презентацию", "код", "молоко", "письмо", "задачу",
+]
+
+
+def dsn() -> str:
+    return settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def _title(rng: random.Random) -> str:
+    return " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(2, 5)))
+
+
+def generate_users(count: int, rng: random.Random) -> Iterator[Tuple]:
+    today = date.today()
+    for i in range(count):
+        streak = 0 if rng.random() < 0.4 else min(int(rng.expovariate(1 / 5)) + 1, 365)
+        if streak:
+            last_completed = today - timedelta(days=rng.choice((0, 1)))
+        else:
+            last_completed = today - timedelta(days=rng.randint(2, 60)) if rng.random() < 0.7 else None
+
+        xp = int(rng.lognormvariate(6, 1.2))
+        total_completed = int(xp / 40)
+
+        yield (
+            SEED_TG_ID_OFFSET + i,
+            f"seed_{i}",
+            rng.random() < 0.85,
+            dt_time(rng.choice((7, 8, 9, 9, 9, 10)), 0),
+            24,
+            xp,
+            get_level_from_xp(xp),
+            streak,
+            max(streak, int(rng.expovariate(1 / 8))),
+            last_completed,
+            total_completed,
+            total_completed + rng.randint(0, 50),
+            rng.randint(0, 3) if last_completed == today else 0,
+            last_completed,
+        )
+
+
+def generate_tasks(count: int, user_ids: List[int], rng: random.Random) -> Iterator[Tuple]:
+    now = datetime.now(timezone.utc)
+    # Паретовские веса: у небольшой доли пользователей большая часть задач
+    weights = [rng.paretovariate(1.2) for _ in user_ids]
+    statuses = list(STATUS_WEIGHTS)
+    status_weights = list(STATUS_WEIGHTS.values())
+
+    owners = rng.choices(user_ids, weights=weights, k=count)
+    for user_id in owners:
+        status = rng.choices(statuses, weights=status_weights)[0]
+        created_at = now - timedelta(seconds=rng.uniform(0, 180 * 86400))
+
+        due_date = None
+        if rng.random() < 0.7:
+            due_date = now + timedelta(days=rng.gauss(3, 10))
+
+        completed_at = None
+        if status == "COMPLETED":
+            completed_at = min(created_at + timedelta(days=rng.expovariate(1 / 2)), now)
+
+        is_open = status in ("PENDING", "IN_PROGRESS")
+        overdue = due_date is not None and due_date < now
+        yield (
+            user_id,
+            _title(rng),
+            "Синтетическая задача для бенчмарка. " * rng.randint(1, 8),
+            status,
+            rng.choices(range(1, 11), weights=PRIORITY_WEIGHTS)[0],
+            created_at,
+            due_date,
+            completed_at,
+            not is_open or (due_date is not None and due_date < now + timedelta(hours=24) and rng.random() < 0.5),
+            not is_open or (overdue and rng.random() < 0.5),
+        )
+
+
+def _chunks(rows: Iterator[Tuple], size: int) -> Iterator[List[Tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def clear(conn: asyncpg.Connection) -> None:
+    """Удаляет синтетических пользователей и всё, что к ним привязано"""
+    await conn.execute(f"DELETE FROM user_achievements WHERE user_id IN ({SEED_USER_IDS})", *SEED_TG_ID_RANGE)
+    await conn.execute(f"DELETE FROM tasks WHERE user_id IN ({SEED_USER_IDS})", *SEED_TG_ID_RANGE)
+    await conn.execute("DELETE FROM users WHERE tg_id >= $1 AND tg_id < $2", *SEED_TG_ID_RANGE)
+
+
+async def reset_reminder_flags(conn: asyncpg.Connection) -> None:
+    """Сбрасывает флаги напоминаний, чтобы повторные прогоны задач отправляли то же количество"""
+    await conn.execute(
+        "UPDATE tasks SET reminder_sent = false, overdue_reminder_sent = false "
+        f"WHERE user_id IN ({SEED_USER_IDS}) AND status IN ('PENDING', 'IN_PROGRESS')",
+        *SEED_TG_ID_RANGE,
+    )
+
+
+async def seed(conn: asyncpg.Connection, users: int, tasks: int, seed_value: int = 1) -> None:
+    rng = random.Random(seed_value)
+
+    started = time.perf_counter()
+    for chunk in _chunks(generate_users(users, rng), CHUNK_SIZE):
+        await conn.copy_records_to_table("users", records=chunk, columns=USER_COLUMNS)
+
+    user_ids = [
+        row["id"] for row in
+        await conn.fetch(f"{SEED_USER_IDS} ORDER BY tg_id", *SEED_TG_ID_RANGE)
+    ]
+    print(f"Seeded {len(user_ids)} users in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    copied = 0
+    for chunk in _chunks(generate_tasks(tasks, user_ids, rng), CHUNK_SIZE):
+        await conn.copy_records_to_table("tasks", records=chunk, columns=TASK_COLUMNS)
+        copied += len(chunk)
+    await conn.execute("ANALYZE users")
+    await conn.execute("ANALYZE tasks")
+    elapsed = time.perf_counter() - started
+    print(f"Seeded {copied} tasks in {elapsed:.1f}s ({copied / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+async def run(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(dsn())
+    try:
+        if args.clear:
+            await clear(conn)
+        if args.tasks:
+            users = args.users or max(1, math.ceil(args.tasks / 20))
+            await seed(conn, users, args.tasks, args.seed)
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=0, help="пользователей (по умолчанию tasks / 20)")
+    parser.add_argument("--tasks", type=int, default=0, help="задач")
+    parser.add_argument("--seed", type=int, default=1, help="seed генератора")
+    parser.add_argument("--clear", action="store_true", help="удалить ранее залитые синтетические данные")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
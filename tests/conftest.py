@@ -0,0 +1,36 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+# Настройки приложения читаются при импорте app.config: для тестов без .env
+os.environ.setdefault("BOT_TOKEN", "123456:TEST")
+os.environ.setdefault("DB_HOST", "127.0.0.1")
+os.environ.setdefault("DB_PORT", "5432")
+os.environ.setdefault("DB_USER", "postgres")
+os.environ.setdefault("DB_PASS", "postgres")
+os.environ.setdefault("DB_NAME", "tasks_test")
+
+
+@pytest.fixture(scope="session")
+def loop():
+    """Один цикл событий на все тесты с базой: соединения пула привязаны к циклу"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def database(loop):
+    """Схема в базе из настроек (DB_*); без доступного PostgreSQL тест пропускается"""
+    from app.database.base import engine
+    from benchmarks.load_dispatcher import create_schema
+
+    try:
+        loop.run_until_complete(asyncio.wait_for(create_schema(), timeout=10))
+    except (OSError, SQLAlchemyError, asyncio.TimeoutError) as e:
+        pytest.skip(f"PostgreSQL is not available: {e}")
+
+    yield
+    loop.run_until_complete(engine.dispose())
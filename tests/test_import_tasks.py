@@ -0,0 +1,66 @@
+import asyncio
+from tempfile import SpooledTemporaryFile
+
+import pytest
+
+from app.config import settings
+from app.database.dao.task import TaskDAO
+from app.handlers import import_tasks as import_module
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Пачки, переданные в TaskDAO.create_many, — без базы"""
+    batches = []
+
+    async def create_many(user_id, tasks):
+        batches.append(list(tasks))
+        return len(tasks)
+
+    monkeypatch.setattr(TaskDAO, "create_many", create_many)
+    return batches
+
+
+def make_file(content: bytes) -> SpooledTemporaryFile:
+    file = SpooledTemporaryFile()
+    file.write(content)
+    file.seek(0)
+    return file
+
+
+def test_import_creates_tasks_in_batches(created):
+    rows = "".join(f"Задача {i},,5,\r\n" for i in range(settings.IMPORT_BATCH_SIZE + 1))
+    with make_file(("title,description,priority,due_date\r\n" + rows).encode()) as file:
+        result = asyncio.run(import_module.import_tasks(1, file, "csv"))
+
+    assert result.created == settings.IMPORT_BATCH_SIZE + 1
+    assert [len(batch) for batch in created] == [settings.IMPORT_BATCH_SIZE, 1]
+
+
+def test_import_reports_invalid_rows(created):
+    content = '{"title": "Купить молоко", "priority": 3}\n{"title": ""}\nне json\n'.encode()
+    with make_file(content) as file:
+        result = asyncio.run(import_module.import_tasks(1, file, "jsonl"))
+
+    assert result.created == 1
+    assert result.errors == [(2, "нет названия"), (3, "не удалось разобрать строку")]
+
+
+def test_import_stops_at_limit(created, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_TASKS", 3)
+    content = "".join(f'{{"title": "Задача {i}"}}\n' for i in range(5)).encode()
+    with make_file(content) as file:
+        result = asyncio.run(import_module.import_tasks(1, file, "jsonl"))
+
+    assert result.created == 3
+    assert result.truncated
+
+
+def test_import_decode_error_creates_nothing(created):
+    # Ошибка кодировки после нескольких полных пачек: ни одна не должна уйти в базу
+    rows = "".join(f"Задача {i}\r\n" for i in range(settings.IMPORT_BATCH_SIZE * 2 + 500))
+    with make_file(("title\r\n" + rows).encode() + b"\xff\xfe\r\n") as file:
+        with pytest.raises(UnicodeDecodeError):
+            asyncio.run(import_module.import_tasks(1, file, "csv"))
+
+    assert created == []
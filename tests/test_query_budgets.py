@@ -0,0 +1,150 @@
+"""
+Бюджеты SQL-запросов основных сценариев бота.
+
+Апдейты идут через create_dispatcher() со всеми мидлварями, Bot API — заглушка
+StubSession, база — PostgreSQL из настроек (DB_*); без неё тесты пропускаются.
+Бюджет — сколько запросов сценарий делает сейчас: лишний get_or_create_user
+или N+1 роняет тест.
+"""
+import itertools
+
+import pytest
+from aiogram import Dispatcher
+from aiogram.types import Update, User
+
+from app.database.dao.task import TaskDAO
+from app.database.dao.user import UserDAO
+from app.database.query_stats import QueryStats, assert_query_budget
+from app.keyboards.reply import MENU_PROFILE, MENU_TASKS
+from app.main import create_dispatcher
+from app.middlewares import CommitBeforeRequestMiddleware
+from app.utils.callback_data import Action, pack
+from app.utils.recurrence import REPEAT_NONE
+from benchmarks.common import make_stub_bot
+from benchmarks.load_dispatcher import TG_ID_OFFSET, UpdateFactory, cleanup
+
+FLOW_BUDGETS = {
+    # Новый пользователь: поиск, INSERT, refresh
+    "start": 3,
+    "start_again": 1,
+    # Шаги FSM до последнего живут только в хранилище состояний
+    "add_task_step": 0,
+    # Пользователь, INSERT и refresh задачи, счётчик созданных, проверка достижений;
+    # у первой задачи ещё «Первый шаг» (проверка и INSERT) и его XP
+    "add_first_task": 10,
+    "add_task": 6,
+    # Пользователь, страница, число задач
+    "list": 3,
+    "pagination": 3,
+    # Пользователь и задача
+    "task_detail": 2,
+    # Пользователь, переход статуса, XP, стрик, счётчик, проверка достижений, карточка задачи
+    "mark_done": 12,
+    # Пользователь и статистика: пользователь, статусы задач и архива, достижения
+    "profile": 5,
+    "leaderboard": 2,
+}
+
+# Свой диапазон tg_id: не пересекается с пользователями нагрузочного прогона
+_tg_ids = itertools.count(TG_ID_OFFSET + 500_000_000)
+
+
+class Harness:
+    """Диспетчер продакшена и бот на заглушке Bot API"""
+
+    def __init__(self, loop, dp: Dispatcher) -> None:
+        self.loop = loop
+        self.dp = dp
+        self.bot = make_stub_bot()
+        self.bot.session.middleware(CommitBeforeRequestMiddleware())
+        self.updates = UpdateFactory()
+
+    def run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def feed(self, update: Update, flow: str) -> QueryStats:
+        with assert_query_budget(FLOW_BUDGETS[flow], flow) as stats:
+            self.run(self.dp.feed_update(self.bot, update))
+        return stats
+
+    def send(self, user: User, text: str, flow: str) -> QueryStats:
+        return self.feed(self.updates.message(user, text), flow)
+
+    def press(self, user: User, data: str, flow: str) -> QueryStats:
+        return self.feed(self.updates.callback(user, data), flow)
+
+    def add_task(self, user: User, title: str, flow: str = "add_task") -> None:
+        for text in ("/add", title, "Описание задачи", "5", "Пропустить"):
+            self.send(user, text, "add_task_step")
+        self.send(user, REPEAT_NONE, flow)
+
+    def task_ids(self, user: User) -> list:
+        db_user = self.run(UserDAO.get_or_create_user(user))
+        return [task.id for task in self.run(TaskDAO.get_tasks(user_id=db_user.id))]
+
+
+@pytest.fixture(scope="session")
+def dispatcher():
+    # Роутеры — объекты модулей: подключить их к диспетчеру можно только один раз
+    return create_dispatcher(throttling=False)
+
+
+@pytest.fixture
+def bot(loop, database, dispatcher):
+    return Harness(loop, dispatcher)
+
+
+@pytest.fixture
+def user(loop, database):
+    tg_id = next(_tg_ids)
+    # Остатки упавшего прошлого прогона
+    loop.run_until_complete(cleanup([tg_id]))
+    yield User(id=tg_id, is_bot=False, first_name="Test", username=f"test_{tg_id}")
+    loop.run_until_complete(cleanup([tg_id]))
+
+
+@pytest.fixture
+def registered(bot, user):
+    bot.send(user, "/start", "start")
+    return user
+
+
+def test_start(bot, user):
+    assert bot.send(user, "/start", "start").count > 0
+    bot.send(user, "/start", "start_again")
+
+
+def test_add_task(bot, registered):
+    bot.add_task(registered, "Первая задача", "add_first_task")
+    bot.add_task(registered, "Вторая задача")
+
+    assert len(bot.task_ids(registered)) == 2
+
+
+def test_list_and_pagination(bot, registered):
+    bot.add_task(registered, "Задача для списка", "add_first_task")
+
+    bot.send(registered, MENU_TASKS, "list")
+    bot.press(registered, pack(Action.PAGE, 0), "pagination")
+
+
+def test_task_detail(bot, registered):
+    bot.add_task(registered, "Задача для карточки", "add_first_task")
+    [task_id] = bot.task_ids(registered)
+
+    bot.press(registered, pack(Action.TASK, task_id), "task_detail")
+
+
+def test_mark_done(bot, registered):
+    bot.add_task(registered, "Первая задача", "add_first_task")
+    bot.add_task(registered, "Вторая задача")
+    task_ids = bot.task_ids(registered)
+
+    # Первое выполнение открывает достижения, их число зависит от времени суток
+    bot.run(bot.dp.feed_update(bot.bot, bot.updates.callback(registered, pack(Action.DONE, task_ids[0]))))
+    bot.press(registered, pack(Action.DONE, task_ids[1]), "mark_done")
+
+
+def test_profile_and_leaderboard(bot, registered):
+    bot.send(registered, MENU_PROFILE, "profile")
+    bot.press(registered, pack(Action.LEADERBOARD), "leaderboard")